@@ -1,28 +1,83 @@
 """Vercel serverless function handler for MCP server."""
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 from fastapi import FastAPI, Depends, status as http_status
 from fastapi.responses import JSONResponse
-from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import CONTENT_TYPE_LATEST
 from fastapi import Response
 
 from src.config import settings
-from src.logger import configure_logging, get_logger
+from src.logger import close_logging, configure_logging, get_logger
 from src.auth import verify_api_key
 from src.middleware import (
     setup_cors_middleware,
     RateLimitMiddleware,
     RequestLoggingMiddleware,
 )
-from src.monitoring import metrics_middleware, server_info
+from src.monitoring import (
+    MetricsMiddleware,
+    check_metrics_config,
+    close_metrics,
+    generate_metrics,
+    server_info,
+)
+from src.cache import close_cache, get_cache
+from src.pokeapi_client import close_http_client
+from src.rate_limit import create_rate_limit_backend
+from src.snapshot import close_snapshot, get_snapshot
+from src.tournament import close_process_pool
+from src.tracing import close_tracing
+from src.mcp_http import McpHttpEndpoint
+from server import mcp
 
 # Configure logging
-configure_logging(settings.log_level, settings.log_format)
+configure_logging(
+    settings.log_level,
+    settings.log_format,
+    async_writer=settings.log_async,
+    queue_size=settings.log_queue_size,
+    sample_rates=settings.log_sample_rates_map,
+    max_field_bytes=settings.log_max_field_bytes,
+)
 logger = get_logger(__name__)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Open process-wide resources on startup and release them on shutdown."""
+    check_metrics_config()
+    # Open the response cache now so a persistent backend is warmed before traffic
+    get_cache()
+    if settings.pokeapi_mode != "live":
+        get_snapshot()
+    try:
+        async with mcp.session_manager.run():
+            yield
+    finally:
+        await close_http_client()
+        close_cache()
+        close_snapshot()
+        close_process_pool()
+        close_tracing()
+        await rate_limit_backend.close()
+        close_metrics()
+        logger.info("app_shutdown")
+        close_logging()
+
+
+# Shared by the middleware and the lifespan, which closes its connection
+rate_limit_backend = create_rate_limit_backend(
+    settings.rate_limit_requests,
+    settings.rate_limit_window,
+    settings.rate_limit_max_clients,
+)
+
 # Initialize FastAPI app
 app = FastAPI(
     title=settings.server_name,
     version=settings.server_version,
     description="Production-ready Poke MCP Server with authentication and monitoring",
+    lifespan=lifespan,
 )
 
 # Setup middleware
@@ -32,8 +87,9 @@ app.add_middleware(
     RateLimitMiddleware,
     requests=settings.rate_limit_requests,
     window=settings.rate_limit_window,
+    backend=rate_limit_backend,
 )
-app.middleware("http")(metrics_middleware)
+app.add_middleware(MetricsMiddleware)
 
 # Set server info
 server_info.info(
@@ -86,36 +142,20 @@ async def metrics() -> Response:
             status_code=http_status.HTTP_404_NOT_FOUND,
             content={"error": "Metrics disabled"},
         )
-    return Response(content=generate_latest(), media_type=CONTENT_TYPE_LATEST)
-
-
-@app.post("/mcp")
-async def mcp_endpoint(
-    request_data: dict,
-    api_key: str = Depends(verify_api_key),
-) -> dict:
-    """MCP protocol endpoint with authentication.
-    
-    This endpoint handles MCP tool calls with proper authentication.
-    In a production environment, this would integrate with the MCP server
-    to execute tool calls.
-    
-    Args:
-        request_data: The MCP request payload
-        api_key: Verified API key from authorization header
-    
-    Returns:
-        MCP response
-    """
-    logger.info("mcp_request_received", request=request_data)
-    
-    # TODO: Integrate with actual MCP server tool execution
-    # For now, return a placeholder response
-    return {
-        "status": "success",
-        "message": "MCP endpoint - integrate with actual tool execution",
-        "request": request_data,
-    }
+    return Response(content=generate_metrics(), media_type=CONTENT_TYPE_LATEST)
+
+
+# MCP over streamable HTTP, sharing the tools and process-wide clients of server.py
+mcp.streamable_http_app()
+app.add_route(
+    "/mcp",
+    McpHttpEndpoint(
+        mcp.session_manager.handle_request,
+        max_concurrency=settings.mcp_batch_concurrency,
+        max_batch=settings.mcp_max_batch_size,
+    ),
+    methods=["POST"],
+)
 
 
 @app.get("/status")
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""Benchmark ``simulate_battle`` CPU time and payload size per detail level.
+
+PokeAPI data is served from the local stub and cached after the first call,
+so tool timings reflect cache reads, the battle engine and result rendering.
+Engine timings exclude the tool wrapper entirely. The default matchup is a
+long, stall-heavy battle on the stub's data.
+
+Usage:
+    python scripts/bench_battle_detail.py --battles 2000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+
+from pokeapi_stub import create_app  # noqa: E402
+from src.battle_engine import BATTLE_DETAIL_LEVELS, render_events, run_battle  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.pokeapi_client import fetch_pokemon_full_data, set_http_client  # noqa: E402
+import server  # noqa: E402
+
+
+async def main(pokemon1: str, pokemon2: str, battles: int) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    settings.pokeapi_base_url = "http://stub/api/v2"
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app()))
+    set_http_client(client)
+    await server.simulate_battle(pokemon1, pokemon2)  # warm the cache
+
+    print(f"{pokemon1} vs {pokemon2}, {battles} battles per detail level")
+    for detail in BATTLE_DETAIL_LEVELS:
+        payload_bytes = 0
+        turns = 0
+        start = time.process_time()
+        for seed in range(battles):
+            result = await server.simulate_battle(pokemon1, pokemon2, seed=seed, detail=detail)
+            payload_bytes += len(json.dumps(result))
+            turns += result["turns"]
+        elapsed = time.process_time() - start
+        print(
+            f"tool   {detail:<8} {elapsed / battles * 1e6:8.1f} us CPU/battle  "
+            f"{payload_bytes / battles:8.0f} B/response  mean turns {turns / battles:.1f}"
+        )
+
+    poke1 = await fetch_pokemon_full_data(client, pokemon1)
+    poke2 = await fetch_pokemon_full_data(client, pokemon2)
+    for detail in BATTLE_DETAIL_LEVELS:
+        start = time.process_time()
+        for seed in range(battles):
+            battle = run_battle(poke1, poke2, detail == "full", random.Random(seed))
+            if detail == "full":
+                render_events(battle["events"], battle["winner"])
+        elapsed = time.process_time() - start
+        print(f"engine {detail:<8} {elapsed / battles * 1e6:8.1f} us CPU/battle")
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pokemon1", default="blissey")
+    parser.add_argument("--pokemon2", default="gengar")
+    parser.add_argument("--battles", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(main(args.pokemon1, args.pokemon2, args.battles))
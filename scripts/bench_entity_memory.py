@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Measure the memory held by parsed entities against raw and parsed dicts.
+
+Fetches ``--pokemon`` Pokémon from the local PokeAPI stub with every move,
+ability, species and evolution chain they reference, then measures with
+``tracemalloc`` the memory retained by three ways of keeping them:
+
+- raw: the decoded PokeAPI JSON documents, as the response path held them;
+- dicts: per-Pokémon dicts with only the fields the tools use, each built
+  fresh, as the tools assembled them per call;
+- entities: the slotted entities of ``src.entities``, each resource parsed
+  once and shared by reference.
+
+Usage:
+    python scripts/bench_entity_memory.py --pokemon 151
+    python scripts/bench_entity_memory.py --fixtures .benchmarks/fixtures
+"""
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import sys
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+
+from pokeapi_stub import create_app  # noqa: E402
+from src.entities import (  # noqa: E402
+    PARSERS,
+    extract_english_effect,
+    parse_evolution_chain_entity,
+)
+from src.pokeapi_client import gather_limited  # noqa: E402
+
+BASE_URL = "http://stub/api/v2"
+
+
+async def download(names: List[str], fixtures: str) -> Dict[str, Tuple[str, bytes]]:
+    """Fetch the Pokémon and everything they reference, as raw bodies by URL."""
+    bodies: Dict[str, Tuple[str, bytes]] = {}
+    transport = httpx.ASGITransport(app=create_app(fixtures=fixtures))
+    async with httpx.AsyncClient(transport=transport) as client:
+
+        async def fetch(url: str, endpoint: str) -> None:
+            response = await client.get(url)
+            response.raise_for_status()
+            bodies[url] = (endpoint, response.content)
+
+        async def fetch_all(urls: Dict[str, str]) -> None:
+            urls = {url: endpoint for url, endpoint in urls.items() if url not in bodies}
+            await gather_limited(32, *(fetch(url, endpoint) for url, endpoint in urls.items()))
+
+        await fetch_all({f"{BASE_URL}/pokemon/{name}": "pokemon" for name in names})
+        documents = [json.loads(body) for endpoint, body in bodies.values()]
+        references: Dict[str, str] = {}
+        for data in documents:
+            references[data["species"]["url"]] = "species"
+            references.update((a["ability"]["url"], "ability") for a in data["abilities"])
+            references.update((m["move"]["url"], "move") for m in data["moves"])
+        await fetch_all(references)
+        chains = {
+            json.loads(body)["evolution_chain"]["url"]: "evolution-chain"
+            for endpoint, body in list(bodies.values())
+            if endpoint == "species"
+        }
+        await fetch_all(chains)
+    return bodies
+
+
+def build_raw(bodies: Dict[str, Tuple[str, bytes]]) -> Any:
+    return {url: json.loads(body) for url, (_, body) in bodies.items()}
+
+
+def build_dicts(bodies: Dict[str, Tuple[str, bytes]]) -> Any:
+    """One self-contained dict per Pokémon, copying in what it references."""
+    documents = {url: json.loads(body) for url, (_, body) in bodies.items()}
+    result = []
+    for url, (endpoint, _) in bodies.items():
+        if endpoint != "pokemon":
+            continue
+        data = documents[url]
+        species = documents[data["species"]["url"]]
+        chain = documents[species["evolution_chain"]["url"]]
+        moves = []
+        for entry in data["moves"]:
+            move = documents[entry["move"]["url"]]
+            moves.append(
+                {
+                    "name": move["name"],
+                    "power": move.get("power", 50),
+                    "type": move["type"]["name"],
+                    "effect": extract_english_effect(move),
+                }
+            )
+        result.append(
+            {
+                "name": data["name"],
+                "id": data["id"],
+                "base_stats": {s["stat"]["name"]: s["base_stat"] for s in data["stats"]},
+                "types": [t["type"]["name"] for t in data["types"]],
+                "abilities": [
+                    {
+                        "name": entry["ability"]["name"],
+                        "effect": extract_english_effect(documents[entry["ability"]["url"]]),
+                    }
+                    for entry in data["abilities"]
+                ],
+                "moves": moves,
+                "evolution_chain": list(parse_evolution_chain_entity(chain).names),
+            }
+        )
+    del documents
+    return result
+
+
+def build_entities(bodies: Dict[str, Tuple[str, bytes]]) -> Any:
+    return {url: PARSERS[endpoint](json.loads(body)) for url, (endpoint, body) in bodies.items()}
+
+
+def retained(build: Callable[[Dict[str, Tuple[str, bytes]]], Any], bodies: Any) -> int:
+    """Bytes still allocated after ``build`` returns, while its result is alive."""
+    gc.collect()
+    tracemalloc.start()
+    result = build(bodies)
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pokemon", type=int, default=151, help="Number of Pokémon")
+    parser.add_argument("--fixtures", help="Replay recorded PokeAPI responses")
+    args = parser.parse_args()
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    names = [f"pokemon-{i}" for i in range(1, args.pokemon + 1)]
+    bodies = asyncio.run(download(names, args.fixtures))
+    counts: Dict[str, int] = {}
+    for endpoint, _ in bodies.values():
+        counts[endpoint] = counts.get(endpoint, 0) + 1
+    body_bytes = sum(len(body) for _, body in bodies.values())
+    print(", ".join(f"{count} {endpoint}" for endpoint, count in sorted(counts.items())))
+    print(f"{body_bytes / 1024:.0f} KiB of JSON\n")
+
+    # Entities last: interning and shared tuples start empty for them
+    rows = [("raw", build_raw), ("dicts", build_dicts), ("entities", build_entities)]
+    sizes = {name: retained(build, bodies) for name, build in rows}
+    print(f"{'approach':<10} {'KiB':>10} {'bytes/pokemon':>14} {'vs raw':>7}")
+    for name, size in sizes.items():
+        print(
+            f"{name:<10} {size / 1024:10.0f} {size / args.pokemon:14.0f} "
+            f"{size / sizes['raw']:7.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Benchmark concurrent upstream fan-out in the MCP tools.
+
+Runs ``get_pokemon_info`` and ``simulate_battle`` against the local PokeAPI
+stub with injected latency, once with ``POKEAPI_MAX_CONCURRENCY=1`` (the old
+serial behaviour) and then with increasing concurrency bounds.
+
+Usage:
+    python scripts/bench_fanout.py --latency 0.05 --iterations 5
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+
+from pokeapi_stub import create_app  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.pokeapi_client import set_http_client  # noqa: E402
+import server  # noqa: E402
+
+
+async def time_call(coro_factory, iterations: int) -> float:
+    """Return the median wall time of ``iterations`` awaited calls."""
+    samples = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        result = await coro_factory()
+        samples.append(time.perf_counter() - start)
+        if "error" in result:
+            raise RuntimeError(result["error"])
+    return statistics.median(samples)
+
+
+async def main(latency: float, iterations: int, bounds: list[int]) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app = create_app(latency)
+    settings.pokeapi_base_url = "http://stub/api/v2"
+    settings.cache_enabled = False
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://stub")
+    set_http_client(client)
+
+    print(f"stub latency: {latency * 1000:.0f} ms/request, iterations: {iterations}")
+    print(f"{'concurrency':>11}  {'get_pokemon_info':>16}  {'simulate_battle':>15}")
+    baseline = None
+    for bound in bounds:
+        settings.pokeapi_max_concurrency = bound
+        info = await time_call(lambda: server.get_pokemon_info("pikachu"), iterations)
+        battle = await time_call(
+            lambda: server.simulate_battle("pikachu", "bulbasaur"), iterations
+        )
+        baseline = baseline or (info, battle)
+        print(
+            f"{bound:>11}  {info * 1000:>11.1f} ms  {battle * 1000:>10.1f} ms"
+            f"   ({baseline[0] / info:.1f}x / {baseline[1] / battle:.1f}x)"
+        )
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--bounds", type=int, nargs="+", default=[1, 4, 8, 16])
+    args = parser.parse_args()
+    asyncio.run(main(args.latency, args.iterations, args.bounds))
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Compare full and selective decoding of ``/pokemon`` documents.
+
+For each document, times ``json.loads`` against the selective decoder of
+``src.json_extract`` (each followed by parsing into the ``Pokemon`` entity)
+and measures the peak memory of one decode with ``tracemalloc``. Both paths
+must produce the same entity. ``extract_pokemon`` only takes the selective
+path from ``SELECTIVE_DECODE_MIN_BYTES``, where it starts to win on CPU.
+
+Documents are synthetic stub payloads by default; pass ``--fixtures`` to use
+real PokeAPI responses recorded with ``scripts/run_benchmarks.py --record``.
+
+Usage:
+    python scripts/bench_json_extract.py --iterations 200
+    python scripts/bench_json_extract.py --fixtures .benchmarks/fixtures
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+from pokeapi_stub import FIXTURE_BASE_URL, load_fixtures, pokemon_doc  # noqa: E402
+from src.entities import parse_pokemon  # noqa: E402
+from src.json_extract import POKEMON_FIELDS, POKEMON_ITEM_FIELDS, extract_fields  # noqa: E402
+
+DEFAULT_POKEMON = "pikachu,charizard,mew,snorlax,eevee,gengar"
+
+
+def load_bodies(args: argparse.Namespace) -> Dict[str, bytes]:
+    """Encoded ``/pokemon`` documents by name."""
+    if args.fixtures:
+        return {
+            ident: text.encode()
+            for (kind, ident), text in load_fixtures(args.fixtures).items()
+            if kind == "pokemon" and not ident.isdigit()
+        }
+    return {
+        name: json.dumps(pokemon_doc(FIXTURE_BASE_URL, name)).encode()
+        for name in args.pokemon.split(",")
+    }
+
+
+def mean_us(fn: Callable[[], Any], iterations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(iterations):
+        fn()
+    return (time.perf_counter() - start) / iterations * 1e6
+
+
+def peak_kib(fn: Callable[[], Any]) -> float:
+    gc.collect()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pokemon", default=DEFAULT_POKEMON, help="Stub documents to build")
+    parser.add_argument("--fixtures", help="Recorded PokeAPI responses to use instead")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    bodies = load_bodies(args)
+    if not bodies:
+        raise SystemExit("No /pokemon documents found.")
+    print(
+        f"{'pokemon':<14} {'KiB':>6} {'loads us':>9} {'extract us':>10} "
+        f"{'loads peak':>10} {'extract peak':>12}"
+    )
+    totals = [0.0, 0.0, 0.0, 0.0]
+    for name, body in bodies.items():
+        full = lambda: parse_pokemon(json.loads(body))  # noqa: E731
+        selective = lambda: parse_pokemon(  # noqa: E731
+            extract_fields(body, POKEMON_FIELDS, POKEMON_ITEM_FIELDS)
+        )
+        if full() != selective():
+            raise SystemExit(f"{name}: extracted entity differs from the full decode")
+        row = [
+            mean_us(full, args.iterations),
+            mean_us(selective, args.iterations),
+            peak_kib(full),
+            peak_kib(selective),
+        ]
+        totals = [total + value for total, value in zip(totals, row)]
+        print(
+            f"{name:<14} {len(body) / 1024:6.0f} {row[0]:9.0f} {row[1]:10.0f} "
+            f"{row[2]:9.0f}K {row[3]:11.0f}K"
+        )
+    count = len(bodies)
+    print(
+        f"{'mean':<14} {'':>6} {totals[0] / count:9.0f} {totals[1] / count:10.0f} "
+        f"{totals[2] / count:9.0f}K {totals[3] / count:11.0f}K"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""Compare MCP tool-call throughput over stdio and streamable HTTP.
+
+Starts the local PokeAPI stub, then measures ``get_pokemon_info`` calls
+(warm cache, so transport overhead dominates) through:
+
+- stdio: ``server.py`` as a subprocess driven by the MCP client SDK, which
+  multiplexes concurrent requests over the one pipe;
+- http: ``api.index:app`` under uvicorn, one JSON-RPC message per POST;
+- http batch: the same app, with ``--concurrency`` calls per JSON-RPC batch
+  and one batch in flight.
+
+Usage:
+    python scripts/bench_mcp_transport.py --concurrency 1,8 --duration 5
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+
+import httpx  # noqa: E402
+from mcp import ClientSession, StdioServerParameters  # noqa: E402
+from mcp.client.stdio import stdio_client  # noqa: E402
+
+from load_test import API_KEY, free_port, percentile, start_stub, stop, wait_ready  # noqa: E402
+
+POKEMON = ["pikachu", "bulbasaur", "charmander", "squirtle", "eevee", "snorlax"]
+HEADERS = {
+    "Authorization": f"Bearer {API_KEY}",
+    "Accept": "application/json, text/event-stream",
+}
+
+
+def tool_call(request_id: int, pokemon: str) -> Dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": "get_pokemon_info", "arguments": {"pokemon_name": pokemon}},
+    }
+
+
+async def drive(
+    call: Callable[[], Awaitable[int]], concurrency: int, duration: float
+) -> Dict[str, float]:
+    """Run ``call`` in ``concurrency`` closed loops; ``call`` returns tool calls made."""
+    for _ in range(len(POKEMON)):
+        await call()
+    latencies: List[float] = []
+    calls = 0
+
+    async def worker(deadline: float) -> None:
+        nonlocal calls
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            made = await call()
+            calls += made
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(start + duration) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "calls_per_s": calls / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p99_ms": percentile(latencies, 99),
+    }
+
+
+async def bench_stdio(env: Dict[str, str], concurrency: int, duration: float) -> Dict[str, float]:
+    params = StdioServerParameters(
+        command=sys.executable, args=[str(ROOT / "server.py")], env=env, cwd=str(ROOT)
+    )
+    names = itertools.cycle(POKEMON)
+    with open(os.devnull, "w") as devnull:
+        async with stdio_client(params, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+
+                async def call() -> int:
+                    result = await session.call_tool(
+                        "get_pokemon_info", {"pokemon_name": next(names)}
+                    )
+                    assert not result.isError
+                    return 1
+
+                return await drive(call, concurrency, duration)
+
+
+async def bench_http(
+    base_url: str, concurrency: int, duration: float, batch: int = 0
+) -> Dict[str, float]:
+    names = itertools.cycle(POKEMON)
+    ids = itertools.count()
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60.0) as client:
+
+        async def call() -> int:
+            if batch:
+                body: Any = [tool_call(next(ids), next(names)) for _ in range(batch)]
+            else:
+                body = tool_call(next(ids), next(names))
+            response = await client.post("/mcp", json=body, headers=HEADERS)
+            response.raise_for_status()
+            return batch or 1
+
+        return await drive(call, concurrency, duration)
+
+
+async def main(args: argparse.Namespace) -> None:
+    levels = [int(c) for c in args.concurrency.split(",")]
+    stub, pokeapi_base_url = start_stub(args.stub_latency)
+    env = dict(
+        os.environ,
+        API_KEY=API_KEY,
+        LOG_LEVEL="WARNING",
+        POKEAPI_BASE_URL=pokeapi_base_url,
+        RATE_LIMIT_ENABLED="false",
+        MCP_BATCH_CONCURRENCY=str(max(levels)),
+    )
+    app_port = free_port()
+    app = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", "api.index:app", "--port", str(app_port),
+            "--log-level", "warning", "--no-access-log",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{app_port}"
+    try:
+        wait_ready(f"{base_url}/health")
+        print(f"{'transport':<12} {'conc':>4} {'calls/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+        for concurrency in levels:
+            rows = {
+                "stdio": await bench_stdio(env, concurrency, args.duration),
+                "http": await bench_http(base_url, concurrency, args.duration),
+            }
+            if concurrency > 1:
+                rows["http batch"] = await bench_http(base_url, 1, args.duration, concurrency)
+            for transport, row in rows.items():
+                print(
+                    f"{transport:<12} {concurrency:>4} {row['calls_per_s']:9.0f} "
+                    f"{row['p50_ms']:8.2f} {row['p99_ms']:8.2f}"
+                )
+    finally:
+        stop(app, stub)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", default="1,8")
+    parser.add_argument("--duration", type=float, default=5.0, help="Seconds per measurement")
+    parser.add_argument("--stub-latency", type=float, default=0.02)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Benchmark ``/metrics`` scrape cost against series count and worker count.
+
+For each series count, child processes populate ``http_requests_total`` and
+``http_request_duration_seconds`` with that many label combinations, the
+way uvicorn workers would. The scrape is then timed in single-process mode
+(one child's registry) and in multiprocess mode (aggregating every worker's
+files). A final check shows route-template labels keeping 404 probes in one
+series.
+
+Usage:
+    python scripts/bench_metrics_scrape.py --series 100,1000,10000 --workers 4
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+
+def populate(series: int) -> None:
+    """Child mode: create ``series`` route label sets, then scrape if single-process."""
+    from src.monitoring import generate_metrics, http_request_duration_seconds, http_requests_total
+
+    for i in range(series):
+        endpoint = f"/route/{i}"
+        http_requests_total.labels(method="GET", endpoint=endpoint, status=200).inc()
+        http_request_duration_seconds.labels(method="GET", endpoint=endpoint).observe(0.01)
+    if not os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        start = time.perf_counter()
+        payload = generate_metrics()
+        print(json.dumps({"seconds": time.perf_counter() - start, "bytes": len(payload)}))
+
+
+def run_child(series: int, multiproc_dir: str = "") -> str:
+    env = dict(os.environ)
+    env.pop("PROMETHEUS_MULTIPROC_DIR", None)
+    if multiproc_dir:
+        env["PROMETHEUS_MULTIPROC_DIR"] = multiproc_dir
+    return subprocess.run(
+        [sys.executable, __file__, "--child", str(series)],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+
+
+def scrape_multiprocess(multiproc_dir: str) -> dict:
+    """Time one aggregated scrape in a fresh process."""
+    code = (
+        "import json, time\n"
+        "from src.monitoring import generate_metrics\n"
+        "start = time.perf_counter()\n"
+        "payload = generate_metrics()\n"
+        "print(json.dumps({'seconds': time.perf_counter() - start, 'bytes': len(payload)}))\n"
+    )
+    env = dict(os.environ, PROMETHEUS_MULTIPROC_DIR=multiproc_dir)
+    out = subprocess.run(
+        [sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def probe_cardinality(probes: int) -> int:
+    """Series created in http_requests_total by ``probes`` unmatched paths."""
+    import asyncio
+
+    import httpx
+    from fastapi import FastAPI
+
+    from src.monitoring import MetricsMiddleware, http_requests_total
+
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware)
+
+    async def drive() -> None:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for i in range(probes):
+                await client.get(f"/wp-admin/{i}.php")
+
+    asyncio.run(drive())
+    samples = [
+        s for metric in http_requests_total.collect() for s in metric.samples
+        if s.name == "http_requests_total"
+    ]
+    return len(samples)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--series", default="100,1000,10000")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--probes", type=int, default=2000)
+    parser.add_argument("--child", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child is not None:
+        populate(args.child)
+        return
+
+    print(f"{'series':>7} {'mode':<22} {'scrape ms':>10} {'payload KiB':>12}")
+    for series in (int(s) for s in args.series.split(",")):
+        single = json.loads(run_child(series).strip().splitlines()[-1])
+        print(
+            f"{series:>7} {'single process':<22} {single['seconds'] * 1000:10.1f} "
+            f"{single['bytes'] / 1024:12.1f}"
+        )
+        multiproc_dir = tempfile.mkdtemp(prefix="metrics-bench-")
+        try:
+            for _ in range(args.workers):
+                run_child(series, multiproc_dir)
+            multi = scrape_multiprocess(multiproc_dir)
+        finally:
+            shutil.rmtree(multiproc_dir)
+        mode = f"multiprocess x{args.workers}"
+        print(
+            f"{series:>7} {mode:<22} {multi['seconds'] * 1000:10.1f} "
+            f"{multi['bytes'] / 1024:12.1f}"
+        )
+
+    series = probe_cardinality(args.probes)
+    print(f"{args.probes} unmatched probe paths -> {series} http_requests_total series")
+
+
+if __name__ == "__main__":
+    main()
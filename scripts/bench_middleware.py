@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""Benchmark ``/health`` through the middleware stack, before and after pure ASGI.
+
+Builds the same app three times: with no middleware, with the previous
+``BaseHTTPMiddleware``/``@app.middleware("http")`` stack (kept here for
+comparison) and with the current pure-ASGI stack from ``src``. Requests go
+through ``httpx.ASGITransport`` in-process, so client overhead is identical
+across stacks and no sockets are involved.
+
+Usage:
+    python scripts/bench_middleware.py --requests 5000 --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+import structlog  # noqa: E402
+from fastapi import FastAPI, Request, Response  # noqa: E402
+from starlette.middleware.base import BaseHTTPMiddleware  # noqa: E402
+
+from src.config import settings  # noqa: E402
+from src.logger import configure_logging, get_logger  # noqa: E402
+from src.middleware import (  # noqa: E402
+    RateLimitMiddleware,
+    RequestLoggingMiddleware,
+    setup_cors_middleware,
+)
+from src.monitoring import (  # noqa: E402
+    MetricsMiddleware,
+    active_connections,
+    http_request_duration_seconds,
+    http_requests_total,
+)
+from src.rate_limit import SlidingWindowLimiter  # noqa: E402
+
+logger = get_logger(__name__)
+
+
+class LegacyRateLimitMiddleware(BaseHTTPMiddleware):
+    """Previous ``BaseHTTPMiddleware`` rate limiter, with the current limiter."""
+
+    def __init__(self, app, requests: int, window: int):
+        super().__init__(app)
+        self.limiter = SlidingWindowLimiter(requests, window)
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        client_ip = request.client.host if request.client else "unknown"
+        if not self.limiter.hit(client_ip):
+            return Response(status_code=429)
+        return await call_next(request)
+
+
+class LegacyRequestLoggingMiddleware(BaseHTTPMiddleware):
+    """Previous ``BaseHTTPMiddleware`` request logger."""
+
+    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+        structlog.contextvars.bind_contextvars(request_id=str(time.time()))
+        logger.info("request_started", method=request.method, url=str(request.url))
+        start_time = time.time()
+        try:
+            response = await call_next(request)
+            logger.info(
+                "request_completed",
+                method=request.method,
+                url=str(request.url),
+                status_code=response.status_code,
+                duration=time.time() - start_time,
+            )
+            return response
+        finally:
+            structlog.contextvars.unbind_contextvars("request_id")
+
+
+async def legacy_metrics_middleware(request: Request, call_next: Callable) -> Response:
+    """Previous ``@app.middleware("http")`` metrics collector."""
+    start_time = time.time()
+    active_connections.inc()
+    try:
+        response = await call_next(request)
+        http_requests_total.labels(
+            method=request.method, endpoint=request.url.path, status=response.status_code
+        ).inc()
+        http_request_duration_seconds.labels(
+            method=request.method, endpoint=request.url.path
+        ).observe(time.time() - start_time)
+        return response
+    finally:
+        active_connections.dec()
+
+
+def build_app(stack: str) -> FastAPI:
+    """Build an app with a ``/health`` route and the given middleware stack."""
+    app = FastAPI()
+
+    @app.get("/health")
+    async def health() -> dict:
+        return {"status": "healthy", "server": settings.server_name}
+
+    limit = 1_000_000_000
+    if stack == "base_http":
+        setup_cors_middleware(app)
+        app.add_middleware(LegacyRequestLoggingMiddleware)
+        app.add_middleware(LegacyRateLimitMiddleware, requests=limit, window=60)
+        app.middleware("http")(legacy_metrics_middleware)
+    elif stack == "asgi":
+        setup_cors_middleware(app)
+        app.add_middleware(RequestLoggingMiddleware)
+        app.add_middleware(RateLimitMiddleware, requests=limit, window=60)
+        app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def drive(app: FastAPI, requests: int, concurrency: int) -> Dict[str, float]:
+    """Send ``requests`` GET /health with ``concurrency`` concurrent clients."""
+    transport = httpx.ASGITransport(app=app)
+    latencies: List[float] = []
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        for _ in range(50):
+            await client.get("/health")
+        remaining = iter(range(requests))
+
+        async def worker() -> None:
+            for _ in remaining:
+                start = time.perf_counter()
+                response = await client.get("/health")
+                latencies.append((time.perf_counter() - start) * 1000)
+                assert response.status_code == 200, response.status_code
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies),
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1],
+    }
+
+
+async def main(requests: int, concurrency_levels: List[int]) -> None:
+    configure_logging("WARNING", "json")
+    settings.rate_limit_enabled = True
+    print(f"{'stack':<10} {'conc':>4} {'req/s':>9} {'p50 ms':>8} {'p99 ms':>8}")
+    for concurrency in concurrency_levels:
+        for stack in ("none", "base_http", "asgi"):
+            row = await drive(build_app(stack), requests, concurrency)
+            print(
+                f"{stack:<10} {concurrency:>4} {row['rps']:9.0f} "
+                f"{row['p50_ms']:8.3f} {row['p99_ms']:8.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", default="1,16")
+    args = parser.parse_args()
+    asyncio.run(main(args.requests, [int(c) for c in args.concurrency.split(",")]))
@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""Benchmark Monte Carlo battle simulation against repeated single battles.
+
+Both modes go through ``simulate_battle`` with PokeAPI data served from the
+local stub and cached after the first call, so the numbers compare battle
+engines rather than network time.
+
+Usage:
+    python scripts/bench_monte_carlo.py --seed 42
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+
+from pokeapi_stub import create_app  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.pokeapi_client import set_http_client  # noqa: E402
+import server  # noqa: E402
+
+
+async def main(pokemon1: str, pokemon2: str, single_battles: int, seed: int) -> None:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    settings.pokeapi_base_url = "http://stub/api/v2"
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app()))
+    set_http_client(client)
+    await server.simulate_battle(pokemon1, pokemon2)  # warm the cache
+
+    start = time.perf_counter()
+    wins = 0
+    for _ in range(single_battles):
+        result = await server.simulate_battle(pokemon1, pokemon2)
+        wins += result["winner"] == result["pokemon1"]
+    elapsed = time.perf_counter() - start
+    print(f"{pokemon1} vs {pokemon2}")
+    print(
+        f"single x{single_battles:<7} {elapsed * 1000:9.1f} ms  "
+        f"{single_battles / elapsed:12,.0f} battles/s  p(win)={wins / single_battles:.3f}"
+    )
+
+    for simulations in (1_000, 10_000, 100_000):
+        start = time.perf_counter()
+        result = await server.simulate_battle(
+            pokemon1, pokemon2, mode="monte_carlo", simulations=simulations, seed=seed
+        )
+        elapsed = time.perf_counter() - start
+        ci = result["confidence_interval_95"]["pokemon1"]
+        print(
+            f"monte_carlo x{simulations:<7} {elapsed * 1000:4.1f} ms  "
+            f"{simulations / elapsed:12,.0f} battles/s  "
+            f"p(win)={result['win_probability']['pokemon1']:.3f} "
+            f"[{ci['low']:.3f}, {ci['high']:.3f}]"
+        )
+
+    repeat = await server.simulate_battle(
+        pokemon1, pokemon2, mode="monte_carlo", simulations=100_000, seed=seed
+    )
+    print(f"seed {seed} reproducible: {repeat == result}")
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pokemon1", default="gengar")
+    parser.add_argument("--pokemon2", default="alakazam")
+    parser.add_argument("--single-battles", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    asyncio.run(main(args.pokemon1, args.pokemon2, args.single_battles, args.seed))
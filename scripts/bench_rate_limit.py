@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Microbenchmark per-request rate-limiter cost as the client count grows.
+
+Compares ``SlidingWindowLimiter`` with the previous middleware algorithm,
+which rebuilt the whole client table and rescanned every stored timestamp on
+each request. Requests are spread round-robin over the active clients, with
+the clock advancing so old windows keep expiring.
+
+Usage:
+    python scripts/bench_rate_limit.py --clients 10,100,1000,10000
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.rate_limit import SlidingWindowLimiter  # noqa: E402
+
+
+class RebuildLimiter:
+    """The previous ``RateLimitMiddleware`` algorithm, kept for comparison."""
+
+    def __init__(self, requests: int, window: float) -> None:
+        self.requests = requests
+        self.window = window
+        self.clients: Dict[str, List[float]] = {}
+
+    def hit(self, client: str, now: float) -> bool:
+        self.clients = {
+            ip: timestamps
+            for ip, timestamps in self.clients.items()
+            if any(t > now - self.window for t in timestamps)
+        }
+        if client in self.clients:
+            timestamps = [t for t in self.clients[client] if t > now - self.window]
+            if len(timestamps) >= self.requests:
+                return False
+            timestamps.append(now)
+            self.clients[client] = timestamps
+        else:
+            self.clients[client] = [now]
+        return True
+
+
+def per_request_us(limiter, clients: int, requests: int, rate: float) -> float:
+    """Average microseconds per ``hit`` after a warm-up round over all clients."""
+    names = [f"10.0.{i // 256}.{i % 256}" for i in range(clients)]
+    now = 1_000_000.0
+    step = 1.0 / rate
+    for name in names:
+        limiter.hit(name, now)
+        now += step
+    start = time.perf_counter()
+    for i in range(requests):
+        limiter.hit(names[i % clients], now)
+        now += step
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--clients", default="10,100,1000,10000")
+    parser.add_argument("--requests", type=int, default=20_000)
+    parser.add_argument("--rate", type=float, default=1000.0, help="Simulated requests/s")
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--window", type=float, default=60.0)
+    parser.add_argument(
+        "--legacy-max-clients",
+        type=int,
+        default=1000,
+        help="Skip the previous algorithm above this many clients (it is quadratic)",
+    )
+    args = parser.parse_args()
+
+    print(f"{'clients':>8} {'sliding window':>16} {'full rebuild':>16}")
+    for clients in (int(c) for c in args.clients.split(",")):
+        sliding = per_request_us(
+            SlidingWindowLimiter(args.limit, args.window), clients, args.requests, args.rate
+        )
+        legacy = "skipped"
+        if clients <= args.legacy_max_clients:
+            requests = max(100, args.requests // max(1, clients // 10))
+            legacy_us = per_request_us(
+                RebuildLimiter(args.limit, args.window), clients, requests, args.rate
+            )
+            legacy = f"{legacy_us:10.2f} us"
+        print(f"{clients:>8} {sliding:13.2f} us {legacy:>16}")
+
+
+if __name__ == "__main__":
+    main()
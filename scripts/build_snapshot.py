@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Compile a PokeAPI data dump into an offline snapshot.
+
+Reads a dump laid out like the PokeAPI ``api-data`` repository
+(``<source>/api/v2/<resource>/<id>/index.json``), keeps only the fields the
+MCP tools use, and writes a versioned binary snapshot with id and name
+indexes for ``POKEAPI_MODE=snapshot`` or ``hybrid``.
+
+Usage:
+    python scripts/build_snapshot.py --source ./api-data/data --output data/pokeapi.snapshot
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.snapshot import FORMAT_VERSION, write_snapshot  # noqa: E402
+
+RESOURCES = ["pokemon", "move", "ability", "pokemon-species", "evolution-chain", "generation"]
+
+
+def _url(url: str, base_url: str) -> str:
+    """Rewrite a (possibly relative) resource URL onto ``base_url``."""
+    if "/api/v2/" in url:
+        return base_url + "/" + url.split("/api/v2/", 1)[1]
+    return url
+
+
+def _ref(ref: Dict[str, Any], base_url: str) -> Dict[str, str]:
+    """Rewrite a named resource reference to an absolute URL."""
+    return {"name": ref["name"], "url": _url(ref["url"], base_url)}
+
+
+def _english(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {"effect": e["effect"], "language": {"name": "en"}}
+        for e in entries
+        if e["language"]["name"] == "en"
+    ]
+
+
+def _chain_link(link: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+    return {
+        "species": _ref(link["species"], base_url),
+        "evolves_to": [_chain_link(child, base_url) for child in link["evolves_to"]],
+    }
+
+
+def compact(resource: str, doc: Dict[str, Any], base_url: str) -> Dict[str, Any]:
+    """Strip a PokeAPI document down to the fields the tools read.
+
+    Args:
+        resource: The resource type.
+        doc: The full PokeAPI document.
+        base_url: Base URL used for rewritten references.
+
+    Returns:
+        The compact document, still in PokeAPI's shape.
+    """
+    if resource == "pokemon":
+        return {
+            "id": doc["id"],
+            "name": doc["name"],
+            "stats": [
+                {"base_stat": s["base_stat"], "stat": {"name": s["stat"]["name"]}}
+                for s in doc["stats"]
+            ],
+            "types": [
+                {"slot": t["slot"], "type": {"name": t["type"]["name"]}} for t in doc["types"]
+            ],
+            "abilities": [
+                {"ability": _ref(a["ability"], base_url), "is_hidden": a["is_hidden"]}
+                for a in doc["abilities"]
+            ],
+            "moves": [{"move": _ref(m["move"], base_url)} for m in doc["moves"]],
+            "species": _ref(doc["species"], base_url),
+        }
+    if resource == "move":
+        return {
+            "id": doc["id"],
+            "name": doc["name"],
+            "power": doc.get("power"),
+            "type": {"name": doc["type"]["name"]},
+            "effect_entries": _english(doc.get("effect_entries", [])),
+        }
+    if resource == "ability":
+        return {
+            "id": doc["id"],
+            "name": doc["name"],
+            "effect_entries": _english(doc.get("effect_entries", [])),
+        }
+    if resource == "pokemon-species":
+        chain = doc.get("evolution_chain")
+        return {
+            "id": doc["id"],
+            "name": doc["name"],
+            "evolution_chain": {"url": _url(chain["url"], base_url)} if chain else None,
+        }
+    if resource == "generation":
+        return {
+            "id": doc["id"],
+            "name": doc["name"],
+            "pokemon_species": [_ref(s, base_url) for s in doc["pokemon_species"]],
+        }
+    return {"id": doc["id"], "chain": _chain_link(doc["chain"], base_url)}
+
+
+def iter_documents(
+    source: Path, base_url: str, counts: Dict[str, int]
+) -> Iterator[Tuple[List[str], bytes]]:
+    """Yield ``(keys, body)`` pairs for every supported document in the dump."""
+    for resource in RESOURCES:
+        directory = source / "api" / "v2" / resource
+        if not directory.is_dir():
+            print(f"warning: {directory} not found, skipping {resource}", file=sys.stderr)
+            continue
+        for path in sorted(directory.glob("*/index.json")):
+            doc = json.loads(path.read_text(encoding="utf-8"))
+            body = json.dumps(
+                compact(resource, doc, base_url), separators=(",", ":"), ensure_ascii=False
+            ).encode()
+            keys = [f"{resource}/{doc['id']}"]
+            if doc.get("name"):
+                keys.append(f"{resource}/{doc['name'].lower()}")
+            counts[resource] = counts.get(resource, 0) + 1
+            yield keys, body
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", required=True, type=Path, help="PokeAPI dump root")
+    parser.add_argument("--output", default="data/pokeapi.snapshot", type=Path)
+    parser.add_argument("--base-url", default="https://pokeapi.co/api/v2")
+    parser.add_argument(
+        "--dataset-version",
+        default=time.strftime("%Y%m%d"),
+        help="Version string recorded in the snapshot metadata",
+    )
+    args = parser.parse_args()
+
+    args.output.parent.mkdir(parents=True, exist_ok=True)
+    counts: Dict[str, int] = {}
+    meta = {
+        "format_version": FORMAT_VERSION,
+        "dataset_version": args.dataset_version,
+        "built_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "base_url": args.base_url.rstrip("/"),
+        "counts": counts,
+    }
+    # counts is filled while documents stream in; write_snapshot serializes
+    # meta first, so collect the documents before writing
+    documents = list(iter_documents(args.source, meta["base_url"], counts))
+    keys = write_snapshot(str(args.output), documents, meta)
+    size = args.output.stat().st_size
+    print(f"wrote {args.output}: {keys} keys, {size / 1024 / 1024:.1f} MiB")
+    for resource, count in counts.items():
+        print(f"  {resource}: {count}")
+
+
+if __name__ == "__main__":
+    main()
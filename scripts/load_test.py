@@ -0,0 +1,278 @@
+#!/usr/bin/env python3
+"""Load-test the FastAPI app and report a latency-vs-concurrency curve.
+
+Starts the local PokeAPI stub and ``api.index:app`` under uvicorn with each
+requested worker count, then drives ``/health``, ``/status`` and ``/mcp``
+with a closed-loop load generator at rising concurrency. Each step reports
+throughput, p50/p95/p99 latency and error/429 rates, and the knee of every
+curve is flagged: the step with the best throughput-to-p99 ratio (Kleinrock's
+power), past which extra concurrency mostly adds queueing delay.
+
+The generator runs in a single process; if its CPU usage gets close to one
+core the curve is measuring the client, so compare ``client_cpu`` with the
+step duration.
+
+Usage:
+    python scripts/load_test.py --workers 1,2,4 --concurrency 1,4,16,64
+    python scripts/load_test.py --endpoints health --duration 5 --output load.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+API_KEY = "load-test-key"
+
+ENDPOINTS: Dict[str, Dict[str, Any]] = {
+    "health": {"method": "GET", "path": "/health"},
+    "status": {"method": "GET", "path": "/status", "auth": True},
+    "mcp": {
+        "method": "POST",
+        "path": "/mcp",
+        "auth": True,
+        "headers": {"Accept": "application/json, text/event-stream"},
+        "json": {
+            "jsonrpc": "2.0",
+            "id": 1,
+            "method": "tools/call",
+            "params": {"name": "get_pokemon_info", "arguments": {"pokemon_name": "pikachu"}},
+        },
+    },
+}
+
+
+def free_port() -> int:
+    """Pick an unused local TCP port."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_ready(url: str, timeout: float = 30.0) -> None:
+    """Poll ``url`` until it answers, or raise after ``timeout`` seconds."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code < 500:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not become ready within {timeout:.0f}s")
+
+
+def start_stub(stub_latency: float) -> tuple:
+    """Start the PokeAPI stub; returns ``(stub, pokeapi_base_url)``."""
+    stub_port = free_port()
+    stub = subprocess.Popen(
+        [
+            sys.executable,
+            str(ROOT / "scripts" / "pokeapi_stub.py"),
+            "--port",
+            str(stub_port),
+            "--latency",
+            str(stub_latency),
+        ]
+    )
+    pokeapi_base_url = f"http://127.0.0.1:{stub_port}/api/v2"
+    wait_ready(f"{pokeapi_base_url}/pokemon/pikachu")
+    return stub, pokeapi_base_url
+
+
+def start_stack(workers: int, stub_latency: float, rate_limit: bool) -> tuple:
+    """Start the PokeAPI stub and the app; returns ``(stub, app, base_url)``."""
+    stub, pokeapi_base_url = start_stub(stub_latency)
+    app_port = free_port()
+    env = dict(
+        os.environ,
+        API_KEY=API_KEY,
+        LOG_LEVEL="WARNING",
+        POKEAPI_BASE_URL=pokeapi_base_url,
+        RATE_LIMIT_ENABLED=str(rate_limit).lower(),
+    )
+    app = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "api.index:app",
+            "--port",
+            str(app_port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+            "--no-access-log",
+        ],
+        cwd=ROOT,
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{app_port}"
+    wait_ready(f"{base_url}/health")
+    return stub, app, base_url
+
+
+def stop(*processes: subprocess.Popen) -> None:
+    """Terminate processes and wait for them to exit."""
+    for process in processes:
+        process.terminate()
+    for process in processes:
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_step(
+    base_url: str, endpoint: Dict[str, Any], concurrency: int, duration: float
+) -> Dict[str, Any]:
+    """Drive one endpoint with ``concurrency`` closed-loop clients.
+
+    Returns:
+        Throughput, latency percentiles in milliseconds and status rates.
+    """
+    headers = {"Authorization": f"Bearer {API_KEY}"} if endpoint.get("auth") else {}
+    headers.update(endpoint.get("headers", {}))
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+
+        async def worker(deadline: float) -> None:
+            while time.perf_counter() < deadline:
+                start = time.perf_counter()
+                try:
+                    response = await client.request(
+                        endpoint["method"],
+                        endpoint["path"],
+                        headers=headers,
+                        json=endpoint.get("json"),
+                    )
+                    key = str(response.status_code)
+                except httpx.TransportError as e:
+                    key = type(e).__name__
+                latencies.append((time.perf_counter() - start) * 1000)
+                statuses[key] = statuses.get(key, 0) + 1
+
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(worker(deadline) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        client_cpu = time.process_time() - cpu_start
+
+    total = len(latencies)
+    ok = sum(count for key, count in statuses.items() if key.startswith("2"))
+    limited = statuses.get("429", 0)
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "throughput_rps": ok / elapsed,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "error_rate": (total - ok - limited) / total if total else 0.0,
+        "rate_limited_rate": limited / total if total else 0.0,
+        "statuses": statuses,
+        "client_cpu": client_cpu,
+    }
+
+
+def find_knee(steps: List[Dict[str, Any]]) -> Optional[int]:
+    """Concurrency with the best throughput per millisecond of p99 latency."""
+    scored = [step for step in steps if step["p99_ms"] > 0 and step["throughput_rps"] > 0]
+    if not scored:
+        return None
+    return max(scored, key=lambda step: step["throughput_rps"] / step["p99_ms"])["concurrency"]
+
+
+async def run_curve(
+    base_url: str, name: str, concurrency_levels: List[int], duration: float
+) -> Dict[str, Any]:
+    """Measure one endpoint at every concurrency level and flag the knee."""
+    steps = []
+    for concurrency in concurrency_levels:
+        step = await run_step(base_url, ENDPOINTS[name], concurrency, duration)
+        steps.append(step)
+        print(
+            f"  {name:<7} c={concurrency:<4} {step['throughput_rps']:9.0f} req/s  "
+            f"p50 {step['p50_ms']:7.2f}  p95 {step['p95_ms']:7.2f}  p99 {step['p99_ms']:7.2f} ms  "
+            f"err {step['error_rate']:6.1%}  429 {step['rate_limited_rate']:6.1%}  "
+            f"client cpu {step['client_cpu']:.1f}s",
+            file=sys.stderr,
+        )
+    knee = find_knee(steps)
+    print(f"  {name:<7} knee at concurrency {knee}", file=sys.stderr)
+    return {"knee_concurrency": knee, "steps": steps}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", default="1", help="Comma-separated uvicorn worker counts")
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32,64")
+    parser.add_argument("--endpoints", default="health,status,mcp")
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per step")
+    parser.add_argument("--stub-latency", type=float, default=0.02)
+    parser.add_argument(
+        "--rate-limit", action="store_true", help="Keep the app's rate limiter enabled"
+    )
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(",")]
+    concurrency_levels = [int(c) for c in args.concurrency.split(",")]
+    endpoints = [e.strip() for e in args.endpoints.split(",")]
+    unknown = set(endpoints) - set(ENDPOINTS)
+    if unknown:
+        parser.error(f"unknown endpoints: {', '.join(sorted(unknown))}")
+
+    report: Dict[str, Any] = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "cpu_count": os.cpu_count(),
+            "duration_s": args.duration,
+            "stub_latency_s": args.stub_latency,
+            "rate_limit": args.rate_limit,
+        },
+        "runs": {},
+    }
+    for workers in worker_counts:
+        print(f"workers={workers}", file=sys.stderr)
+        stub, app, base_url = start_stack(workers, args.stub_latency, args.rate_limit)
+        try:
+            report["runs"][str(workers)] = {
+                name: asyncio.run(run_curve(base_url, name, concurrency_levels, args.duration))
+                for name in endpoints
+            }
+        finally:
+            stop(app, stub)
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+        print(f"wrote {args.output}", file=sys.stderr)
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+#!/usr/bin/env python3
+"""Local PokeAPI stand-in for benchmarks and offline development.
+
+Serves deterministic, PokeAPI-shaped JSON for ``/pokemon``, ``/move``,
+``/ability``, ``/pokemon-species``, ``/evolution-chain`` and ``/generation`` under
+``/api/v2`` with an injectable per-request latency.
+
+With ``--fixtures`` it replays recorded PokeAPI responses instead, from a
+directory in the PokeAPI dump layout (``api/v2/<resource>/<id>/index.json``,
+as written by ``scripts/run_benchmarks.py --record``); resources missing from
+the fixtures fall back to synthetic documents.
+
+``POST /graphql`` stands in for the PokeAPI GraphQL endpoint: it answers the
+``PokemonInfo`` query of ``src.pokeapi_client`` (selected with
+``POKEAPI_UPSTREAM=graphql``) from the same documents, reading only the
+query's variables.
+
+Usage:
+    python scripts/pokeapi_stub.py --port 8765 --latency 0.05
+    python scripts/pokeapi_stub.py --fixtures .benchmarks/fixtures
+    POKEAPI_BASE_URL=http://127.0.0.1:8765/api/v2 python server.py
+    POKEAPI_UPSTREAM=graphql POKEAPI_GRAPHQL_URL=http://127.0.0.1:8765/graphql python server.py
+"""
+import argparse
+import asyncio
+import json
+import zlib
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+TYPES = [
+    "normal", "fire", "water", "electric", "grass", "ice", "fighting", "poison", "ground",
+    "flying", "psychic", "bug", "rock", "ghost", "dragon", "dark", "steel", "fairy",
+]
+STATS = ["hp", "attack", "defense", "special-attack", "special-defense", "speed"]
+MOVE_EFFECTS = [
+    "Inflicts regular damage.",
+    "Inflicts regular damage. Has a $effect_chance% chance to paralyze the target.",
+    "Inflicts regular damage. Has a $effect_chance% chance to burn the target.",
+    "Inflicts regular damage. Has a $effect_chance% chance to poison the target.",
+]
+MOVES_PER_POKEMON = 40
+MOVE_COUNT = 200
+ABILITY_COUNT = 60
+CHAIN_LENGTH = 3
+GENERATION_SIZE = 24
+# Base URL that recorded fixtures are rewritten from
+FIXTURE_BASE_URL = "https://pokeapi.co/api/v2"
+
+
+def _seed(name: str) -> int:
+    """Stable small integer derived from a resource name."""
+    return zlib.crc32(name.encode())
+
+
+def _ref(base: str, resource: str, ident: Any, name: str) -> Dict[str, str]:
+    return {"name": name, "url": f"{base}/{resource}/{ident}/"}
+
+
+def _effect(text: str) -> List[Dict[str, Any]]:
+    return [
+        {"effect": text, "short_effect": text, "language": {"name": "en", "url": ""}},
+        {"effect": f"[de] {text}", "short_effect": text, "language": {"name": "de", "url": ""}},
+    ]
+
+
+def pokemon_doc(base: str, name: str) -> Dict[str, Any]:
+    """Build a synthetic ``/pokemon/{name}`` document."""
+    seed = _seed(name)
+    ident = int(name) if name.isdigit() else seed % 1000 + 1
+    types = [TYPES[seed % len(TYPES)]]
+    if seed % 3 == 0:
+        types.append(TYPES[(seed // 7) % len(TYPES)])
+    moves = []
+    for i in range(MOVES_PER_POKEMON):
+        move_id = (seed + i * 7) % MOVE_COUNT + 1
+        moves.append(
+            {
+                "move": _ref(base, "move", move_id, f"move-{move_id}"),
+                "version_group_details": [
+                    {
+                        "level_learned_at": i,
+                        "move_learn_method": {"name": "level-up", "url": ""},
+                        "version_group": {"name": f"version-{v}", "url": ""},
+                    }
+                    for v in range(8)
+                ],
+            }
+        )
+    abilities = [
+        {
+            "ability": _ref(base, "ability", a, f"ability-{a}"),
+            "is_hidden": i == 1,
+            "slot": i + 1,
+        }
+        for i, a in enumerate(
+            sorted({seed % ABILITY_COUNT + 1, (seed // 11) % ABILITY_COUNT + 1})
+        )
+    ]
+    return {
+        "abilities": abilities,
+        "base_experience": 100 + seed % 150,
+        "height": seed % 30,
+        "id": ident,
+        "moves": moves,
+        "name": name,
+        "species": _ref(base, "pokemon-species", ident, name),
+        "stats": [
+            {"base_stat": 30 + (seed >> (i * 3)) % 100, "effort": 0, "stat": {"name": s}}
+            for i, s in enumerate(STATS)
+        ],
+        "types": [{"slot": i + 1, "type": {"name": t, "url": ""}} for i, t in enumerate(types)],
+        "weight": seed % 1000,
+    }
+
+
+def move_doc(ident: int) -> Dict[str, Any]:
+    """Build a synthetic ``/move/{id}`` document."""
+    return {
+        "id": ident,
+        "name": f"move-{ident}",
+        "power": None if ident % 9 == 0 else 40 + ident % 80,
+        "type": {"name": TYPES[ident % len(TYPES)], "url": ""},
+        "effect_entries": _effect(MOVE_EFFECTS[ident % len(MOVE_EFFECTS)]),
+    }
+
+
+def ability_doc(ident: int) -> Dict[str, Any]:
+    """Build a synthetic ``/ability/{id}`` document."""
+    return {
+        "id": ident,
+        "name": f"ability-{ident}",
+        "effect_entries": _effect(f"Synthetic ability {ident}."),
+    }
+
+
+def species_doc(base: str, ident: int) -> Dict[str, Any]:
+    """Build a synthetic ``/pokemon-species/{id}`` document."""
+    chain_id = (ident - 1) // CHAIN_LENGTH + 1
+    return {
+        "id": ident,
+        "name": f"species-{ident}",
+        "evolution_chain": {"url": f"{base}/evolution-chain/{chain_id}/"},
+    }
+
+
+def evolution_chain_doc(base: str, ident: int) -> Dict[str, Any]:
+    """Build a synthetic linear ``/evolution-chain/{id}`` document."""
+    link: Dict[str, Any] = {}
+    first = (ident - 1) * CHAIN_LENGTH + 1
+    for species_id in reversed(range(first, first + CHAIN_LENGTH)):
+        link = {
+            "species": _ref(base, "pokemon-species", species_id, f"species-{species_id}"),
+            "evolves_to": [link] if link else [],
+        }
+    return {"id": ident, "chain": link}
+
+
+def generation_doc(base: str, ident: int) -> Dict[str, Any]:
+    """Build a synthetic ``/generation/{id}`` document listing its species."""
+    first = (ident - 1) * GENERATION_SIZE + 1
+    return {
+        "id": ident,
+        "name": f"generation-{ident}",
+        "pokemon_species": [
+            _ref(base, "pokemon-species", species_id, f"species-{species_id}")
+            for species_id in range(first, first + GENERATION_SIZE)
+        ],
+    }
+
+
+def load_fixtures(directory: str) -> Dict[Tuple[str, str], str]:
+    """Index recorded responses by ``(resource, id)`` and ``(resource, name)``.
+
+    Args:
+        directory: Root of a PokeAPI dump (containing ``api/v2``).
+
+    Returns:
+        Mapping to the raw JSON text of each recorded document.
+    """
+    fixtures = {}
+    for path in sorted(Path(directory, "api", "v2").glob("*/*/index.json")):
+        text = path.read_text(encoding="utf-8")
+        resource = path.parent.parent.name
+        fixtures[(resource, path.parent.name)] = text
+        name = json.loads(text).get("name")
+        if name:
+            fixtures[(resource, name.lower())] = text
+    return fixtures
+
+
+def _id_from_url(url: str) -> int:
+    return int(url.rstrip("/").rsplit("/", 1)[1])
+
+
+def _en_effects(data: Dict[str, Any]) -> List[Dict[str, str]]:
+    return [
+        {"effect": e["effect"]}
+        for e in data.get("effect_entries", [])
+        if e["language"]["name"] == "en"
+    ]
+
+
+def _chain_members(link: Dict[str, Any], parent: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Flatten an evolution chain tree into GraphQL species rows."""
+    ident = _id_from_url(link["species"]["url"])
+    members = [
+        {"id": ident, "name": link["species"]["name"], "evolves_from_species_id": parent}
+    ]
+    for child in link["evolves_to"]:
+        members.extend(_chain_members(child, ident))
+    return members
+
+
+def pokemon_info_rows(
+    document: Callable[[str, str], Optional[Dict[str, Any]]], variables: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Answer the ``PokemonInfo`` GraphQL query from REST documents.
+
+    Args:
+        document: Returns the REST document of a resource type and id or name.
+        variables: The query's variables.
+
+    Returns:
+        The ``pokemon`` rows, shaped as the Hasura PokeAPI schema returns them.
+    """
+    rows = []
+    for ident in [*variables["names"], *map(str, variables["ids"])]:
+        data = document("pokemon", ident)
+        if data is None:
+            continue
+        row: Dict[str, Any] = {"id": data["id"], "name": data["name"]}
+        if variables["withStats"]:
+            row["stats"] = [
+                {"base_stat": s["base_stat"], "stat": {"name": s["stat"]["name"]}}
+                for s in data["stats"]
+            ]
+        if variables["withTypes"]:
+            row["types"] = [{"type": {"name": t["type"]["name"]}} for t in data["types"]]
+        if variables["withAbilities"]:
+            row["abilities"] = []
+            for entry in data["abilities"]:
+                ability = document("ability", str(_id_from_url(entry["ability"]["url"])))
+                row["abilities"].append(
+                    {"ability": {"name": ability["name"], "effects": _en_effects(ability)}}
+                )
+        if variables["withMoves"]:
+            # Rows in document order, then each move once by move id
+            row["move_order"] = [
+                {"move_id": _id_from_url(m["move"]["url"])} for m in data["moves"]
+            ]
+            row["moves"] = []
+            for move_id in sorted({m["move_id"] for m in row["move_order"]}):
+                move = document("move", str(move_id))
+                effects = _en_effects(move)
+                row["moves"].append(
+                    {
+                        "move_id": move_id,
+                        "move": {
+                            "name": move["name"],
+                            "move_effect": {"effects": effects} if effects else None,
+                        },
+                    }
+                )
+        if variables["withEvolution"]:
+            species = document("pokemon-species", str(_id_from_url(data["species"]["url"])))
+            chain = species.get("evolution_chain")
+            members = None
+            if chain:
+                tree = document("evolution-chain", str(_id_from_url(chain["url"])))
+                members = {"species": _chain_members(tree["chain"])}
+            row["species"] = {"name": species["name"], "chain": members}
+        rows.append(row)
+    return rows
+
+
+def create_app(latency: float = 0.0, fixtures: Optional[str] = None) -> Starlette:
+    """Create the stub ASGI app.
+
+    Args:
+        latency: Seconds to sleep before answering each request.
+        fixtures: Directory of recorded responses to replay.
+
+    Returns:
+        Starlette application serving ``/api/v2/...`` and ``/graphql``.
+    """
+    app = Starlette()
+    app.state.latency = latency
+    app.state.requests = 0
+    recorded = load_fixtures(fixtures) if fixtures else {}
+
+    def synthetic(base: str, kind: str, ident: str) -> Optional[Dict[str, Any]]:
+        if kind == "pokemon":
+            return pokemon_doc(base, ident)
+        if not ident.isdigit():
+            return None
+        builders = {
+            "move": lambda: move_doc(int(ident)),
+            "ability": lambda: ability_doc(int(ident)),
+            "pokemon-species": lambda: species_doc(base, int(ident)),
+            "evolution-chain": lambda: evolution_chain_doc(base, int(ident)),
+            "generation": lambda: generation_doc(base, int(ident)),
+        }
+        return builders[kind]() if kind in builders else None
+
+    async def resource(request: Request) -> JSONResponse:
+        app.state.requests += 1
+        if app.state.latency:
+            await asyncio.sleep(app.state.latency)
+        base = str(request.base_url).rstrip("/") + "/api/v2"
+        kind = request.path_params["kind"]
+        ident = request.path_params["ident"]
+        text = recorded.get((kind, ident.lower()))
+        if text is not None:
+            return Response(
+                text.replace(FIXTURE_BASE_URL, base), media_type="application/json"
+            )
+        data = synthetic(base, kind, ident)
+        if data is None:
+            return JSONResponse({"detail": "Not found"}, status_code=404)
+        return JSONResponse(data)
+
+    async def graphql(request: Request) -> JSONResponse:
+        app.state.requests += 1
+        if app.state.latency:
+            await asyncio.sleep(app.state.latency)
+        base = str(request.base_url).rstrip("/") + "/api/v2"
+        variables = (await request.json()).get("variables") or {}
+
+        def document(kind: str, ident: str) -> Optional[Dict[str, Any]]:
+            text = recorded.get((kind, ident.lower()))
+            if text is not None:
+                return json.loads(text.replace(FIXTURE_BASE_URL, base))
+            return synthetic(base, kind, ident)
+
+        try:
+            rows = pokemon_info_rows(document, variables)
+        except KeyError as e:
+            return JSONResponse({"errors": [{"message": f"Missing variable {e}"}]})
+        return JSONResponse({"data": {"pokemon": rows}})
+
+    app.router.routes.append(Route("/api/v2/{kind}/{ident}/", resource))
+    app.router.routes.append(Route("/api/v2/{kind}/{ident}", resource))
+    app.router.routes.append(Route("/graphql", graphql, methods=["POST"]))
+    return app
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds per request")
+    parser.add_argument("--fixtures", help="Directory of recorded responses to replay")
+    args = parser.parse_args()
+    uvicorn.run(
+        create_app(args.latency, args.fixtures),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""Local Redis-protocol stand-in for testing the shared rate-limit backend.
+
+Implements the RESP2 commands the rate limiter uses (``PING``, ``GET``,
+``SET``, ``INCR``, ``INCRBY``, ``DECRBY``, ``EXPIRE``, ``TTL``, ``DEL``,
+``SELECT``, ``AUTH``, ``FLUSHALL``) on an in-memory dict with key expiry.
+Commands run one at a time on the event loop, so each is atomic as in Redis.
+Not a Redis replacement: no persistence, no eviction, one keyspace.
+
+Usage:
+    python scripts/redis_standin.py --port 6379
+    RATE_LIMIT_BACKEND=redis RATE_LIMIT_REDIS_URL=redis://127.0.0.1:6379/0 \\
+        uvicorn api.index:app --workers 4
+"""
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.resp import RespError, read_reply  # noqa: E402
+
+
+class Store:
+    """Keyspace of bytes values with optional expiry deadlines."""
+
+    def __init__(self) -> None:
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+
+    def get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, deadline = entry
+        if deadline is not None and deadline <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def incrby(self, key: bytes, amount: int) -> int:
+        value = int(self.get(key) or 0) + amount
+        deadline = self.data[key][1] if key in self.data else None
+        self.data[key] = (str(value).encode(), deadline)
+        return value
+
+    def execute(self, command: List[bytes]) -> Any:
+        name, args = command[0].upper(), command[1:]
+        if name == b"PING":
+            return "PONG"
+        if name in (b"SELECT", b"AUTH"):
+            return "OK"
+        if name == b"GET":
+            return self.get(args[0])
+        if name == b"SET":
+            self.data[args[0]] = (args[1], None)
+            return "OK"
+        if name == b"INCR":
+            return self.incrby(args[0], 1)
+        if name == b"INCRBY":
+            return self.incrby(args[0], int(args[1]))
+        if name == b"DECRBY":
+            return self.incrby(args[0], -int(args[1]))
+        if name == b"EXPIRE":
+            if self.get(args[0]) is None:
+                return 0
+            self.data[args[0]] = (self.data[args[0]][0], time.monotonic() + int(args[1]))
+            return 1
+        if name == b"TTL":
+            if self.get(args[0]) is None:
+                return -2
+            deadline = self.data[args[0]][1]
+            return -1 if deadline is None else int(deadline - time.monotonic())
+        if name == b"DEL":
+            return sum(self.data.pop(key, None) is not None for key in args)
+        if name == b"FLUSHALL":
+            self.data.clear()
+            return "OK"
+        return RespError(f"ERR unknown command '{name.decode(errors='replace')}'")
+
+
+def encode_reply(reply: Any) -> bytes:
+    """Encode a reply value as RESP2."""
+    if isinstance(reply, RespError):
+        return b"-%s\r\n" % str(reply).encode()
+    if isinstance(reply, str):
+        return b"+%s\r\n" % reply.encode()
+    if isinstance(reply, int):
+        return b":%d\r\n" % reply
+    if reply is None:
+        return b"$-1\r\n"
+    return b"$%d\r\n%s\r\n" % (len(reply), reply)
+
+
+def create_handler(store: Store):
+    """Build the per-connection handler serving ``store``."""
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                command = await read_reply(reader)
+                if not isinstance(command, list) or not command:
+                    writer.write(encode_reply(RespError("ERR expected a command array")))
+                else:
+                    writer.write(encode_reply(store.execute(command)))
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return handle
+
+
+async def main(host: str, port: int) -> None:
+    server = await asyncio.start_server(create_handler(Store()), host, port)
+    print(f"redis stand-in listening on {host}:{port}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=6379)
+    args = parser.parse_args()
+    try:
+        asyncio.run(main(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""Reproducible benchmark suite for the MCP tools, battle engine and HTTP stack.
+
+PokeAPI is replaced by the local stub (``scripts/pokeapi_stub.py``) with an
+injectable per-request latency, serving synthetic documents or replaying
+recorded fixtures. Every benchmark reports p50/p95/p99 latency, throughput,
+upstream PokeAPI calls per operation and allocations per operation (measured
+in a separate tracemalloc pass so tracing does not skew the timings).
+Results are written as JSON so runs can be compared across commits.
+
+Usage:
+    python scripts/run_benchmarks.py --latency 0.02 --iterations 200
+    python scripts/run_benchmarks.py --fixtures .benchmarks/fixtures
+    python scripts/run_benchmarks.py --compare .benchmarks/<previous>.json
+    # record fixtures from live PokeAPI for later replay
+    python scripts/run_benchmarks.py --record .benchmarks/fixtures --iterations 1
+"""
+import argparse
+import asyncio
+import json
+import itertools
+import logging
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("API_KEY", "benchmark-key")
+os.environ.setdefault("RATE_LIMIT_ENABLED", "false")
+
+import httpx  # noqa: E402
+
+from pokeapi_stub import FIXTURE_BASE_URL, create_app  # noqa: E402
+from src.battle_engine import run_battle  # noqa: E402
+from src.battle_utils import calculate_damage  # noqa: E402
+from src.cache import get_cache  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.entities import get_entity_store  # noqa: E402
+from src.pokeapi_client import (  # noqa: E402
+    create_http_client,
+    fetch_pokemon_full_data,
+    get_http_client,
+    set_http_client,
+)
+from api.index import app  # noqa: E402
+import server  # noqa: E402
+
+RESOURCE_URL = re.compile(r"/api/v2/([a-z-]+)/[^/?#]+/?$")
+
+Operation = Callable[[], Awaitable[Any]]
+
+
+class UpstreamCounter:
+    """httpx event hooks counting (and optionally recording) PokeAPI calls."""
+
+    def __init__(self, record_dir: Optional[Path] = None) -> None:
+        self.calls = 0
+        self.record_dir = record_dir
+
+    async def on_request(self, request: httpx.Request) -> None:
+        self.calls += 1
+
+    async def on_response(self, response: httpx.Response) -> None:
+        if self.record_dir is None or response.status_code != 200:
+            return
+        match = RESOURCE_URL.search(response.request.url.path)
+        if not match:
+            return
+        body = await response.aread()
+        doc = json.loads(body)
+        path = self.record_dir / "api" / "v2" / match.group(1) / str(doc["id"]) / "index.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        text = body.decode().replace(settings.pokeapi_base_url.rstrip("/"), FIXTURE_BASE_URL)
+        path.write_text(text, encoding="utf-8")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def measure(
+    op: Operation,
+    iterations: int,
+    counter: UpstreamCounter,
+    alloc_iterations: int,
+    before_each: Optional[Callable[[], None]] = None,
+    warmup: int = 1,
+) -> Dict[str, Any]:
+    """Time an operation, then measure its allocations in a traced pass.
+
+    Args:
+        op: Async operation to benchmark.
+        iterations: Timed iterations.
+        counter: Upstream call counter shared with the HTTP client.
+        alloc_iterations: Iterations of the tracemalloc pass.
+        before_each: Untimed setup run before every iteration.
+        warmup: Untimed calls made first, to fill caches and lazy singletons.
+
+    Returns:
+        Latency percentiles in milliseconds, throughput, upstream calls and
+        allocation figures per operation.
+    """
+    for _ in range(warmup):
+        await op()
+    latencies = []
+    calls_before = counter.calls
+    total = 0.0
+    for _ in range(iterations):
+        if before_each is not None:
+            before_each()
+        start = time.perf_counter()
+        await op()
+        elapsed = time.perf_counter() - start
+        total += elapsed
+        latencies.append(elapsed * 1000)
+    upstream = (counter.calls - calls_before) / iterations
+
+    peaks, retained = [], []
+    tracemalloc.start()
+    for _ in range(alloc_iterations):
+        if before_each is not None:
+            before_each()
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        await op()
+        after, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - current)
+        retained.append(after - current)
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "iterations": iterations,
+        "p50_ms": percentile(latencies, 50),
+        "p95_ms": percentile(latencies, 95),
+        "p99_ms": percentile(latencies, 99),
+        "mean_ms": statistics.fmean(latencies),
+        "throughput_ops": iterations / total if total else 0.0,
+        "upstream_calls_per_op": upstream,
+        "alloc_peak_bytes_per_op": statistics.fmean(peaks) if peaks else 0.0,
+        "alloc_retained_bytes_per_op": statistics.fmean(retained) if retained else 0.0,
+    }
+
+
+def git_commit() -> Optional[str]:
+    """Current commit of the checkout, if available."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def build_suite(pokemon: List[str], http: httpx.AsyncClient) -> Dict[str, Any]:
+    """Define the benchmarks as ``name -> (operation, before_each)``."""
+    names = itertools.cycle(pokemon)
+    pair = pokemon[:2] if len(pokemon) > 1 else pokemon * 2
+    headers = {"Authorization": f"Bearer {settings.api_key}"}
+    mcp_headers = dict(headers, Accept="application/json, text/event-stream")
+    mcp_call = {
+        "jsonrpc": "2.0",
+        "id": 1,
+        "method": "tools/call",
+        "params": {"name": "get_pokemon_info", "arguments": {"pokemon_name": pokemon[0]}},
+    }
+    combatants: Dict[str, Any] = {}
+
+    async def engine_battle() -> None:
+        if not combatants:
+            client = get_http_client()
+            combatants["pair"] = [await fetch_pokemon_full_data(client, n) for n in pair]
+        run_battle(*combatants["pair"], record_events=True)
+
+    async def damage() -> None:
+        if not combatants:
+            await engine_battle()
+        poke1, poke2 = combatants["pair"]
+        for _ in range(100):
+            calculate_damage(poke1, poke2, None)
+
+    return {
+        "tool.get_pokemon_info.cold": (
+            lambda: server.get_pokemon_info(next(names)),
+            lambda: (get_cache().clear(), get_entity_store().clear()),
+        ),
+        "tool.get_pokemon_info.warm": (lambda: server.get_pokemon_info(next(names)), None),
+        "tool.simulate_battle.full": (lambda: server.simulate_battle(*pair), None),
+        "tool.simulate_battle.none": (lambda: server.simulate_battle(*pair, detail="none"), None),
+        "engine.run_battle": (engine_battle, None),
+        "battle_utils.calculate_damage_x100": (damage, None),
+        "http.health": (lambda: http.get("/health"), None),
+        "http.status": (lambda: http.get("/status", headers=headers), None),
+        "http.mcp": (lambda: http.post("/mcp", json=mcp_call, headers=mcp_headers), None),
+    }
+
+
+async def main(args: argparse.Namespace) -> Dict[str, Any]:
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    record_dir = Path(args.record) if args.record else None
+    counter = UpstreamCounter(record_dir)
+    hooks = {"request": [counter.on_request], "response": [counter.on_response]}
+    if record_dir is not None:
+        # Record from the configured (live) upstream
+        client = create_http_client()
+        client.event_hooks = hooks
+    else:
+        settings.pokeapi_base_url = "http://stub/api/v2"
+        stub = create_app(args.latency, args.fixtures)
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=stub), event_hooks=hooks)
+    set_http_client(client)
+    http = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+
+    pokemon = [name.strip().lower() for name in args.pokemon.split(",") if name.strip()]
+    suite = build_suite(pokemon, http)
+    # The lifespan starts the MCP session manager behind /mcp
+    async with app.router.lifespan_context(app):
+        selected = re.compile(args.only) if args.only else None
+        results = {}
+        for name, (op, before_each) in suite.items():
+            if selected and not selected.search(name):
+                continue
+            results[name] = await measure(
+                op,
+                args.iterations,
+                counter,
+                min(args.iterations, args.alloc_iterations),
+                before_each,
+                warmup=len(pokemon),
+            )
+            row = results[name]
+            print(
+                f"{name:<36} p50 {row['p50_ms']:8.3f}  p95 {row['p95_ms']:8.3f}  "
+                f"p99 {row['p99_ms']:8.3f} ms  {row['throughput_ops']:9.0f} ops/s  "
+                f"upstream {row['upstream_calls_per_op']:5.1f}  "
+                f"alloc {row['alloc_peak_bytes_per_op'] / 1024:8.1f} KiB",
+                file=sys.stderr,
+            )
+    await http.aclose()
+    await client.aclose()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "upstream": "record" if record_dir else ("fixtures" if args.fixtures else "stub"),
+            "latency_s": args.latency,
+            "iterations": args.iterations,
+            "pokemon": pokemon,
+        },
+        "results": results,
+    }
+
+
+def compare(report: Dict[str, Any], baseline_path: str) -> None:
+    """Print p50/p99 and allocation ratios against a previous report."""
+    baseline = json.loads(Path(baseline_path).read_text())
+    print(f"compared with {baseline['meta'].get('commit')} ({baseline_path})", file=sys.stderr)
+    for name, row in report["results"].items():
+        base = baseline["results"].get(name)
+        if not base:
+            continue
+        ratios = [
+            f"{key.split('_')[0]} x{row[key] / base[key]:.2f}" if base[key] else f"{key} n/a"
+            for key in ("p50_ms", "p99_ms", "alloc_peak_bytes_per_op")
+        ]
+        print(f"{name:<36} " + "  ".join(ratios), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.01, help="Stub seconds per request")
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--alloc-iterations", type=int, default=20)
+    parser.add_argument("--pokemon", default="pikachu,charizard,gengar,alakazam,snorlax")
+    parser.add_argument("--fixtures", help="Replay recorded responses from this directory")
+    parser.add_argument("--record", help="Record live PokeAPI responses into this directory")
+    parser.add_argument("--only", help="Regex selecting benchmarks to run")
+    parser.add_argument("--output", help="JSON report path (default .benchmarks/<time>-<commit>.json)")
+    parser.add_argument("--compare", help="Previous JSON report to compare against")
+    args = parser.parse_args()
+
+    report = asyncio.run(main(args))
+    output = Path(
+        args.output
+        or ROOT / ".benchmarks" / f"{time.strftime('%Y%m%d-%H%M%S')}-{report['meta']['commit']}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"wrote {output}", file=sys.stderr)
+    if args.compare:
+        compare(report, args.compare)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Render traces written by the file span exporter as latency waterfalls.
+
+Each span is printed under its parent with its start offset, duration and a
+bar positioned on the trace's timeline, so the slow upstream fetch or
+compute phase of a request stands out. ``--demo`` first traces one
+``get_pokemon_info`` call against the local PokeAPI stub; ``--overhead``
+compares tool latency with tracing off and on.
+
+Usage:
+    TRACE_SAMPLE_RATE=1 uvicorn api.index:app   # then, after some traffic:
+    python scripts/trace_waterfall.py --file logs/traces.jsonl --last 3
+    python scripts/trace_waterfall.py --request-id 1717171717.123
+    python scripts/trace_waterfall.py --demo pikachu --latency 0.02
+    python scripts/trace_waterfall.py --overhead 2000
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+
+from pokeapi_stub import create_app  # noqa: E402
+from src.cache import get_cache  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.pokeapi_client import set_http_client  # noqa: E402
+from src.tracing import close_tracing  # noqa: E402
+import server  # noqa: E402
+
+
+def load_traces(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Group the spans of a JSON-lines trace file by trace ID."""
+    traces: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                span = json.loads(line)
+                traces[span["trace_id"]].append(span)
+    return traces
+
+
+def label(span: Dict[str, Any]) -> str:
+    """Short description of a span's most useful attributes."""
+    attributes = span["attributes"]
+    parts = []
+    if "url" in attributes:
+        parts.append("/".join(attributes["url"].rstrip("/").split("/")[-2:]))
+    for key in ("hit", "source", "status_code", "detail", "request_id", "error"):
+        if key in attributes:
+            parts.append(f"{key}={attributes[key]}")
+    return " ".join(parts)
+
+
+def render(spans: List[Dict[str, Any]], width: int) -> str:
+    """Render one trace as an indented waterfall."""
+    children: Dict[Optional[str], List[Dict[str, Any]]] = defaultdict(list)
+    ids = {span["span_id"] for span in spans}
+    for span in spans:
+        parent = span["parent_id"] if span["parent_id"] in ids else None
+        children[parent].append(span)
+    for group in children.values():
+        group.sort(key=lambda span: span["start_ns"])
+
+    roots = children[None]
+    origin = min(span["start_ns"] for span in spans)
+    total_ms = max(
+        (span["start_ns"] - origin) / 1e6 + span["duration_ms"] for span in spans
+    ) or 1.0
+    lines = [f"trace {spans[0]['trace_id']}  {total_ms:.1f} ms  {len(spans)} spans"]
+
+    def walk(span: Dict[str, Any], depth: int) -> None:
+        offset = (span["start_ns"] - origin) / 1e6
+        left = int(offset / total_ms * width)
+        bar = max(1, round(span["duration_ms"] / total_ms * width))
+        marker = "!" if span["status"] == "error" else "="
+        name = "  " * depth + span["name"]
+        lines.append(
+            f"{offset:8.1f} {span['duration_ms']:8.1f}  "
+            f"|{' ' * left}{marker * bar}{' ' * max(0, width - left - bar)}|  "
+            f"{name} {label(span)}".rstrip()
+        )
+        for child in children[span["span_id"]]:
+            walk(child, depth + 1)
+
+    for root in roots:
+        walk(root, 0)
+    return "\n".join(lines)
+
+
+async def demo(pokemon: str, latency: float, path: str) -> None:
+    """Trace one cold ``get_pokemon_info`` call against the stub."""
+    settings.trace_sample_rate = 1.0
+    settings.trace_exporter = "file"
+    settings.trace_file = path
+    settings.cache_enabled = False
+    settings.pokeapi_base_url = "http://stub/api/v2"
+    set_http_client(httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app(latency))))
+    result = await server.get_pokemon_info(pokemon)
+    if "error" in result:
+        raise SystemExit(result["error"])
+    close_tracing()
+
+
+async def overhead(iterations: int) -> None:
+    """Compare warm-cache ``get_pokemon_info`` latency with tracing off and on."""
+    settings.trace_exporter = "file"
+    settings.trace_file = os.path.join(tempfile.mkdtemp(prefix="traces-"), "traces.jsonl")
+    settings.pokeapi_base_url = "http://stub/api/v2"
+    set_http_client(httpx.AsyncClient(transport=httpx.ASGITransport(app=create_app())))
+    get_cache()
+    await server.get_pokemon_info("pikachu")
+    print(f"{'sample rate':>11} {'us/call':>9}")
+    for rate in (0.0, 0.0, 1.0, 0.0):
+        settings.trace_sample_rate = rate
+        start = time.perf_counter()
+        for _ in range(iterations):
+            await server.get_pokemon_info("pikachu")
+        elapsed = time.perf_counter() - start
+        print(f"{rate:>11} {elapsed / iterations * 1e6:9.1f}")
+    close_tracing()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file", default=settings.trace_file)
+    parser.add_argument("--trace-id")
+    parser.add_argument("--request-id")
+    parser.add_argument("--last", type=int, default=1, help="Render the N most recent traces")
+    parser.add_argument("--width", type=int, default=50)
+    parser.add_argument("--demo", metavar="POKEMON")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--overhead", type=int, metavar="ITERATIONS")
+    args = parser.parse_args()
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if args.overhead:
+        asyncio.run(overhead(args.overhead))
+        return
+    if args.demo:
+        args.file = os.path.join(tempfile.mkdtemp(prefix="traces-"), "traces.jsonl")
+        asyncio.run(demo(args.demo, args.latency, args.file))
+
+    traces = list(load_traces(args.file).values())
+    if args.trace_id:
+        traces = [spans for spans in traces if spans[0]["trace_id"] == args.trace_id]
+    elif args.request_id:
+        traces = [
+            spans for spans in traces
+            if any(s["attributes"].get("request_id") == args.request_id for s in spans)
+        ]
+    else:
+        traces.sort(key=lambda spans: min(s["start_ns"] for s in spans))
+        traces = traces[-args.last:]
+    if not traces:
+        raise SystemExit("No matching traces.")
+    print(f"{'start ms':>8} {'dur ms':>8}")
+    print("\n\n".join(render(spans, args.width) for spans in traces))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,76 @@
 """Main production server with FastMCP and HTTP transport."""
+import asyncio
 import random
-from typing import Dict, Any
+import sys
+from typing import Dict, Any, List, Optional, Set, Tuple, Union
 import time
-from mcp.server.fastmcp import FastMCP
+import anyio
+from mcp.server.fastmcp import Context, FastMCP
 import httpx
 
-from src.constants import STATUS_PARALYSIS, POKEAPI_BASE_URL
-from src.battle_utils import (
-    calculate_damage,
-    apply_status_effects,
-    try_inflict_status,
-    parse_evolution_chain,
+from src.cache import close_cache, get_cache
+from src.pokeapi_client import (
+    close_http_client,
+    fetch_entity,
+    fetch_evolution_family,
+    fetch_json,
+    fetch_pokemon_info_graphql,
+    fetch_pokemon_full_data,
+    gather_limited,
+    get_http_client,
+    lookup_evolution_family,
+    not_found_error,
 )
-from src.pokeapi_client import fetch_pokemon_full_data
 from src.config import settings
-from src.logger import get_logger, configure_logging
-from src.monitoring import record_tool_call, record_pokeapi_request
+from src.entities import (
+    Ability,
+    EvolutionChain,
+    Move,
+    Pokemon,
+    Ref,
+    single_species_chain,
+    species_id,
+)
+from src.battle_engine import BATTLE_DETAIL_LEVELS, render_events, run_battle
+from src.monte_carlo import run_monte_carlo
+from src.tournament import close_process_pool, run_tournament
+from src.snapshot import close_snapshot, get_snapshot
+from src.tracing import close_tracing, span, traced
+from src.logger import close_logging, get_logger, configure_logging
+from src.monitoring import record_tool_call
 
 # Configure logging
-configure_logging(settings.log_level, settings.log_format)
+# stdout carries the stdio transport, so logs go to stderr
+configure_logging(
+    settings.log_level,
+    settings.log_format,
+    async_writer=settings.log_async,
+    queue_size=settings.log_queue_size,
+    sample_rates=settings.log_sample_rates_map,
+    max_field_bytes=settings.log_max_field_bytes,
+    stream=sys.stderr,
+)
 logger = get_logger(__name__)
 
-# Initialize FastMCP server
-mcp = FastMCP(settings.server_name)
+# Initialize FastMCP server; api/index.py serves it over stateless streamable
+# HTTP, answering each POST with one JSON body so any worker can take any request
+mcp = FastMCP(
+    settings.server_name,
+    host=settings.host,
+    port=settings.port,
+    stateless_http=True,
+    json_response=True,
+    log_level=settings.log_level.upper(),
+)
+# Advertise our version; unset, the SDK reads the mcp package metadata from disk
+# on every stateless HTTP request. FastMCP takes no version argument, so this
+# deliberately sets the low-level server's ``version`` attribute (checked against
+# mcp 1.30); the guard keeps startup working if a later SDK moves it.
+if hasattr(getattr(mcp, "_mcp_server", None), "version"):
+    mcp._mcp_server.version = settings.server_version
+
+# Sections get_pokemon_info can return; name and ID are always included
+POKEMON_INFO_FIELDS = ("stats", "types", "abilities", "moves", "evolution")
 
 logger.info(
     "server_initializing",
@@ -32,111 +80,314 @@ logger.info(
 )
 
 
+async def _fetch_effect(client: httpx.AsyncClient, ref: Ref, endpoint: str) -> Dict[str, Any]:
+    """Fetch a move or ability and return its name with English effect text."""
+    return _effect_entry(ref, await fetch_entity(client, ref.url, endpoint))
+
+
+def _effect_entry(ref: Ref, entity: Union[Move, Ability]) -> Dict[str, Any]:
+    """Name a fetched move or ability alongside its English effect text."""
+    return {"name": ref.name, "effect": entity.effect}
+
+
+def _select_fields(fields: Optional[List[str]]) -> Set[str]:
+    """Resolve the requested ``get_pokemon_info`` sections; None selects all.
+
+    Raises:
+        ValueError: If a field is not one of ``POKEMON_INFO_FIELDS``.
+    """
+    if fields is None:
+        return set(POKEMON_INFO_FIELDS)
+    selected = {field.lower() for field in fields}
+    unknown = selected.difference(POKEMON_INFO_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unknown fields {', '.join(sorted(unknown))}. "
+            f"Use any of {', '.join(POKEMON_INFO_FIELDS)}."
+        )
+    return selected
+
+
+def _move_window(offset: int, limit: int) -> Tuple[int, int]:
+    """Clamp a move page to the list start and ``POKEMON_INFO_MAX_MOVES``."""
+    return max(0, offset), max(0, min(limit, settings.pokemon_info_max_moves))
+
+
+def _move_page(pokemon: Pokemon, offset: int, limit: int) -> Tuple[Ref, ...]:
+    """Slice a page of a Pokémon's move list."""
+    offset, limit = _move_window(offset, limit)
+    return pokemon.moves[offset : offset + limit]
+
+
+def _graphql_upstream() -> bool:
+    """Whether Pokémon info comes from the GraphQL endpoint instead of REST.
+
+    The offline snapshot holds REST documents, so snapshot and hybrid modes
+    always use REST.
+    """
+    return settings.pokeapi_upstream == "graphql" and settings.pokeapi_mode == "live"
+
+
+def _build_pokemon_info(
+    pokemon: Pokemon,
+    fields: Set[str],
+    abilities: Optional[List[Dict[str, Any]]] = None,
+    moves: Optional[List[Dict[str, Any]]] = None,
+    evolution: Optional[EvolutionChain] = None,
+) -> Dict[str, Any]:
+    """Assemble a ``get_pokemon_info`` result from the fetched requested sections."""
+    info: Dict[str, Any] = {"name": pokemon.name, "id": pokemon.id}
+    if "stats" in fields:
+        info["base_stats"] = pokemon.base_stats
+    if "types" in fields:
+        info["types"] = list(pokemon.types)
+    if "abilities" in fields:
+        info["abilities"] = abilities
+    if "moves" in fields:
+        info["moves"] = moves
+        info["moves_total"] = len(pokemon.moves)
+    if "evolution" in fields:
+        info["evolution_chain"] = list(evolution.names)
+        info["evolution_tree"] = evolution.tree
+    return info
+
+
+async def _fetch_unique(client: httpx.AsyncClient, urls: Dict[str, str]) -> Dict[str, Any]:
+    """Fetch each URL's entity once, concurrently, without failing on the first error.
+
+    Args:
+        client: The shared PokeAPI client.
+        urls: Endpoint name of each URL to fetch.
+
+    Returns:
+        The entity, or the exception raised fetching it, by URL.
+    """
+
+    async def fetch(url: str, endpoint: str) -> Any:
+        try:
+            return await fetch_entity(client, url, endpoint)
+        except Exception as e:
+            return e
+
+    documents = await gather_limited(
+        settings.pokeapi_max_concurrency,
+        *(fetch(url, endpoint) for url, endpoint in urls.items()),
+    )
+    return dict(zip(urls, documents))
+
+
+def _unwrap(entity: Any) -> Any:
+    """Return an entity from ``_fetch_unique``, re-raising a failed fetch."""
+    if isinstance(entity, Exception):
+        raise entity
+    return entity
+
+
+def _fetch_error_message(error: Exception) -> str:
+    """Describe a failed fetch the way ``get_pokemon_info`` reports it."""
+    if isinstance(error, httpx.HTTPStatusError):
+        return f"HTTP error: {error}"
+    if isinstance(error, httpx.RequestError):
+        return f"Request error: {error}"
+    return f"Unexpected error: {error}"
+
+
+async def _rest_pokemon_info(
+    client: httpx.AsyncClient,
+    pokemon_name: str,
+    fields: Set[str],
+    moves_offset: int,
+    moves_limit: int,
+) -> Dict[str, Any]:
+    """Assemble ``get_pokemon_info`` from one REST request per resource."""
+    # Fetch main Pokémon data
+    pokemon_url = f"{settings.pokeapi_base_url}/pokemon/{pokemon_name.lower()}"
+    pokemon = await fetch_entity(client, pokemon_url, "pokemon")
+
+    # Abilities, the page of moves and the evolution chain are independent
+    # of each other, so fetch the requested ones concurrently
+    ability_refs = pokemon.abilities if "abilities" in fields else ()
+    move_refs = _move_page(pokemon, moves_offset, moves_limit) if "moves" in fields else ()
+    evolution = (
+        [fetch_evolution_family(client, pokemon.species.url)] if "evolution" in fields else []
+    )
+    results = await gather_limited(
+        settings.pokeapi_max_concurrency,
+        *(_fetch_effect(client, ref, "ability") for ref in ability_refs),
+        *(_fetch_effect(client, ref, "move") for ref in move_refs),
+        *evolution,
+    )
+    abilities = results[: len(ability_refs)]
+    moves = results[len(ability_refs) : len(ability_refs) + len(move_refs)]
+    family = results[-1] if evolution else None
+    return _build_pokemon_info(pokemon, fields, abilities, moves, family)
+
+
+async def _graphql_pokemon_info(
+    client: httpx.AsyncClient,
+    pokemon_name: str,
+    fields: Set[str],
+    moves_offset: int,
+    moves_limit: int,
+) -> Dict[str, Any]:
+    """Fetch ``get_pokemon_info`` in a single GraphQL query."""
+    name = pokemon_name.lower()
+    offset, limit = _move_window(moves_offset, moves_limit)
+    found = await fetch_pokemon_info_graphql(client, [name], fields, limit, offset)
+    if name not in found:
+        raise not_found_error(settings.pokeapi_graphql_url, f"Pokémon not found: {name}")
+    return found[name]
+
+
+async def _rest_pokemon_info_batch(
+    client: httpx.AsyncClient,
+    names: List[str],
+    fields: Set[str],
+    moves_offset: int,
+    moves_limit: int,
+) -> List[Dict[str, Any]]:
+    """Assemble ``get_pokemon_info_batch`` entries over REST, fetching each resource once."""
+    pokemon_urls = {name: f"{settings.pokeapi_base_url}/pokemon/{name}" for name in names}
+    pokemon_entities = await _fetch_unique(
+        client, {url: "pokemon" for url in pokemon_urls.values()}
+    )
+    fetched = [
+        pokemon for pokemon in pokemon_entities.values() if not isinstance(pokemon, Exception)
+    ]
+
+    # Union of the requested resources the batch references, so moves and
+    # abilities shared by several Pokémon are fetched once; species go first
+    # because their evolution chains are fetched in a second round, unless
+    # their family is already stored
+    families: Dict[str, EvolutionChain] = {}
+    resources: Dict[str, str] = {}
+    if "evolution" in fields:
+        for pokemon in fetched:
+            family = lookup_evolution_family(pokemon.species.url)
+            if family is not None:
+                families[pokemon.species.url] = family
+            else:
+                resources[pokemon.species.url] = "species"
+    for pokemon in fetched:
+        if "abilities" in fields:
+            for ref in pokemon.abilities:
+                resources[ref.url] = "ability"
+        if "moves" in fields:
+            for ref in _move_page(pokemon, moves_offset, moves_limit):
+                resources[ref.url] = "move"
+    entities = await _fetch_unique(client, resources)
+
+    chain_urls: Dict[str, str] = {}
+    if "evolution" in fields:
+        for pokemon in fetched:
+            species = entities.get(pokemon.species.url)
+            if species is None or isinstance(species, Exception):
+                continue
+            if species.evolution_chain_url is None:
+                families[pokemon.species.url] = single_species_chain(species)
+            else:
+                chain_urls[species.evolution_chain_url] = "evolution-chain"
+    chains = await _fetch_unique(client, chain_urls)
+
+    entries: List[Dict[str, Any]] = []
+    for name, url in pokemon_urls.items():
+        try:
+            pokemon = _unwrap(pokemon_entities[url])
+            family = None
+            if "evolution" in fields:
+                family = families.get(pokemon.species.url)
+                if family is None:
+                    species = _unwrap(entities[pokemon.species.url])
+                    family = _unwrap(chains[species.evolution_chain_url])
+            abilities = [
+                _effect_entry(ref, _unwrap(entities[ref.url]))
+                for ref in (pokemon.abilities if "abilities" in fields else ())
+            ]
+            moves = [
+                _effect_entry(ref, _unwrap(entities[ref.url]))
+                for ref in (
+                    _move_page(pokemon, moves_offset, moves_limit) if "moves" in fields else ()
+                )
+            ]
+        except Exception as e:
+            entries.append({"name": name, "error": _fetch_error_message(e)})
+            continue
+        entries.append(_build_pokemon_info(pokemon, fields, abilities, moves, family))
+    return entries
+
+
+async def _graphql_pokemon_info_batch(
+    client: httpx.AsyncClient,
+    names: List[str],
+    fields: Set[str],
+    moves_offset: int,
+    moves_limit: int,
+) -> List[Dict[str, Any]]:
+    """Fetch ``get_pokemon_info_batch`` entries in a single GraphQL query."""
+    offset, limit = _move_window(moves_offset, moves_limit)
+    found = await fetch_pokemon_info_graphql(client, names, fields, limit, offset)
+    return [
+        found.get(name) or {"name": name, "error": f"Pokémon not found: {name}"}
+        for name in names
+    ]
+
+
 @mcp.tool()
-async def get_pokemon_info(pokemon_name: str) -> Dict[str, Any]:
+@traced("tool.get_pokemon_info")
+async def get_pokemon_info(
+    pokemon_name: str,
+    fields: Optional[List[str]] = None,
+    moves_limit: int = 10,
+    moves_offset: int = 0,
+) -> Dict[str, Any]:
     """
     Get comprehensive information about a Pokémon.
 
     Includes base stats, types, abilities, moves (with effects), and evolution information.
+    The evolution section lists every member of the family in evolution_chain, base form
+    first, and its branches in evolution_tree.
 
     Args:
         pokemon_name: The name of the Pokémon to get information about.
+        fields: Sections to return, any of "stats", "types", "abilities",
+            "moves" and "evolution"; all by default. Only the requested
+            sections are fetched, so stats and types alone cost one request.
+        moves_limit: Number of moves to return.
+        moves_offset: Position in the full move list of the first move
+            returned, for paging through it with moves_total.
 
     Returns:
         A dictionary containing the Pokémon's information.
     """
     start_time = time.time()
-    logger.info("tool_called", tool="get_pokemon_info", pokemon=pokemon_name)
+    logger.info("tool_called", tool="get_pokemon_info", pokemon=pokemon_name, fields=fields)
 
     try:
-        async with httpx.AsyncClient(timeout=settings.pokeapi_timeout) as client:
-            # Fetch main Pokémon data
-            pokemon_url = f"{settings.pokeapi_base_url}/pokemon/{pokemon_name.lower()}"
-            pokemon_response = await client.get(pokemon_url)
-            record_pokeapi_request("pokemon", pokemon_response.status_code)
-            pokemon_response.raise_for_status()
-            pokemon_data = pokemon_response.json()
-
-            # Base stats
-            base_stats = {
-                stat["stat"]["name"]: stat["base_stat"] for stat in pokemon_data["stats"]
-            }
-
-            # Types
-            types = [t["type"]["name"] for t in pokemon_data["types"]]
-
-            # Abilities (with effect text)
-            abilities = []
-            for ability_entry in pokemon_data["abilities"]:
-                ability_name = ability_entry["ability"]["name"]
-                ability_url = ability_entry["ability"]["url"]
-                ability_resp = await client.get(ability_url)
-                record_pokeapi_request("ability", ability_resp.status_code)
-                ability_resp.raise_for_status()
-                ability_data = ability_resp.json()
-                effect_entries = ability_data.get("effect_entries", [])
-                effect = next(
-                    (
-                        e["effect"]
-                        for e in effect_entries
-                        if e["language"]["name"] == "en"
-                    ),
-                    None,
-                )
-                abilities.append({"name": ability_name, "effect": effect})
-
-            # Moves (with effect text, only first 10 for brevity)
-            moves = []
-            for move_entry in pokemon_data["moves"][:10]:
-                move_name = move_entry["move"]["name"]
-                move_url = move_entry["move"]["url"]
-                move_resp = await client.get(move_url)
-                record_pokeapi_request("move", move_resp.status_code)
-                move_resp.raise_for_status()
-                move_data = move_resp.json()
-                effect_entries = move_data.get("effect_entries", [])
-                effect = next(
-                    (
-                        e["effect"]
-                        for e in effect_entries
-                        if e["language"]["name"] == "en"
-                    ),
-                    None,
-                )
-                moves.append({"name": move_name, "effect": effect})
-
-            # Evolution information
-            species_url = pokemon_data["species"]["url"]
-            species_resp = await client.get(species_url)
-            record_pokeapi_request("species", species_resp.status_code)
-            species_resp.raise_for_status()
-            species_data = species_resp.json()
-            evolution_chain_url = species_data["evolution_chain"]["url"]
-            evolution_resp = await client.get(evolution_chain_url)
-            record_pokeapi_request("evolution-chain", evolution_resp.status_code)
-            evolution_resp.raise_for_status()
-            evolution_data = evolution_resp.json()
-
-            evolution_chain = parse_evolution_chain(evolution_data["chain"])
+        selected = _select_fields(fields)
+    except ValueError as e:
+        record_tool_call("get_pokemon_info", time.time() - start_time, "error")
+        return {"error": str(e)}
 
-            duration = time.time() - start_time
-            record_tool_call("get_pokemon_info", duration, "success")
-            logger.info(
-                "tool_completed",
-                tool="get_pokemon_info",
-                pokemon=pokemon_name,
-                duration=duration,
+    try:
+        client = get_http_client()
+        if _graphql_upstream():
+            info = await _graphql_pokemon_info(
+                client, pokemon_name, selected, moves_offset, moves_limit
+            )
+        else:
+            info = await _rest_pokemon_info(
+                client, pokemon_name, selected, moves_offset, moves_limit
             )
 
-            return {
-                "name": pokemon_data["name"],
-                "id": pokemon_data["id"],
-                "base_stats": base_stats,
-                "types": types,
-                "abilities": abilities,
-                "moves": moves,
-                "evolution_chain": evolution_chain,
-            }
+        duration = time.time() - start_time
+        record_tool_call("get_pokemon_info", duration, "success")
+        logger.info(
+            "tool_completed",
+            tool="get_pokemon_info",
+            pokemon=pokemon_name,
+            duration=duration,
+        )
+        return info
     except httpx.HTTPStatusError as e:
         duration = time.time() - start_time
         record_tool_call("get_pokemon_info", duration, "error")
@@ -155,105 +406,151 @@ async def get_pokemon_info(pokemon_name: str) -> Dict[str, Any]:
 
 
 @mcp.tool()
-async def simulate_battle(pokemon1: str, pokemon2: str) -> Dict[str, Any]:
+@traced("tool.get_pokemon_info_batch")
+async def get_pokemon_info_batch(
+    pokemon_names: List[str],
+    fields: Optional[List[str]] = None,
+    moves_limit: int = 10,
+    moves_offset: int = 0,
+) -> Dict[str, Any]:
+    """
+    Get comprehensive information about several Pokémon at once, e.g. a team.
+
+    Moves, abilities, species and evolution chains shared by the Pokémon are
+    fetched once for the whole batch. A Pokémon that cannot be fetched gets an
+    error entry instead of failing the batch.
+
+    Args:
+        pokemon_names: The names of the Pokémon to get information about.
+        fields: Sections to return for each Pokémon, as for get_pokemon_info.
+        moves_limit: Number of moves to return for each Pokémon.
+        moves_offset: Position of the first move returned in each move list.
+
+    Returns:
+        One entry per distinct name, in request order: the same information as
+        get_pokemon_info, or the name with an error. Also counts the entries
+        that succeeded and failed.
+    """
+    start_time = time.time()
+    logger.info("tool_called", tool="get_pokemon_info_batch", batch_size=len(pokemon_names))
+
+    try:
+        selected = _select_fields(fields)
+    except ValueError as e:
+        record_tool_call("get_pokemon_info_batch", time.time() - start_time, "error")
+        return {"error": str(e)}
+    names = list(dict.fromkeys(name.lower() for name in pokemon_names))
+    if not names:
+        record_tool_call("get_pokemon_info_batch", time.time() - start_time, "error")
+        return {"error": "No Pokémon names given."}
+    if len(names) > settings.pokemon_info_batch_max:
+        record_tool_call("get_pokemon_info_batch", time.time() - start_time, "error")
+        return {
+            "error": f"Batch has {len(names)} Pokémon; "
+            f"the maximum is {settings.pokemon_info_batch_max}."
+        }
+
+    try:
+        client = get_http_client()
+        if _graphql_upstream():
+            entries = await _graphql_pokemon_info_batch(
+                client, names, selected, moves_offset, moves_limit
+            )
+        else:
+            entries = await _rest_pokemon_info_batch(
+                client, names, selected, moves_offset, moves_limit
+            )
+
+        failed = sum(1 for entry in entries if "error" in entry)
+        duration = time.time() - start_time
+        record_tool_call(
+            "get_pokemon_info_batch", duration, "error" if failed == len(entries) else "success"
+        )
+        logger.info(
+            "tool_completed",
+            tool="get_pokemon_info_batch",
+            batch_size=len(names),
+            failed=failed,
+            duration=duration,
+        )
+        return {"pokemon": entries, "succeeded": len(entries) - failed, "failed": failed}
+    except Exception as e:
+        duration = time.time() - start_time
+        record_tool_call("get_pokemon_info_batch", duration, "error")
+        logger.error("unexpected_error", tool="get_pokemon_info_batch", error=str(e))
+        return {"error": f"Unexpected error: {e}"}
+
+
+@mcp.tool()
+@traced("tool.simulate_battle")
+async def simulate_battle(
+    pokemon1: str,
+    pokemon2: str,
+    mode: str = "single",
+    simulations: int = 1000,
+    seed: Optional[int] = None,
+    detail: str = "full",
+) -> Dict[str, Any]:
     """
     Simulate a Pokémon battle between two Pokémon using core mechanics.
 
     Args:
         pokemon1: Name of the first Pokémon.
         pokemon2: Name of the second Pokémon.
+        mode: "single" for one battle, or "monte_carlo" to run many battles
+            and report win probabilities.
+        simulations: Number of battles to run in "monte_carlo" mode.
+        seed: Random seed for reproducible results.
+        detail: How much of a "single" battle to return: "none" for the
+            winner and turn count, "summary" to add HP, damage and status
+            totals keyed "pokemon1" and "pokemon2", or "full" to add the
+            turn-by-turn battle log as well.
 
     Returns:
-        Battle log and winner.
+        Winner with the requested detail, or win probabilities with a
+        confidence interval, turn-count distribution and status rates in
+        "monte_carlo" mode.
     """
     start_time = time.time()
-    logger.info("tool_called", tool="simulate_battle", pokemon1=pokemon1, pokemon2=pokemon2)
+    logger.info(
+        "tool_called",
+        tool="simulate_battle",
+        pokemon1=pokemon1,
+        pokemon2=pokemon2,
+        mode=mode,
+        detail=detail,
+    )
+
+    if mode not in ("single", "monte_carlo"):
+        record_tool_call("simulate_battle", time.time() - start_time, "error")
+        return {"error": f"Unknown mode '{mode}'. Use 'single' or 'monte_carlo'."}
+    if detail not in BATTLE_DETAIL_LEVELS:
+        record_tool_call("simulate_battle", time.time() - start_time, "error")
+        return {"error": f"Unknown detail '{detail}'. Use 'none', 'summary' or 'full'."}
 
     try:
-        async with httpx.AsyncClient(timeout=settings.pokeapi_timeout) as client:
-            poke1 = await fetch_pokemon_full_data(client, pokemon1)
-            if not poke1:
-                duration = time.time() - start_time
-                record_tool_call("simulate_battle", duration, "error")
-                return {"error": f"Could not fetch data for {pokemon1}."}
-
-            poke2 = await fetch_pokemon_full_data(client, pokemon2)
-            if not poke2:
-                duration = time.time() - start_time
-                record_tool_call("simulate_battle", duration, "error")
-                return {"error": f"Could not fetch data for {pokemon2}."}
-
-            hp1 = poke1["base_stats"].get("hp", 100)
-            hp2 = poke2["base_stats"].get("hp", 100)
-            status1 = None
-            status2 = None
-            log = []
-            turn = 1
-
-            # Determine turn order by speed
-            speed1 = poke1["base_stats"].get("speed", 50)
-            speed2 = poke2["base_stats"].get("speed", 50)
-            first, second = (poke1, poke2) if speed1 >= speed2 else (poke2, poke1)
-            first_hp, second_hp = (hp1, hp2) if speed1 >= speed2 else (hp2, hp1)
-            first_status, second_status = (
-                (status1, status2) if speed1 >= speed2 else (status2, status1)
-            )
-            first_name, second_name = first["name"], second["name"]
-
-            while first_hp > 0 and second_hp > 0:
-                log.append(f"Turn {turn}:")
-
-                # First attacks
-                if first_status == STATUS_PARALYSIS and random.random() < 0.25:
-                    log.append(f"{first_name} is paralyzed and can't move!")
-                else:
-                    damage = calculate_damage(first, second, first_status)
-                    second_hp -= damage
-                    log.append(
-                        f"{first_name} uses {first['move']['name']} and deals {damage} damage! "
-                        f"({second_name} HP: {max(0, second_hp)})"
-                    )
-                    # Try to inflict status
-                    new_status = try_inflict_status(first["move"])
-                    if not second_status and new_status:
-                        second_status = new_status
-                        log.append(f"{second_name} is now {new_status}!")
-
-                # Apply status effects to second
-                second_hp, status_log = apply_status_effects(second_status, second_hp)
-                if status_log:
-                    log.append(f"{second_name}: {status_log} (HP: {max(0, second_hp)})")
-                if second_hp <= 0:
-                    log.append(f"{second_name} fainted!")
-                    break
-
-                # Second attacks
-                if second_status == STATUS_PARALYSIS and random.random() < 0.25:
-                    log.append(f"{second_name} is paralyzed and can't move!")
-                else:
-                    damage = calculate_damage(second, first, second_status)
-                    first_hp -= damage
-                    log.append(
-                        f"{second_name} uses {second['move']['name']} and deals {damage} damage! "
-                        f"({first_name} HP: {max(0, first_hp)})"
-                    )
-                    new_status = try_inflict_status(second["move"])
-                    if not first_status and new_status:
-                        first_status = new_status
-                        log.append(f"{first_name} is now {new_status}!")
-
-                # Apply status effects to first
-                first_hp, status_log = apply_status_effects(first_status, first_hp)
-                if status_log:
-                    log.append(f"{first_name}: {status_log} (HP: {max(0, first_hp)})")
-                if first_hp <= 0:
-                    log.append(f"{first_name} fainted!")
-                    break
-                turn += 1
-
-            winner = first_name if first_hp > 0 else second_name
-            log.append(f"Winner: {winner}!")
-
+        client = get_http_client()
+        poke1, poke2 = await gather_limited(
+            settings.pokeapi_max_concurrency,
+            fetch_pokemon_full_data(client, pokemon1),
+            fetch_pokemon_full_data(client, pokemon2),
+        )
+        if not poke1:
+            duration = time.time() - start_time
+            record_tool_call("simulate_battle", duration, "error")
+            return {"error": f"Could not fetch data for {pokemon1}."}
+        if not poke2:
+            duration = time.time() - start_time
+            record_tool_call("simulate_battle", duration, "error")
+            return {"error": f"Could not fetch data for {pokemon2}."}
+
+        if mode == "monte_carlo":
+            simulations = max(1, min(simulations, settings.battle_max_simulations))
+            # CPU-bound; run it off the event loop so other requests keep flowing
+            with span("battle.monte_carlo", simulations=simulations):
+                result = await asyncio.to_thread(
+                    run_monte_carlo, poke1, poke2, simulations, seed
+                )
             duration = time.time() - start_time
             record_tool_call("simulate_battle", duration, "success")
             logger.info(
@@ -261,17 +558,48 @@ async def simulate_battle(pokemon1: str, pokemon2: str) -> Dict[str, Any]:
                 tool="simulate_battle",
                 pokemon1=pokemon1,
                 pokemon2=pokemon2,
-                winner=winner,
+                mode=mode,
+                simulations=simulations,
                 duration=duration,
             )
+            return result
+
+        with span("battle.run", detail=detail):
+            battle = run_battle(
+                poke1,
+                poke2,
+                record_events=detail == "full",
+                rng=random.Random(seed) if seed is not None else None,
+            )
+        winner = battle["winner"]
 
-            return {
-                "pokemon1": poke1["name"],
-                "pokemon2": poke2["name"],
-                "initial_hp": {poke1["name"]: hp1, poke2["name"]: hp2},
-                "battle_log": log,
-                "winner": winner,
-            }
+        duration = time.time() - start_time
+        record_tool_call("simulate_battle", duration, "success")
+        logger.info(
+            "tool_completed",
+            tool="simulate_battle",
+            pokemon1=pokemon1,
+            pokemon2=pokemon2,
+            winner=winner,
+            turns=battle["turns"],
+            detail=detail,
+            duration=duration,
+        )
+
+        result = {
+            "pokemon1": poke1["name"],
+            "pokemon2": poke2["name"],
+            "winner": winner,
+            "turns": battle["turns"],
+        }
+        if detail != "none":
+            # Keyed by position, not name: both sides may be the same Pokémon
+            for key in ("initial_hp", "final_hp", "damage_dealt", "status"):
+                result[key] = battle[key]
+        if detail == "full":
+            with span("battle.render", events=len(battle["events"])):
+                result["battle_log"] = render_events(battle["events"], winner)
+        return result
     except Exception as e:
         duration = time.time() - start_time
         record_tool_call("simulate_battle", duration, "error")
@@ -279,7 +607,134 @@ async def simulate_battle(pokemon1: str, pokemon2: str) -> Dict[str, Any]:
         return {"error": f"Battle simulation error: {e}"}
 
 
+@mcp.tool()
+@traced("tool.simulate_tournament")
+async def simulate_tournament(
+    roster: Optional[List[str]] = None,
+    generation: Optional[int] = None,
+    battles_per_matchup: int = 100,
+    seed: Optional[int] = None,
+    ctx: Optional[Context] = None,
+) -> Dict[str, Any]:
+    """
+    Run a round-robin tournament and rank Pokémon by win rate.
+
+    Every pair of roster members fights many Monte Carlo battles. Matchups are
+    sharded across worker processes and partial standings are streamed as
+    progress notifications while shards finish.
+
+    Args:
+        roster: Names of the Pokémon to enter.
+        generation: Enter every Pokémon species of this generation instead.
+        battles_per_matchup: Battles fought by each pair.
+        seed: Random seed for reproducible results.
+
+    Returns:
+        Leaderboard ranked by win rate, plus any roster members that could
+        not be fetched.
+    """
+    start_time = time.time()
+    logger.info(
+        "tool_called",
+        tool="simulate_tournament",
+        roster_size=len(roster or []),
+        generation=generation,
+    )
+
+    try:
+        client = get_http_client()
+        names = list(roster or [])
+        labels: Dict[str, str] = {}
+        if generation is not None:
+            generation_url = f"{settings.pokeapi_base_url}/generation/{generation}"
+            generation_data = await fetch_json(client, generation_url, "generation")
+            # A species' name is not always a /pokemon name (deoxys, giratina,
+            # shaymin, wormadam), but its id is the id of its default variety
+            labels.update(
+                (str(species_id(species["url"]) or species["name"]), species["name"])
+                for species in generation_data["pokemon_species"]
+            )
+            names.extend(labels)
+        names = list(dict.fromkeys(name.lower() for name in names))
+        if len(names) < 2:
+            record_tool_call("simulate_tournament", time.time() - start_time, "error")
+            return {"error": "A tournament needs at least two Pokémon."}
+        if len(names) > settings.tournament_max_roster:
+            record_tool_call("simulate_tournament", time.time() - start_time, "error")
+            return {
+                "error": f"Roster has {len(names)} Pokémon; "
+                f"the maximum is {settings.tournament_max_roster}."
+            }
+
+        # Fetch each member once; workers only receive the compact battle data
+        fetched = await gather_limited(
+            settings.pokeapi_max_concurrency,
+            *(fetch_pokemon_full_data(client, name) for name in names),
+        )
+        # A name and an id (or a roster entry and a generation entry) can name
+        # the same Pokémon; it enters once
+        by_id: Dict[int, Dict[str, Any]] = {}
+        for poke in fetched:
+            if poke:
+                by_id.setdefault(poke["id"], poke)
+        entrants = list(by_id.values())
+        missing = [labels.get(name, name) for name, poke in zip(names, fetched) if not poke]
+        if len(entrants) < 2:
+            record_tool_call("simulate_tournament", time.time() - start_time, "error")
+            if not missing:
+                return {"error": "A tournament needs at least two Pokémon."}
+            return {"error": "Could not fetch enough Pokémon.", "missing": missing}
+
+        battles = max(1, min(battles_per_matchup, settings.battle_max_simulations))
+
+        async def report(done: int, total: int, standings: List[Dict[str, Any]]) -> None:
+            if ctx is None:
+                return
+            leaders = ", ".join(
+                f"{row['rank']}. {row['name']} ({row['win_rate']:.1%})" for row in standings[:5]
+            )
+            await ctx.report_progress(done, total, message=f"Standings: {leaders}")
+
+        with span("tournament.run", entrants=len(entrants), battles_per_matchup=battles):
+            result = await run_tournament(entrants, battles, seed, on_progress=report)
+        result["missing"] = missing
+        result["seed"] = seed
+
+        duration = time.time() - start_time
+        record_tool_call("simulate_tournament", duration, "success")
+        logger.info(
+            "tool_completed",
+            tool="simulate_tournament",
+            roster_size=len(entrants),
+            matchups=result["matchups"],
+            duration=duration,
+        )
+        return result
+    except Exception as e:
+        duration = time.time() - start_time
+        record_tool_call("simulate_tournament", duration, "error")
+        logger.error("tournament_error", error=str(e))
+        return {"error": f"Tournament error: {e}"}
+
+
+async def run_stdio() -> None:
+    """Run the stdio transport, releasing shared resources on exit."""
+    get_cache()
+    if settings.pokeapi_mode != "live":
+        get_snapshot()
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await close_http_client()
+        close_cache()
+        close_snapshot()
+        close_process_pool()
+        close_tracing()
+        logger.info("server_stopped", transport="stdio")
+        close_logging()
+
+
 if __name__ == "__main__":
     # For local development with stdio transport
     logger.info("starting_server", transport="stdio")
-    mcp.run(transport="stdio")
+    anyio.run(run_stdio)
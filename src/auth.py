@@ -7,18 +7,14 @@ from src.logger import get_logger
 
 logger = get_logger(__name__)
 security = HTTPBearer()
+optional_security = HTTPBearer(auto_error=False)
 
 
-async def verify_api_key(
-    credentials: HTTPAuthorizationCredentials = Security(security),
-) -> str:
-    """Verify API key from Authorization header.
+def check_api_key(api_key: str) -> None:
+    """Check a presented API key against the configured one.
 
     Args:
-        credentials: HTTP authorization credentials.
-
-    Returns:
-        The API key if valid.
+        api_key: The bearer token from the Authorization header.
 
     Raises:
         HTTPException: If authentication fails.
@@ -30,8 +26,8 @@ async def verify_api_key(
             detail="API key not configured",
         )
 
-    if credentials.credentials != settings.api_key:
-        logger.warning("invalid_api_key_attempt", provided_key=credentials.credentials[:10])
+    if api_key != settings.api_key:
+        logger.warning("invalid_api_key_attempt", provided_key=api_key[:10])
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid API key",
@@ -39,11 +35,28 @@ async def verify_api_key(
         )
 
     logger.info("api_key_verified")
+
+
+async def verify_api_key(
+    credentials: HTTPAuthorizationCredentials = Security(security),
+) -> str:
+    """Verify API key from Authorization header.
+
+    Args:
+        credentials: HTTP authorization credentials.
+
+    Returns:
+        The API key if valid.
+
+    Raises:
+        HTTPException: If authentication fails.
+    """
+    check_api_key(credentials.credentials)
     return credentials.credentials
 
 
 def get_optional_api_key(
-    credentials: Optional[HTTPAuthorizationCredentials] = Security(security, auto_error=False),
+    credentials: Optional[HTTPAuthorizationCredentials] = Security(optional_security),
 ) -> Optional[str]:
     """Get API key without enforcing it (for optional auth).
 
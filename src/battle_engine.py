@@ -0,0 +1,212 @@
+"""Turn-based battle engine emitting structured events.
+
+``run_battle`` plays one battle with the same rules as the original
+``simulate_battle`` loop, but records compact ``BattleEvent`` tuples instead
+of formatting text every turn. Callers that only need the outcome can skip
+event recording entirely; ``render_events`` turns events into the familiar
+human-readable battle log on demand.
+"""
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+import random
+from src.battle_utils import calculate_damage, get_move_status
+from src.constants import (
+    PARALYSIS_SKIP_CHANCE,
+    STATUS_BURN,
+    STATUS_DAMAGE_DIVISORS,
+    STATUS_INFLICT_CHANCE,
+    STATUS_PARALYSIS,
+)
+
+# Detail levels accepted by simulate_battle, from cheapest to most verbose
+BATTLE_DETAIL_LEVELS = ("none", "summary", "full")
+
+EVENT_ATTACK = "attack"
+EVENT_PARALYZED = "paralyzed"
+EVENT_STATUS = "status"
+EVENT_STATUS_DAMAGE = "status_damage"
+EVENT_FAINT = "faint"
+
+
+class BattleEvent(NamedTuple):
+    """One thing that happened during a battle.
+
+    ``actor`` is the Pokémon the event is about: the attacker for attacks and
+    paralysis, the afflicted Pokémon for status events, and the fainted one
+    for faints. ``hp`` is the HP of ``target`` (attacks) or ``actor``
+    (status damage) after the event, clamped at zero.
+    """
+
+    turn: int
+    kind: str
+    actor: str
+    target: Optional[str] = None
+    move: Optional[str] = None
+    damage: int = 0
+    hp: int = 0
+    status: Optional[str] = None
+
+
+class _Side:
+    """Mutable per-combatant battle state."""
+
+    __slots__ = ("name", "move", "hp", "status", "inflicts", "damage", "dealt")
+
+    def __init__(self, poke: Dict[str, Any], opponent: Dict[str, Any]) -> None:
+        self.name = poke["name"]
+        self.move = poke["move"]["name"]
+        self.hp = poke["base_stats"].get("hp", 100)
+        self.status: Optional[str] = None
+        self.inflicts = get_move_status(poke["move"])
+        # Damage only depends on whether the attacker is burned
+        self.damage = (
+            calculate_damage(poke, opponent, None),
+            calculate_damage(poke, opponent, STATUS_BURN),
+        )
+        self.dealt = 0
+
+
+def _take_turn(
+    attacker: _Side,
+    defender: _Side,
+    turn: int,
+    roll: Callable[[], float],
+    events: Optional[List[BattleEvent]],
+) -> bool:
+    """Resolve one attack plus the defender's status damage.
+
+    Returns:
+        True if the defender fainted.
+    """
+    if attacker.status == STATUS_PARALYSIS and roll() < PARALYSIS_SKIP_CHANCE:
+        if events is not None:
+            events.append(BattleEvent(turn, EVENT_PARALYZED, attacker.name))
+    else:
+        damage = attacker.damage[attacker.status == STATUS_BURN]
+        defender.hp -= damage
+        attacker.dealt += damage
+        if events is not None:
+            events.append(
+                BattleEvent(
+                    turn,
+                    EVENT_ATTACK,
+                    attacker.name,
+                    defender.name,
+                    attacker.move,
+                    damage,
+                    max(0, defender.hp),
+                )
+            )
+        # Roll even if the defender already has a status, like try_inflict_status
+        if attacker.inflicts is not None and roll() < STATUS_INFLICT_CHANCE:
+            if not defender.status:
+                defender.status = attacker.inflicts
+                if events is not None:
+                    events.append(
+                        BattleEvent(turn, EVENT_STATUS, defender.name, status=defender.status)
+                    )
+
+    divisor = STATUS_DAMAGE_DIVISORS.get(defender.status)
+    if divisor:
+        tick = max(1, defender.hp // divisor)
+        defender.hp -= tick
+        if events is not None:
+            events.append(
+                BattleEvent(
+                    turn,
+                    EVENT_STATUS_DAMAGE,
+                    defender.name,
+                    damage=tick,
+                    hp=max(0, defender.hp),
+                    status=defender.status,
+                )
+            )
+    if defender.hp <= 0:
+        if events is not None:
+            events.append(BattleEvent(turn, EVENT_FAINT, defender.name))
+        return True
+    return False
+
+
+def run_battle(
+    poke1: Dict[str, Any],
+    poke2: Dict[str, Any],
+    record_events: bool = True,
+    rng: Optional[random.Random] = None,
+) -> Dict[str, Any]:
+    """Play one battle between two Pokémon.
+
+    Args:
+        poke1: First Pokémon, as returned by ``fetch_pokemon_full_data``.
+        poke2: Second Pokémon, as returned by ``fetch_pokemon_full_data``.
+        record_events: Whether to record the event stream.
+        rng: Random generator; defaults to the ``random`` module.
+
+    Returns:
+        Winner, turn count, per-Pokémon HP, damage and status keyed by
+        position (``pokemon1``/``pokemon2``), and the events (or None).
+    """
+    roll = (rng or random).random
+    speed1 = poke1["base_stats"].get("speed", 50)
+    speed2 = poke2["base_stats"].get("speed", 50)
+    side1 = _Side(poke1, poke2)
+    side2 = _Side(poke2, poke1)
+    first, second = (side1, side2) if speed1 >= speed2 else (side2, side1)
+    initial_hp = {"pokemon1": side1.hp, "pokemon2": side2.hp}
+    events: Optional[List[BattleEvent]] = [] if record_events else None
+
+    turn = 1
+    while True:
+        if _take_turn(first, second, turn, roll, events):
+            break
+        if _take_turn(second, first, turn, roll, events):
+            break
+        turn += 1
+
+    winner = first if first.hp > 0 else second
+    return {
+        "winner": winner.name,
+        "winner_position": "pokemon1" if winner is side1 else "pokemon2",
+        "turns": turn,
+        "initial_hp": initial_hp,
+        "final_hp": {"pokemon1": max(0, side1.hp), "pokemon2": max(0, side2.hp)},
+        "damage_dealt": {"pokemon1": side1.dealt, "pokemon2": side2.dealt},
+        "status": {"pokemon1": side1.status, "pokemon2": side2.status},
+        "events": events,
+    }
+
+
+def render_events(events: List[BattleEvent], winner: str) -> List[str]:
+    """Render battle events as a human-readable battle log.
+
+    Args:
+        events: Events recorded by ``run_battle``.
+        winner: Name of the winner.
+
+    Returns:
+        One log line per event, with turn headers and the winner line.
+    """
+    log = []
+    turn = 0
+    for event in events:
+        if event.turn != turn:
+            turn = event.turn
+            log.append(f"Turn {turn}:")
+        kind = event.kind
+        if kind == EVENT_ATTACK:
+            log.append(
+                f"{event.actor} uses {event.move} and deals {event.damage} damage! "
+                f"({event.target} HP: {event.hp})"
+            )
+        elif kind == EVENT_PARALYZED:
+            log.append(f"{event.actor} is paralyzed and can't move!")
+        elif kind == EVENT_STATUS:
+            log.append(f"{event.actor} is now {event.status}!")
+        elif kind == EVENT_STATUS_DAMAGE:
+            log.append(
+                f"{event.actor}: {event.status.capitalize()} deals {event.damage} damage.  "
+                f"(HP: {event.hp})"
+            )
+        elif kind == EVENT_FAINT:
+            log.append(f"{event.actor} fainted!")
+    log.append(f"Winner: {winner}!")
+    return log
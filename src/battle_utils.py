@@ -6,27 +6,10 @@ from src.constants import (
     STATUS_PARALYSIS,
     STATUS_BURN,
     STATUS_POISON,
+    STATUS_INFLICT_CHANCE,
+    STATUS_DAMAGE_DIVISORS,
 )
-
-
-def parse_evolution_chain(chain: Any) -> List[str]:
-    """Parse the evolution chain of a Pokémon.
-
-    Args:
-        chain: The evolution chain to parse.
-
-    Returns:
-        A list of Pokémon names in the evolution chain.
-    """
-    evo_chain = []
-    current = chain
-    while current:
-        evo_chain.append(current["species"]["name"])
-        if current["evolves_to"]:
-            current = current["evolves_to"][0]
-        else:
-            current = None
-    return evo_chain
+from src.type_chart import DUAL_TYPE_TABLE, NO_TYPE, TYPE_IDS, TYPE_SLOTS
 
 
 def get_type_multiplier(attack_type: str, defender_types: List[str]) -> float:
@@ -39,6 +22,15 @@ def get_type_multiplier(attack_type: str, defender_types: List[str]) -> float:
     Returns:
         The type multiplier.
     """
+    count = len(defender_types)
+    if count <= 2:
+        # Precompiled dual-type table; see src.type_chart
+        ids = TYPE_IDS
+        type1 = ids.get(defender_types[0], NO_TYPE) if count else NO_TYPE
+        type2 = ids.get(defender_types[1], NO_TYPE) if count == 2 else NO_TYPE
+        attack = ids.get(attack_type, NO_TYPE)
+        return DUAL_TYPE_TABLE[(attack * TYPE_SLOTS + type1) * TYPE_SLOTS + type2]
+
     multiplier = 1.0
     for d_type in defender_types:
         multiplier *= TYPE_EFFECTIVENESS.get(attack_type, {}).get(d_type, 1.0)
@@ -86,30 +78,45 @@ def apply_status_effects(status: Optional[str], hp: int) -> Tuple[int, str]:
     """
     log = ""
     if status == STATUS_BURN:
-        burn_damage = max(1, hp // 16)
+        burn_damage = max(1, hp // STATUS_DAMAGE_DIVISORS[STATUS_BURN])
         hp -= burn_damage
         log = f"Burn deals {burn_damage} damage. "
     elif status == STATUS_POISON:
-        poison_damage = max(1, hp // 8)
+        poison_damage = max(1, hp // STATUS_DAMAGE_DIVISORS[STATUS_POISON])
         hp -= poison_damage
         log = f"Poison deals {poison_damage} damage. "
     return hp, log
 
 
-def try_inflict_status(move: Dict[str, Any]) -> Optional[str]:
-    """Try to inflict a status effect on a Pokémon.
+def get_move_status(move: Dict[str, Any]) -> Optional[str]:
+    """Get the status effect a move can inflict, based on its effect text.
 
     Args:
-        move: The move to try to inflict a status effect with.
+        move: The move to inspect.
 
     Returns:
-        The status effect inflicted, or None.
+        The status effect the move can inflict, or None.
     """
     effect = (move.get("effect") or "").lower()
     if "paralyze" in effect:
-        return STATUS_PARALYSIS if random.random() < 0.2 else None
+        return STATUS_PARALYSIS
     if "burn" in effect:
-        return STATUS_BURN if random.random() < 0.2 else None
+        return STATUS_BURN
     if "poison" in effect:
-        return STATUS_POISON if random.random() < 0.2 else None
+        return STATUS_POISON
     return None
+
+
+def try_inflict_status(move: Dict[str, Any]) -> Optional[str]:
+    """Try to inflict a status effect on a Pokémon.
+
+    Args:
+        move: The move to try to inflict a status effect with.
+
+    Returns:
+        The status effect inflicted, or None.
+    """
+    status = get_move_status(move)
+    if status is None:
+        return None
+    return status if random.random() < STATUS_INFLICT_CHANCE else None
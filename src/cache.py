@@ -0,0 +1,455 @@
+"""Response cache for PokeAPI resources."""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+import asyncio
+import sqlite3
+import sys
+import time
+from src.config import settings
+from src.logger import get_logger
+from src.monitoring import record_cache_eviction, record_cache_size
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class ResponseCache(ABC):
+    """Interface for caches of raw upstream response bodies keyed by URL."""
+
+    backend = "abstract"
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body for ``key``, or None if missing or expired."""
+
+    @abstractmethod
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store ``value`` under ``key`` for ``ttl`` seconds."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Drop every entry."""
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        """``get`` for the event loop; backends that may block override it."""
+        return self.get(key)
+
+    def close(self) -> None:
+        """Release any resources held by the cache."""
+
+
+class MemoryCache(ResponseCache):
+    """In-process cache with per-entry TTL and LRU eviction under a byte budget.
+
+    Entry size is the ``sys.getsizeof`` of the key and body, so the budget
+    tracks the memory actually held rather than the number of entries.
+    """
+
+    backend = "memory"
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.size_bytes = 0
+        self._entries: "OrderedDict[str, Tuple[float, bytes, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the cached body and mark it most recently used."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value, _ = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            record_cache_eviction(self.backend, "expired")
+            self._report_size()
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a body, evicting least recently used entries to fit the budget."""
+        size = sys.getsizeof(key) + sys.getsizeof(value)
+        if key in self._entries:
+            self._remove(key)
+        if ttl <= 0 or size > self.max_bytes:
+            self._report_size()
+            return
+        while self.size_bytes + size > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            record_cache_eviction(self.backend, "lru")
+        self._entries[key] = (time.monotonic() + ttl, value, size)
+        self.size_bytes += size
+        self._report_size()
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._entries.clear()
+        self.size_bytes = 0
+        self._report_size()
+
+    def _remove(self, key: str) -> None:
+        _, _, size = self._entries.pop(key)
+        self.size_bytes -= size
+
+    def _report_size(self) -> None:
+        record_cache_size(self.backend, self.size_bytes, len(self._entries))
+
+
+class SQLiteCache(ResponseCache):
+    """Persistent cache stored in a SQLite database.
+
+    The database runs in WAL mode so several worker processes can read while
+    one writes, and every write is a single atomic transaction, so a crash
+    never leaves a partially written entry behind. Expiry uses wall-clock
+    time because entries outlive the process that stored them.
+
+    Every database call runs on one dedicated thread, so lock waits and disk
+    I/O never block the event loop: ``aget_with_expiry`` awaits that thread
+    and ``set_later`` queues a write behind it. The total size of the stored
+    bodies is kept by triggers in a one-row table, shared by every process,
+    so checking the budget never scans the table.
+    """
+
+    backend = "sqlite"
+    # Re-check the on-disk budget after this many writes
+    prune_interval = 64
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._writes = 0
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="sqlite-cache")
+        try:
+            self._conn = self._run(self._open)
+            self._run(self._report_size)
+        except BaseException:
+            self._executor.shutdown(wait=False)
+            raise
+
+    def _run(self, fn: Callable[..., T], *args: Any) -> T:
+        """Run ``fn`` on the database thread and wait for its result."""
+        return self._executor.submit(fn, *args).result()
+
+    def _open(self) -> sqlite3.Connection:
+        Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        # One transaction, so concurrent workers create the size table and its
+        # triggers together and seed it exactly once
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                " key TEXT PRIMARY KEY,"
+                " value BLOB NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " stored_at REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)"
+            )
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS responses_expires_at ON responses (expires_at)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses_size ("
+                " id INTEGER PRIMARY KEY CHECK (id = 0),"
+                " bytes INTEGER NOT NULL,"
+                " entries INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO responses_size (id, bytes, entries)"
+                " SELECT 0, COALESCE(SUM(length(value)), 0), COUNT(*) FROM responses"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_size_insert AFTER INSERT ON responses"
+                " BEGIN UPDATE responses_size"
+                " SET bytes = bytes + length(NEW.value), entries = entries + 1; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_size_update"
+                " AFTER UPDATE OF value ON responses"
+                " BEGIN UPDATE responses_size"
+                " SET bytes = bytes + length(NEW.value) - length(OLD.value); END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS responses_size_delete AFTER DELETE ON responses"
+                " BEGIN UPDATE responses_size"
+                " SET bytes = bytes - length(OLD.value), entries = entries - 1; END"
+            )
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the stored body, or None if missing or expired."""
+        entry = self.get_with_expiry(key)
+        return entry[1] if entry else None
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        """Return the stored body, waiting for the database off the event loop."""
+        entry = await self.aget_with_expiry(key)
+        return entry[1] if entry else None
+
+    def get_with_expiry(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """Return the stored body with its wall-clock expiry time."""
+        return self._run(self._get_with_expiry, key)
+
+    async def aget_with_expiry(self, key: str) -> Optional[Tuple[float, bytes]]:
+        """``get_with_expiry`` without blocking the event loop."""
+        return await asyncio.wrap_future(self._executor.submit(self._get_with_expiry, key))
+
+    def _get_with_expiry(self, key: str) -> Optional[Tuple[float, bytes]]:
+        try:
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[0] <= time.time():
+                self._conn.execute(
+                    "DELETE FROM responses WHERE key = ? AND expires_at <= ?",
+                    (key, time.time()),
+                )
+                record_cache_eviction(self.backend, "expired")
+                return None
+            return row[0], bytes(row[1])
+        except sqlite3.Error as e:
+            logger.warning("cache_read_failed", backend=self.backend, error=str(e))
+            return None
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a body atomically, pruning the oldest entries over budget."""
+        self._run(self._set, key, value, ttl)
+
+    def set_later(self, key: str, value: bytes, ttl: float) -> None:
+        """Queue a ``set`` on the database thread without waiting for it."""
+        self._executor.submit(self._set, key, value, ttl)
+
+    def _set(self, key: str, value: bytes, ttl: float) -> None:
+        if ttl <= 0:
+            return
+        now = time.time()
+        try:
+            self._conn.execute(
+                "INSERT INTO responses (key, value, expires_at, stored_at)"
+                " VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (key) DO UPDATE SET value = excluded.value,"
+                " expires_at = excluded.expires_at, stored_at = excluded.stored_at",
+                (key, value, now + ttl, now),
+            )
+            self._writes += 1
+            if self._writes % self.prune_interval == 0:
+                self._prune()
+        except sqlite3.Error as e:
+            logger.warning("cache_write_failed", backend=self.backend, error=str(e))
+
+    def recent(self, limit_bytes: int) -> List[Tuple[str, float, bytes]]:
+        """Return unexpired ``(key, expires_at, value)`` rows, newest first.
+
+        Args:
+            limit_bytes: Stop before the bodies returned exceed this many bytes.
+        """
+        return self._run(self._recent, limit_bytes)
+
+    def _recent(self, limit_bytes: int) -> List[Tuple[str, float, bytes]]:
+        total = 0
+        recent = []
+        rows = self._conn.execute(
+            "SELECT key, expires_at, value FROM responses WHERE expires_at > ?"
+            " ORDER BY stored_at DESC",
+            (time.time(),),
+        )
+        for key, expires_at, value in rows:
+            total += len(value)
+            if total > limit_bytes:
+                break
+            recent.append((key, expires_at, bytes(value)))
+        return recent
+
+    def prune(self) -> None:
+        """Delete expired entries, then the oldest ones until within budget."""
+        self._run(self._prune)
+
+    def _prune(self) -> None:
+        with self._conn:
+            self._conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            expired = self._conn.execute(
+                "DELETE FROM responses WHERE expires_at <= ?", (now,)
+            ).rowcount
+            for _ in range(max(0, expired)):
+                record_cache_eviction(self.backend, "expired")
+            (size,) = self._conn.execute("SELECT bytes FROM responses_size").fetchone()
+            if size > self.max_bytes:
+                doomed = []
+                rows = self._conn.execute(
+                    "SELECT key, length(value) FROM responses ORDER BY stored_at"
+                )
+                for key, length in rows:
+                    if size <= self.max_bytes:
+                        break
+                    doomed.append((key,))
+                    size -= length
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+                for _ in doomed:
+                    record_cache_eviction(self.backend, "capacity")
+        self._report_size()
+
+    def clear(self) -> None:
+        """Drop every entry."""
+        self._run(self._clear)
+
+    def _clear(self) -> None:
+        self._conn.execute("DELETE FROM responses")
+        self._report_size()
+
+    def close(self) -> None:
+        """Finish queued writes and close the database connection."""
+        self._run(self._conn.close)
+        self._executor.shutdown()
+
+    def _report_size(self) -> None:
+        size, entries = self._conn.execute(
+            "SELECT bytes, entries FROM responses_size"
+        ).fetchone()
+        record_cache_size(self.backend, size, entries, shared=True)
+
+
+class TieredCache(ResponseCache):
+    """Memory cache in front of a persistent cache.
+
+    Reads promote persistent hits into memory. Writes go to memory at once and
+    are queued to the persistent layer, so storing a response never waits for
+    the disk.
+    """
+
+    backend = "tiered"
+
+    def __init__(self, memory: MemoryCache, persistent: SQLiteCache):
+        self.memory = memory
+        self.persistent = persistent
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the body from memory, falling back to the persistent layer."""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        return self._promote(key, self.persistent.get_with_expiry(key))
+
+    async def aget(self, key: str) -> Optional[bytes]:
+        """``get``, awaiting the persistent layer off the event loop."""
+        value = self.memory.get(key)
+        if value is not None:
+            return value
+        return self._promote(key, await self.persistent.aget_with_expiry(key))
+
+    def _promote(self, key: str, entry: Optional[Tuple[float, bytes]]) -> Optional[bytes]:
+        if entry is None:
+            return None
+        expires_at, value = entry
+        self.memory.set(key, value, expires_at - time.time())
+        return value
+
+    def set(self, key: str, value: bytes, ttl: float) -> None:
+        """Store a body in memory and queue it for the persistent layer."""
+        self.memory.set(key, value, ttl)
+        self.persistent.set_later(key, value, ttl)
+
+    def warm(self) -> int:
+        """Load the most recently stored persistent entries into memory.
+
+        Returns:
+            Number of entries loaded.
+        """
+        rows = self.persistent.recent(self.memory.max_bytes)
+        now = time.time()
+        # Insert oldest first so the newest entries end up most recently used
+        for key, expires_at, value in reversed(rows):
+            self.memory.set(key, value, expires_at - now)
+        return len(rows)
+
+    def clear(self) -> None:
+        """Drop every entry from both layers."""
+        self.memory.clear()
+        self.persistent.clear()
+
+    def close(self) -> None:
+        """Close the persistent layer."""
+        self.persistent.close()
+
+
+# Process-wide cache shared by every tool call
+_cache: Optional[ResponseCache] = None
+
+
+def create_cache() -> Optional[ResponseCache]:
+    """Create the response cache configured in settings.
+
+    The ``sqlite`` backend keeps a memory layer in front of the database and
+    warms it from disk, so a restarted process starts with a hot cache.
+
+    Returns:
+        The cache, or None when caching is disabled.
+    """
+    if not settings.cache_enabled:
+        return None
+    memory = MemoryCache(settings.cache_max_bytes)
+    if settings.cache_backend != "sqlite":
+        logger.info("cache_created", backend="memory", max_bytes=settings.cache_max_bytes)
+        return memory
+
+    try:
+        persistent = SQLiteCache(settings.cache_path, settings.cache_disk_max_bytes)
+    except (OSError, sqlite3.Error) as e:
+        logger.warning("persistent_cache_unavailable", path=settings.cache_path, error=str(e))
+        return memory
+
+    cache = TieredCache(memory, persistent)
+    loaded = cache.warm()
+    logger.info(
+        "cache_created",
+        backend="sqlite",
+        path=settings.cache_path,
+        max_bytes=settings.cache_max_bytes,
+        disk_max_bytes=settings.cache_disk_max_bytes,
+        warmed_entries=loaded,
+    )
+    return cache
+
+
+def get_cache() -> Optional[ResponseCache]:
+    """Get the shared response cache, creating it on first use.
+
+    Returns:
+        The process-wide cache, or None when caching is disabled.
+    """
+    global _cache
+    if _cache is None:
+        _cache = create_cache()
+    return _cache
+
+
+def close_cache() -> None:
+    """Close the shared response cache."""
+    global _cache
+    cache, _cache = _cache, None
+    if cache is not None:
+        cache.close()
+
+
+def set_cache(cache: Optional[ResponseCache]) -> None:
+    """Inject the shared response cache.
+
+    Args:
+        cache: The cache to share, or None to reset.
+    """
+    global _cache
+    _cache = cache
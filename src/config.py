@@ -1,5 +1,6 @@
 """Configuration management for Poke MCP Production."""
-from typing import List
+from typing import Dict, List, Literal, Optional
+from functools import cached_property
 from pydantic import Field
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
@@ -31,10 +32,33 @@ class Settings(BaseSettings):
     log_level: str = Field(default="INFO", alias="LOG_LEVEL")
     log_format: str = Field(default="json", alias="LOG_FORMAT")
     log_file: str = Field(default="logs/server.log", alias="LOG_FILE")
+    # Render and write logs on a background thread instead of the event loop
+    log_async: bool = Field(default=True, alias="LOG_ASYNC")
+    log_queue_size: int = Field(default=10_000, alias="LOG_QUEUE_SIZE")
+    # Comma-separated event=rate pairs, e.g. "fetching_pokemon_data=0.1"
+    log_sample_rates: str = Field(default="", alias="LOG_SAMPLE_RATES")
+    # Field values longer than this many UTF-8 bytes are truncated; 0 disables the cap
+    log_max_field_bytes: int = Field(default=2048, alias="LOG_MAX_FIELD_BYTES")
+
+    # MCP over HTTP: JSON-RPC batch messages run concurrently, up to this many at once
+    mcp_batch_concurrency: int = Field(default=8, alias="MCP_BATCH_CONCURRENCY")
+    mcp_max_batch_size: int = Field(default=50, alias="MCP_MAX_BATCH_SIZE")
 
     # Monitoring
     enable_metrics: bool = Field(default=True, alias="ENABLE_METRICS")
     metrics_port: int = Field(default=9090, alias="METRICS_PORT")
+    # Must also be exported to the server's environment; see src/monitoring.py
+    prometheus_multiproc_dir: Optional[str] = Field(
+        default=None, alias="PROMETHEUS_MULTIPROC_DIR"
+    )
+
+    # Tracing: fraction of requests traced (0 disables), exported to "file" or "collector"
+    trace_sample_rate: float = Field(default=0.0, alias="TRACE_SAMPLE_RATE")
+    trace_exporter: Literal["file", "collector"] = Field(default="file", alias="TRACE_EXPORTER")
+    trace_file: str = Field(default="logs/traces.jsonl", alias="TRACE_FILE")
+    trace_collector_url: str = Field(
+        default="http://localhost:4318/v1/traces", alias="TRACE_COLLECTOR_URL"
+    )
 
     # PokeAPI
     pokeapi_base_url: str = Field(
@@ -42,11 +66,66 @@ class Settings(BaseSettings):
         alias="POKEAPI_BASE_URL",
     )
     pokeapi_timeout: int = Field(default=30, alias="POKEAPI_TIMEOUT")
+    pokeapi_http2: bool = Field(default=False, alias="POKEAPI_HTTP2")
+    pokeapi_max_connections: int = Field(default=100, alias="POKEAPI_MAX_CONNECTIONS")
+    pokeapi_max_keepalive_connections: int = Field(
+        default=20,
+        alias="POKEAPI_MAX_KEEPALIVE_CONNECTIONS",
+    )
+    pokeapi_keepalive_expiry: float = Field(default=30.0, alias="POKEAPI_KEEPALIVE_EXPIRY")
+    pokeapi_max_concurrency: int = Field(default=8, alias="POKEAPI_MAX_CONCURRENCY")
+    pokemon_info_batch_max: int = Field(default=50, alias="POKEMON_INFO_BATCH_MAX")
+    pokemon_info_max_moves: int = Field(default=100, alias="POKEMON_INFO_MAX_MOVES")
+    # live: PokeAPI only; snapshot: offline snapshot only; hybrid: snapshot, then live
+    pokeapi_mode: Literal["live", "snapshot", "hybrid"] = Field(
+        default="live", alias="POKEAPI_MODE"
+    )
+    pokeapi_snapshot_path: str = Field(
+        default="data/pokeapi.snapshot",
+        alias="POKEAPI_SNAPSHOT_PATH",
+    )
+    # rest: one request per resource; graphql: get_pokemon_info(_batch) in a
+    # single query to a PokeAPI-compatible GraphQL endpoint (live mode only)
+    pokeapi_upstream: Literal["rest", "graphql"] = Field(default="rest", alias="POKEAPI_UPSTREAM")
+    pokeapi_graphql_url: str = Field(
+        default="https://beta.pokeapi.co/graphql/v1beta",
+        alias="POKEAPI_GRAPHQL_URL",
+    )
+
+    # PokeAPI Cache
+    cache_enabled: bool = Field(default=True, alias="CACHE_ENABLED")
+    cache_backend: Literal["memory", "sqlite"] = Field(default="memory", alias="CACHE_BACKEND")
+    cache_path: str = Field(default=".cache/pokeapi.sqlite3", alias="CACHE_PATH")
+    cache_disk_max_bytes: int = Field(default=512 * 1024 * 1024, alias="CACHE_DISK_MAX_BYTES")
+    cache_max_bytes: int = Field(default=64 * 1024 * 1024, alias="CACHE_MAX_BYTES")
+    # Parsed entities kept beside the response cache; 0 disables the store
+    entity_store_max_entries: int = Field(default=50_000, alias="ENTITY_STORE_MAX_ENTRIES")
+    cache_default_ttl: int = Field(default=86400, alias="CACHE_DEFAULT_TTL")
+    cache_ttls: str = Field(
+        default="pokemon=86400,species=604800,evolution-chain=604800,move=604800,ability=604800",
+        alias="CACHE_TTLS",
+    )
+
+    # Battle Simulation
+    battle_max_simulations: int = Field(default=100_000, alias="BATTLE_MAX_SIMULATIONS")
+    tournament_max_roster: int = Field(default=151, alias="TOURNAMENT_MAX_ROSTER")
+    # 0 uses one worker process per CPU
+    tournament_workers: int = Field(default=0, alias="TOURNAMENT_WORKERS")
 
     # Rate Limiting
     rate_limit_enabled: bool = Field(default=True, alias="RATE_LIMIT_ENABLED")
     rate_limit_requests: int = Field(default=100, alias="RATE_LIMIT_REQUESTS")
     rate_limit_window: int = Field(default=60, alias="RATE_LIMIT_WINDOW")
+    rate_limit_max_clients: int = Field(default=100_000, alias="RATE_LIMIT_MAX_CLIENTS")
+    # "memory" (per replica) or "redis" (shared by all replicas)
+    rate_limit_backend: Literal["memory", "redis"] = Field(
+        default="memory", alias="RATE_LIMIT_BACKEND"
+    )
+    rate_limit_redis_url: str = Field(
+        default="redis://localhost:6379/0", alias="RATE_LIMIT_REDIS_URL"
+    )
+    rate_limit_redis_timeout: float = Field(default=0.1, alias="RATE_LIMIT_REDIS_TIMEOUT")
+    rate_limit_lease_size: int = Field(default=10, alias="RATE_LIMIT_LEASE_SIZE")
 
     # Production Settings
     environment: str = Field(default="production", alias="ENVIRONMENT")
@@ -57,6 +136,30 @@ class Settings(BaseSettings):
         """Parse allowed origins into a list."""
         return [origin.strip() for origin in self.allowed_origins.split(",")]
 
+    @cached_property
+    def cache_ttls_map(self) -> Dict[str, int]:
+        """Per-resource cache TTLs, parsed once; looked up on every cache write."""
+        ttls = {}
+        for item in self.cache_ttls.split(","):
+            if "=" in item:
+                resource, ttl = item.split("=", 1)
+                ttls[resource.strip()] = int(ttl)
+        return ttls
+
+    @property
+    def log_sample_rates_map(self) -> Dict[str, float]:
+        """Parse per-event log sampling rates into a mapping."""
+        rates = {}
+        for item in self.log_sample_rates.split(","):
+            if "=" in item:
+                event, rate = item.split("=", 1)
+                rates[event.strip()] = float(rate)
+        return rates
+
+    def cache_ttl_for(self, resource: str) -> int:
+        """Get the cache TTL in seconds for a resource type."""
+        return self.cache_ttls_map.get(resource, self.cache_default_ttl)
+
 
 # Global settings instance
 settings = Settings()
@@ -147,3 +147,10 @@ STATUS_BURN = "burn"
 STATUS_POISON = "poison"
 
 STATUS_EFFECTS = [STATUS_PARALYSIS, STATUS_BURN, STATUS_POISON]
+
+# Chance that a move with a status effect inflicts it
+STATUS_INFLICT_CHANCE = 0.2
+# Chance that a paralyzed Pokémon can't move on its turn
+PARALYSIS_SKIP_CHANCE = 0.25
+# End-of-turn status damage is max(1, hp // divisor)
+STATUS_DAMAGE_DIVISORS = {STATUS_BURN: 16, STATUS_POISON: 8}
@@ -0,0 +1,376 @@
+"""Normalized store of parsed PokeAPI entities.
+
+PokeAPI documents are large (a Pokémon's move list alone carries every
+version-group detail), while the tools only need a few fields of each. Every
+fetched document is parsed once into a compact, immutable entity:
+
+- ``Pokemon``, ``Move``, ``Ability``, ``Species`` and ``EvolutionChain`` are
+  frozen, slotted dataclasses, so they carry no per-instance ``__dict__``.
+- Names of types, stats, moves and abilities are interned, and stat-name and
+  type tuples are shared, so a thousand Pokémon hold one copy of each.
+- References to other resources are ``Ref`` objects shared by every entity
+  that points at the same URL.
+
+``EntityStore`` keeps parsed entities by URL with the response cache's
+per-resource TTLs and an entry budget, so every tool and Pokémon shares one
+instance of each move, ability, species and evolution chain. It also indexes
+each stored chain by the ids of its member species, so the family of any
+species already seen resolves without fetching the species.
+"""
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Union
+import sys
+import time
+import weakref
+from src.config import settings
+from src.json_extract import extract_pokemon
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class Ref:
+    """A named reference to another PokeAPI resource."""
+
+    name: str
+    url: str
+
+
+@dataclass(frozen=True, slots=True)
+class Move:
+    """A move with the fields battles and ``get_pokemon_info`` use."""
+
+    id: int
+    name: str
+    power: Optional[int]
+    type: str
+    effect: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class Ability:
+    """An ability and its English effect text."""
+
+    id: int
+    name: str
+    effect: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class Species:
+    """A species, linking its Pokémon to their evolution chain."""
+
+    id: int
+    name: str
+    evolution_chain_url: Optional[str]
+
+
+@dataclass(frozen=True, slots=True)
+class EvolutionChain:
+    """An evolution family: every member species, base form first.
+
+    Members are in stage order (all first evolutions, then all second
+    evolutions), and ``parents`` holds the position in ``names`` of each
+    member's pre-evolution, -1 for the base form, so branching families such
+    as Eevee's are kept whole. An ``id`` of 0 marks a species without an
+    evolution chain document.
+    """
+
+    id: int
+    names: Tuple[str, ...]
+    species_ids: Tuple[int, ...]
+    parents: Tuple[int, ...]
+
+    @property
+    def tree(self) -> Dict[str, Any]:
+        """The family as nested ``{"name", "evolves_to"}`` nodes from the base form."""
+        nodes: List[Dict[str, Any]] = [{"name": name, "evolves_to": []} for name in self.names]
+        for node, parent in zip(nodes, self.parents):
+            if parent >= 0:
+                nodes[parent]["evolves_to"].append(node)
+        return nodes[0]
+
+
+@dataclass(frozen=True, slots=True)
+class Pokemon:
+    """A Pokémon with its stats, types and references to its other resources."""
+
+    id: int
+    name: str
+    stat_names: Tuple[str, ...]
+    stat_values: Tuple[int, ...]
+    types: Tuple[str, ...]
+    abilities: Tuple[Ref, ...]
+    moves: Tuple[Ref, ...]
+    species: Ref
+
+    @property
+    def base_stats(self) -> Dict[str, int]:
+        """Base stats by stat name."""
+        return dict(zip(self.stat_names, self.stat_values))
+
+
+Entity = Union[Pokemon, Move, Ability, Species, EvolutionChain]
+
+# Shared instances of small immutable values. References are held only while
+# some entity uses them. Tuples cannot be weakly referenced, so the most
+# recently used name tuples are kept instead; an evicted tuple stays valid in
+# the entities holding it and is only no longer shared with new ones.
+NAME_TUPLES_MAX = 4096
+_tuples: "OrderedDict[Tuple[str, ...], Tuple[str, ...]]" = OrderedDict()
+_refs: "weakref.WeakValueDictionary[str, Ref]" = weakref.WeakValueDictionary()
+
+
+def _names(names: Any) -> Tuple[str, ...]:
+    key = tuple(sys.intern(name) for name in names)
+    shared = _tuples.get(key)
+    if shared is not None:
+        _tuples.move_to_end(key)
+        return shared
+    _tuples[key] = key
+    if len(_tuples) > NAME_TUPLES_MAX:
+        _tuples.popitem(last=False)
+    return key
+
+
+def _ref(resource: Dict[str, str]) -> Ref:
+    ref = _refs.get(resource["url"])
+    if ref is None or ref.name != resource["name"]:
+        ref = Ref(sys.intern(resource["name"]), resource["url"])
+        _refs[ref.url] = ref
+    return ref
+
+
+def species_id(url: str) -> Optional[int]:
+    """The id in a ``/pokemon-species/{id}/`` URL, or None for a name."""
+    ident = url.rstrip("/").rsplit("/", 1)[-1]
+    return int(ident) if ident.isdigit() else None
+
+
+def extract_english_effect(data: Dict[str, Any]) -> Optional[str]:
+    """Pick the English effect text from a move or ability document.
+
+    Args:
+        data: The PokeAPI move/ability JSON.
+
+    Returns:
+        The English effect text, or None.
+    """
+    return next(
+        (
+            e["effect"]
+            for e in data.get("effect_entries", [])
+            if e["language"]["name"] == "en"
+        ),
+        None,
+    )
+
+
+def parse_pokemon(data: Dict[str, Any]) -> Pokemon:
+    """Parse a ``/pokemon`` document."""
+    stats = data["stats"]
+    return Pokemon(
+        id=data["id"],
+        name=sys.intern(data["name"]),
+        stat_names=_names(stat["stat"]["name"] for stat in stats),
+        stat_values=tuple(stat["base_stat"] for stat in stats),
+        types=_names(t["type"]["name"] for t in data["types"]),
+        abilities=tuple(_ref(entry["ability"]) for entry in data["abilities"]),
+        moves=tuple(_ref(entry["move"]) for entry in data["moves"]),
+        species=_ref(data["species"]),
+    )
+
+
+def parse_move(data: Dict[str, Any]) -> Move:
+    """Parse a ``/move`` document."""
+    return Move(
+        id=data.get("id", 0),
+        name=sys.intern(data.get("name", "tackle")),
+        power=data.get("power", 50),
+        type=sys.intern(data.get("type", {}).get("name", "normal")),
+        effect=extract_english_effect(data),
+    )
+
+
+def parse_ability(data: Dict[str, Any]) -> Ability:
+    """Parse an ``/ability`` document."""
+    return Ability(
+        id=data["id"], name=sys.intern(data["name"]), effect=extract_english_effect(data)
+    )
+
+
+def parse_species(data: Dict[str, Any]) -> Species:
+    """Parse a ``/pokemon-species`` document."""
+    chain = data.get("evolution_chain")
+    return Species(
+        id=data["id"],
+        name=sys.intern(data["name"]),
+        evolution_chain_url=chain["url"] if chain else None,
+    )
+
+
+def build_evolution_chain(
+    ident: int, members: Iterable[Tuple[int, str, Optional[int]]]
+) -> EvolutionChain:
+    """Build a family from ``(species id, name, pre-evolution species id)`` rows.
+
+    Siblings keep the order of ``members``; a family with several base forms
+    keeps only the first's descendants.
+    """
+    children: Dict[Optional[int], List[Tuple[int, str]]] = {}
+    for member_id, name, parent_id in members:
+        children.setdefault(parent_id, []).append((member_id, name))
+    ids: List[int] = []
+    names: List[str] = []
+    parents: List[int] = []
+    stage = [(member, -1) for member in children.get(None, [])[:1]]
+    while stage:
+        next_stage = []
+        for (member_id, name), parent in stage:
+            next_stage.extend((child, len(ids)) for child in children.get(member_id, []))
+            ids.append(member_id)
+            names.append(name)
+            parents.append(parent)
+        stage = next_stage
+    return EvolutionChain(
+        id=ident, names=_names(names), species_ids=tuple(ids), parents=tuple(parents)
+    )
+
+
+def single_species_chain(species: Species) -> EvolutionChain:
+    """The family of a species without an evolution chain document."""
+    return EvolutionChain(
+        id=0, names=_names([species.name]), species_ids=(species.id,), parents=(-1,)
+    )
+
+
+def parse_evolution_chain_entity(data: Dict[str, Any]) -> EvolutionChain:
+    """Parse an ``/evolution-chain`` document, keeping every branch."""
+    members: List[Tuple[int, str, Optional[int]]] = []
+    links = [(data["chain"], None)]
+    while links:
+        link, parent_id = links.pop(0)
+        # Stand-in negative ids keep the tree if a URL carries no id
+        member_id = species_id(link["species"]["url"]) or -len(members) - 1
+        members.append((member_id, link["species"]["name"], parent_id))
+        links.extend((child, member_id) for child in link["evolves_to"])
+    return build_evolution_chain(data["id"], members)
+
+
+# Decoders reading only the members the parsers use, for documents that are
+# mostly other data; resource types without one are decoded whole
+DECODERS: Dict[str, Callable[[bytes], Any]] = {"pokemon": extract_pokemon}
+
+# Parser of each resource type, by the endpoint name used for metrics and TTLs
+PARSERS: Dict[str, Callable[[Dict[str, Any]], Entity]] = {
+    "pokemon": parse_pokemon,
+    "move": parse_move,
+    "ability": parse_ability,
+    "species": parse_species,
+    "evolution-chain": parse_evolution_chain_entity,
+}
+
+
+class EntityStore:
+    """Parsed entities by URL, with per-entry TTL and LRU eviction.
+
+    Entries expire with the response cache's TTL for their resource type, so
+    the store never serves an entity older than the cache would serve its
+    document. Stored evolution chains are also indexed by member species id.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Entity]]" = OrderedDict()
+        # Species id -> URL of its evolution chain
+        self._families: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, url: str) -> Optional[Entity]:
+        """Return the entity parsed from ``url`` and mark it most recently used."""
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        expires_at, entity = entry
+        if expires_at <= time.monotonic():
+            del self._entries[url]
+            return None
+        self._entries.move_to_end(url)
+        return entity
+
+    def put(self, url: str, endpoint: str, entity: Entity) -> Entity:
+        """Store ``entity`` unless a live one is already stored for ``url``.
+
+        Returns:
+            The stored entity, so concurrent parses of one URL share an instance.
+        """
+        existing = self.get(url)
+        if existing is not None:
+            return existing
+        self._entries[url] = (time.monotonic() + settings.cache_ttl_for(endpoint), entity)
+        if isinstance(entity, EvolutionChain):
+            for member_id in entity.species_ids:
+                if member_id > 0:
+                    self._families[member_id] = url
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entity
+
+    def family(self, species_url: str) -> Optional[EvolutionChain]:
+        """Return the stored evolution chain of the species at ``species_url``."""
+        member_id = species_id(species_url)
+        chain_url = self._families.get(member_id) if member_id is not None else None
+        if chain_url is None:
+            return None
+        chain = self.get(chain_url)
+        if chain is None:
+            # Expired or evicted; the next fetch of the chain re-indexes it
+            del self._families[member_id]
+        return chain
+
+    def clear(self) -> None:
+        """Drop every entity."""
+        self._entries.clear()
+        self._families.clear()
+
+
+# Process-wide store shared by every tool call
+_store: Optional[EntityStore] = None
+
+
+def create_entity_store() -> Optional[EntityStore]:
+    """Create the entity store configured in settings.
+
+    Returns:
+        The store, or None when caching is disabled or the budget is zero.
+    """
+    if not settings.cache_enabled or settings.entity_store_max_entries <= 0:
+        return None
+    logger.info("entity_store_created", max_entries=settings.entity_store_max_entries)
+    return EntityStore(settings.entity_store_max_entries)
+
+
+def get_entity_store() -> Optional[EntityStore]:
+    """Get the shared entity store, creating it on first use.
+
+    Returns:
+        The process-wide store, or None when disabled.
+    """
+    global _store
+    if _store is None:
+        _store = create_entity_store()
+    return _store
+
+
+def set_entity_store(store: Optional[EntityStore]) -> None:
+    """Inject the shared entity store.
+
+    Args:
+        store: The store to share, or None to reset.
+    """
+    global _store
+    _store = store
@@ -0,0 +1,118 @@
+"""Selective decoding of large PokeAPI JSON documents.
+
+A ``/pokemon`` document runs to hundreds of KB, most of it the per-version
+details of each move and the sprite URLs, yet only a handful of its members
+are kept. ``extract_fields`` walks the top-level object with the stdlib
+decoder's ``raw_decode`` one member (or one array item) at a time and keeps
+only the requested ones.
+
+This does not skip any parsing: the whole body is decoded to ``str`` first,
+and every member is still built by the C scanner, unwanted ones only to be
+dropped straight away. The saving is in what stays alive: each member is
+released (or trimmed, for array items) before the next is built, so peak
+memory is the text plus the largest single member instead of the text plus
+the whole tree, and the garbage collector has far fewer live containers to
+traverse. That only outweighs the per-member overhead for large documents;
+smaller ones are decoded whole (see ``scripts/bench_json_extract.py``).
+"""
+from typing import Any, Collection, Dict, List, Mapping, Optional, Tuple, Union
+import json
+import re
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+
+# Members of /pokemon read by src.entities.parse_pokemon
+POKEMON_FIELDS = ("id", "name", "stats", "types", "abilities", "species")
+POKEMON_ITEM_FIELDS = {"moves": ("move",)}
+# Below this size json.loads is faster and its peak memory is small anyway
+SELECTIVE_DECODE_MIN_BYTES = 256 * 1024
+
+
+def extract_fields(
+    body: Union[bytes, str],
+    fields: Collection[str],
+    item_fields: Optional[Mapping[str, Collection[str]]] = None,
+) -> Dict[str, Any]:
+    """Decode only some top-level members of a JSON object.
+
+    Args:
+        body: The encoded JSON object.
+        fields: Members to decode whole.
+        item_fields: Array members to decode item by item, keeping only the
+            given keys of each (object) item.
+
+    Returns:
+        The requested members that are present.
+
+    Raises:
+        ValueError: If ``body`` is not a valid JSON object.
+    """
+    item_fields = item_fields or {}
+    text = body.decode("utf-8") if isinstance(body, (bytes, bytearray)) else body
+    try:
+        return _scan_object(text, fields, item_fields)
+    except IndexError:
+        # Truncated input; let the full decoder produce the usual error
+        json.loads(text)
+        raise ValueError("Expected a JSON object") from None
+
+
+def extract_pokemon(body: bytes) -> Dict[str, Any]:
+    """Decode the members of a ``/pokemon`` document that entities use."""
+    if len(body) < SELECTIVE_DECODE_MIN_BYTES:
+        return json.loads(body)
+    return extract_fields(body, POKEMON_FIELDS, POKEMON_ITEM_FIELDS)
+
+
+def _scan_object(
+    text: str, fields: Collection[str], item_fields: Mapping[str, Collection[str]]
+) -> Dict[str, Any]:
+    decode = _decoder.raw_decode
+    skip = _WHITESPACE.match
+    result: Dict[str, Any] = {}
+    pos = skip(text, 0).end()
+    if text[pos] != "{":
+        raise ValueError("Expected a JSON object")
+    pos = skip(text, pos + 1).end()
+    while text[pos] != "}":
+        key, pos = decode(text, pos)
+        pos = skip(text, pos).end()
+        if text[pos] != ":":
+            raise ValueError(f"Expected ':' at position {pos}")
+        pos = skip(text, pos + 1).end()
+        if key in item_fields and text[pos] == "[":
+            result[key], pos = _scan_array(text, pos, item_fields[key])
+        else:
+            value, pos = decode(text, pos)
+            if key in fields:
+                result[key] = value
+        pos = skip(text, pos).end()
+        if text[pos] == ",":
+            pos = skip(text, pos + 1).end()
+            if text[pos] == "}":
+                raise ValueError(f"Trailing ',' at position {pos}")
+        elif text[pos] != "}":
+            raise ValueError(f"Expected ',' or '}}' at position {pos}")
+    return result
+
+
+def _scan_array(text: str, pos: int, keys: Collection[str]) -> Tuple[List[Any], int]:
+    """Decode the array at ``pos`` one item at a time, trimming object items."""
+    decode = _decoder.raw_decode
+    skip = _WHITESPACE.match
+    items: List[Any] = []
+    pos = skip(text, pos + 1).end()
+    while text[pos] != "]":
+        item, pos = decode(text, pos)
+        if isinstance(item, dict):
+            item = {key: item[key] for key in keys if key in item}
+        items.append(item)
+        pos = skip(text, pos).end()
+        if text[pos] == ",":
+            pos = skip(text, pos + 1).end()
+            if text[pos] == "]":
+                raise ValueError(f"Trailing ',' at position {pos}")
+        elif text[pos] != "]":
+            raise ValueError(f"Expected ',' or ']' at position {pos}")
+    return items, pos + 1
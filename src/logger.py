@@ -1,8 +1,32 @@
-"""Structured logging configuration for Poke MCP Production."""
+"""Structured logging configuration for Poke MCP Production.
+
+With ``async_writer`` enabled (the default), loggers only enqueue event
+dicts; a background thread renders them and writes to the output stream, so
+JSON rendering, field truncation and blocking writes stay off the event
+loop. High-volume events can be sampled per event name, fields over a byte
+limit are truncated, and events dropped by sampling or a full queue are
+counted in ``log_events_dropped_total``.
+"""
+import atexit
+import json
+import queue
+import random
 import sys
+import threading
 import structlog
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+# Events are always kept at these levels, whatever their sampling rate
+_UNSAMPLED_LEVELS = frozenset({"warning", "error", "critical", "exception"})
+_WRITE_BATCH = 256
+
+_writer: Optional["QueueLogWriter"] = None
 
 
 def get_logger(name: str) -> Any:
@@ -17,19 +41,205 @@ def get_logger(name: str) -> Any:
     return structlog.get_logger(name)
 
 
-def configure_logging(log_level: str = "INFO", log_format: str = "json") -> None:
+def _record_dropped(reason: str) -> None:
+    # Imported lazily: src.monitoring imports this module
+    from src.monitoring import record_log_dropped
+
+    record_log_dropped(reason)
+
+
+def json_dumps(obj: Any, **kwargs: Any) -> str:
+    """Serialize a log event, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str).decode()
+    # JSONRenderer passes its own ``default``
+    kwargs.setdefault("default", str)
+    return json.dumps(obj, **kwargs)
+
+
+class EventSampler:
+    """Processor keeping only a fraction of selected high-volume events."""
+
+    def __init__(self, rates: Dict[str, float]) -> None:
+        """Initialize the sampler.
+
+        Args:
+            rates: Event name to the fraction of events kept (0.0-1.0).
+        """
+        self.rates = rates
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Any:
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is not None and method_name not in _UNSAMPLED_LEVELS and random.random() >= rate:
+            _record_dropped("sampled")
+            raise structlog.DropEvent
+        return event_dict
+
+
+class FieldTruncator:
+    """Processor capping the encoded size of each logged field.
+
+    Runs on the writer thread when logging is asynchronous, so serializing
+    large values to measure them stays off the event loop. Tracebacks and
+    stack dumps added by the logging pipeline itself are never truncated.
+    """
+
+    _EXEMPT = frozenset({"exception", "stack"})
+
+    def __init__(self, max_bytes: int) -> None:
+        """Initialize the truncator.
+
+        Args:
+            max_bytes: Maximum UTF-8 encoded bytes per field value.
+        """
+        self.max_bytes = max_bytes
+
+    def __call__(self, logger: Any, method_name: str, event_dict: Dict[str, Any]) -> Any:
+        limit = self.max_bytes
+        for key, value in event_dict.items():
+            if isinstance(value, (int, float, bool)) or value is None or key in self._EXEMPT:
+                continue
+            text = value if isinstance(value, str) else None
+            if text is None:
+                if not isinstance(value, (dict, list, tuple)):
+                    continue
+                text = json_dumps(value)
+            # A character encodes to at most 4 bytes, so short text needs no encoding
+            if len(text) * 4 <= limit:
+                continue
+            data = text.encode("utf-8")
+            if len(data) > limit:
+                kept = data[:limit].decode("utf-8", "ignore")
+                event_dict[key] = f"{kept}...[truncated {len(data) - limit} bytes]"
+        return event_dict
+
+
+class QueueLogWriter:
+    """Background thread that renders queued events and writes them out."""
+
+    def __init__(
+        self,
+        renderer: Callable[..., str],
+        stream: TextIO,
+        maxsize: int = 10_000,
+        processors: Sequence[Callable[..., Any]] = (),
+    ) -> None:
+        """Start the writer thread.
+
+        Args:
+            renderer: Final structlog processor turning an event dict into a line.
+            stream: Output stream.
+            maxsize: Maximum queued events; further events are dropped.
+            processors: structlog processors run on the writer thread before
+                ``renderer``.
+        """
+        self.renderer = renderer
+        self.processors = list(processors)
+        self.stream = stream
+        self.queue: "queue.Queue[Optional[Dict[str, Any]]]" = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, event_dict: Dict[str, Any]) -> None:
+        """Queue an event without blocking; drop it if the queue is full."""
+        try:
+            self.queue.put_nowait(event_dict)
+        except queue.Full:
+            _record_dropped("queue_full")
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Optional[Dict[str, Any]]] = [self.queue.get()]
+            while len(batch) < _WRITE_BATCH:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            lines = []
+            for event_dict in batch:
+                if event_dict is None:
+                    self._write(lines)
+                    return
+                try:
+                    for processor in self.processors:
+                        event_dict = processor(None, "", event_dict)
+                    lines.append(self.renderer(None, "", event_dict))
+                except Exception:  # pragma: no cover - never let a bad event kill logging
+                    _record_dropped("render_error")
+            self._write(lines)
+
+    def _write(self, lines: List[str]) -> None:
+        if not lines:
+            return
+        try:
+            self.stream.write("\n".join(lines) + "\n")
+            self.stream.flush()
+        except (OSError, ValueError):
+            pass
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued events and stop the thread."""
+        if self._thread.is_alive():
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+
+class QueuedLogger:
+    """structlog logger that hands event dicts to the active ``QueueLogWriter``."""
+
+    def msg(self, **event_dict: Any) -> None:
+        # Look the writer up per call: loggers are cached on first use and
+        # must keep working if logging is reconfigured afterwards
+        writer = _writer
+        if writer is not None:
+            writer.put(event_dict)
+        else:
+            _record_dropped("writer_closed")
+
+    log = debug = info = warn = warning = error = critical = exception = fatal = msg
+
+
+def close_logging() -> None:
+    """Flush and stop the background log writer, if any."""
+    global _writer
+    writer, _writer = _writer, None
+    if writer is not None:
+        writer.close()
+
+
+def configure_logging(
+    log_level: str = "INFO",
+    log_format: str = "json",
+    async_writer: bool = False,
+    queue_size: int = 10_000,
+    sample_rates: Optional[Dict[str, float]] = None,
+    max_field_bytes: int = 0,
+    stream: Optional[TextIO] = None,
+) -> None:
     """Configure structured logging.
 
     Args:
         log_level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL).
         log_format: Output format (json or console).
+        async_writer: Render and write events on a background thread.
+        queue_size: Maximum events queued for the background writer.
+        sample_rates: Fraction of events kept, by event name.
+        max_field_bytes: Truncate field values longer than this many UTF-8
+            bytes; 0 disables the cap.
+        stream: Output stream; defaults to stdout.
     """
+    stream = stream or sys.stdout
     # Ensure logs directory exists
     Path("logs").mkdir(exist_ok=True)
 
     # Configure structlog
-    processors = [
-        structlog.contextvars.merge_contextvars,
+    processors: List[Any] = [structlog.contextvars.merge_contextvars]
+    if sample_rates:
+        processors.append(EventSampler(sample_rates))
+    processors += [
         structlog.processors.add_log_level,
         structlog.processors.TimeStamper(fmt="iso"),
         structlog.processors.StackInfoRenderer(),
@@ -37,14 +247,32 @@ def configure_logging(log_level: str = "INFO", log_format: str = "json") -> None
     ]
 
     if log_format == "json":
-        processors.append(structlog.processors.JSONRenderer())
+        renderer = structlog.processors.JSONRenderer(serializer=json_dumps)
     else:
-        processors.append(structlog.dev.ConsoleRenderer())
+        renderer = structlog.dev.ConsoleRenderer()
+
+    # Truncation serializes values to measure them, so it runs on the writer
+    # thread when there is one
+    late_processors = [FieldTruncator(max_field_bytes)] if max_field_bytes else []
+
+    close_logging()
+    if async_writer:
+        global _writer
+        _writer = QueueLogWriter(renderer, stream, queue_size, late_processors)
+        # Hand the event dict itself to the writer thread, which renders it
+        processors.append(lambda logger, method_name, event_dict: ((), event_dict))
+        logger_factory: Callable[..., Any] = lambda *args: QueuedLogger()
+    else:
+        processors += [*late_processors, renderer]
+        logger_factory = structlog.PrintLoggerFactory(file=stream)
 
     structlog.configure(
         processors=processors,
         wrapper_class=structlog.make_filtering_bound_logger(log_level.upper()),
         context_class=dict,
-        logger_factory=structlog.PrintLoggerFactory(file=sys.stdout),
+        logger_factory=logger_factory,
         cache_logger_on_first_use=True,
     )
+
+
+atexit.register(close_logging)
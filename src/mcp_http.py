@@ -0,0 +1,171 @@
+"""MCP streamable HTTP endpoint with API-key auth and JSON-RPC batches.
+
+``/mcp`` is served by FastMCP's streamable HTTP transport in stateless JSON
+mode, so every POST is answered with a single JSON body and any worker can
+serve any request. The transport only accepts one JSON-RPC message per POST;
+this endpoint additionally accepts a JSON-RPC batch (an array of messages),
+dispatches its messages concurrently through the transport with at most
+``MCP_BATCH_CONCURRENCY`` in flight, and returns the responses in request
+order. Notifications in a batch produce no response entry. Only POST is
+routed: a stateless server has no server-initiated messages to stream over
+GET.
+"""
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from fastapi import HTTPException
+from fastapi.responses import JSONResponse
+from starlette.requests import Request
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.auth import check_api_key, security
+from src.logger import get_logger
+from src.pokeapi_client import gather_limited
+
+logger = get_logger(__name__)
+
+INVALID_REQUEST = -32600
+
+
+def _jsonrpc_error(code: int, message: str, request_id: Any = None) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "error": {"code": code, "message": message}}
+
+
+async def _read_body(receive: Receive) -> bytes:
+    chunks = []
+    while True:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            break
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body", False):
+            break
+    return b"".join(chunks)
+
+
+def _replay(body: bytes, then: Optional[Receive] = None) -> Receive:
+    """Build an ASGI ``receive`` yielding ``body`` once, then deferring to ``then``.
+
+    Without ``then`` (batch messages share one connection), later calls wait
+    until cancelled, as for a client that stays connected.
+    """
+    sent = False
+
+    async def receive() -> Message:
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        if then is not None:
+            return await then()
+        await asyncio.Event().wait()
+        return {"type": "http.disconnect"}
+
+    return receive
+
+
+class McpHttpEndpoint:
+    """ASGI endpoint authenticating requests and splitting JSON-RPC batches."""
+
+    def __init__(self, handler: ASGIApp, max_concurrency: int = 8, max_batch: int = 100):
+        """Initialize the endpoint.
+
+        Args:
+            handler: The MCP streamable HTTP transport, e.g.
+                ``mcp.session_manager.handle_request``.
+            max_concurrency: Batch messages dispatched at once.
+            max_batch: Largest batch accepted.
+        """
+        self.handler = handler
+        self.max_concurrency = max_concurrency
+        self.max_batch = max_batch
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Authenticate, then serve a single message or a batch."""
+        try:
+            credentials = await security(Request(scope))
+            check_api_key(credentials.credentials)
+        except HTTPException as e:
+            response = JSONResponse({"detail": e.detail}, e.status_code, headers=e.headers)
+            await response(scope, receive, send)
+            return
+
+        body = await _read_body(receive)
+        if not body.lstrip().startswith(b"["):
+            await self.handler(scope, _replay(body, receive), send)
+            return
+
+        try:
+            batch = json.loads(body)
+        except json.JSONDecodeError as e:
+            await JSONResponse(_jsonrpc_error(-32700, f"Parse error: {e}"), 400)(
+                scope, receive, send
+            )
+            return
+        if not batch or len(batch) > self.max_batch:
+            message = f"Batch must contain 1 to {self.max_batch} messages"
+            await JSONResponse(_jsonrpc_error(INVALID_REQUEST, message), 400)(
+                scope, receive, send
+            )
+            return
+
+        start_time = time.time()
+        replies = await gather_limited(
+            self.max_concurrency, *(self._dispatch(scope, item) for item in batch)
+        )
+        results = [reply for reply in replies if reply is not None]
+        logger.info(
+            "mcp_batch_completed",
+            size=len(batch),
+            responses=len(results),
+            duration=time.time() - start_time,
+        )
+        if results:
+            response: Response = JSONResponse(results)
+        else:
+            response = Response(status_code=202)
+        await response(scope, receive, send)
+
+    async def _dispatch(self, scope: Scope, item: Any) -> Optional[Dict[str, Any]]:
+        """Run one batch message through the transport and return its reply.
+
+        Returns:
+            The JSON-RPC response, or None for a notification.
+        """
+        request_id = item.get("id") if isinstance(item, dict) else None
+        if not isinstance(item, dict):
+            return _jsonrpc_error(INVALID_REQUEST, "Invalid Request")
+
+        body = json.dumps(item).encode()
+        headers = [
+            (name, value) for name, value in scope["headers"] if name != b"content-length"
+        ]
+        headers.append((b"content-length", str(len(body)).encode()))
+        status, payload = await self._call(dict(scope, headers=headers), body)
+
+        if "id" not in item:
+            return None
+        try:
+            reply = json.loads(payload)
+        except json.JSONDecodeError:
+            return _jsonrpc_error(-32603, f"Internal error (HTTP {status})", request_id)
+        if isinstance(reply, dict) and "error" in reply:
+            # Transport-level errors carry a placeholder ID; restore the caller's
+            reply["id"] = request_id
+        return reply
+
+    async def _call(self, scope: Scope, body: bytes) -> Tuple[int, bytes]:
+        """Invoke the transport with ``body`` and capture the response."""
+        status = 500
+        chunks: List[bytes] = []
+
+        async def send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.handler(scope, _replay(body), send)
+        return status, b"".join(chunks)
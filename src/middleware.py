@@ -1,104 +1,119 @@
 """Custom middleware for request processing."""
 import time
-from typing import Callable
-from fastapi import Request, Response
+from typing import Optional
 from fastapi.responses import JSONResponse
-from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.datastructures import URL
 from starlette.middleware.cors import CORSMiddleware
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from src.config import settings
 from src.logger import get_logger
+from src.rate_limit import MemoryRateLimitBackend, RateLimitBackend, SlidingWindowLimiter
+from src.tracing import start_trace
 import structlog
 
 logger = get_logger(__name__)
 
 
-class RateLimitMiddleware(BaseHTTPMiddleware):
-    """Simple in-memory rate limiting middleware."""
+class RateLimitMiddleware:
+    """Rate limiting ASGI middleware backed by a pluggable ``RateLimitBackend``."""
 
-    def __init__(self, app, requests: int = 100, window: int = 60):
-        super().__init__(app)
+    def __init__(
+        self,
+        app: ASGIApp,
+        requests: int = 100,
+        window: int = 60,
+        max_clients: int = 100_000,
+        backend: Optional[RateLimitBackend] = None,
+    ):
+        self.app = app
         self.requests = requests
         self.window = window
-        self.clients = {}
+        self.backend = backend or MemoryRateLimitBackend(
+            SlidingWindowLimiter(requests, window, max_clients)
+        )
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process rate limiting."""
-        if not settings.rate_limit_enabled:
-            return await call_next(request)
-
-        client_ip = request.client.host if request.client else "unknown"
-        current_time = time.time()
-
-        # Clean old entries
-        self.clients = {
-            ip: timestamps
-            for ip, timestamps in self.clients.items()
-            if any(t > current_time - self.window for t in timestamps)
-        }
-
-        # Check rate limit
-        if client_ip in self.clients:
-            timestamps = [
-                t for t in self.clients[client_ip] if t > current_time - self.window
-            ]
-            if len(timestamps) >= self.requests:
-                logger.warning("rate_limit_exceeded", client_ip=client_ip)
-                return JSONResponse(
-                    status_code=429,
-                    content={
-                        "error": "Rate limit exceeded",
-                        "detail": f"Maximum {self.requests} requests per {self.window} seconds",
-                    },
-                )
-            timestamps.append(current_time)
-            self.clients[client_ip] = timestamps
-        else:
-            self.clients[client_ip] = [current_time]
+        if scope["type"] != "http" or not settings.rate_limit_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        client = scope.get("client")
+        client_ip = client[0] if client else "unknown"
+        if not await self.backend.hit(client_ip):
+            logger.warning("rate_limit_exceeded", client_ip=client_ip)
+            response = JSONResponse(
+                status_code=429,
+                content={
+                    "error": "Rate limit exceeded",
+                    "detail": f"Maximum {self.requests} requests per {self.window} seconds",
+                },
+            )
+            await response(scope, receive, send)
+            return
 
-        return await call_next(request)
+        await self.app(scope, receive, send)
 
 
-class RequestLoggingMiddleware(BaseHTTPMiddleware):
-    """Middleware for structured request/response logging."""
+class RequestLoggingMiddleware:
+    """ASGI middleware for structured request/response logging."""
 
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Log request and response details."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
         request_id = str(time.time())
         structlog.contextvars.bind_contextvars(request_id=request_id)
-
-        logger.info(
-            "request_started",
-            method=request.method,
-            url=str(request.url),
-            client=request.client.host if request.client else None,
-        )
-
-        start_time = time.time()
-        try:
-            response = await call_next(request)
-            duration = time.time() - start_time
-
+        method = scope["method"]
+        url = str(URL(scope=scope))
+        client = scope.get("client")
+        status_code = None
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        # Opened before logging so request log lines carry the trace ID
+        with start_trace("http.request", method=method, path=scope["path"]) as request_span:
             logger.info(
-                "request_completed",
-                method=request.method,
-                url=str(request.url),
-                status_code=response.status_code,
-                duration=duration,
+                "request_started",
+                method=method,
+                url=url,
+                client=client[0] if client else None,
             )
 
-            return response
-        except Exception as e:
-            duration = time.time() - start_time
-            logger.error(
-                "request_failed",
-                method=request.method,
-                url=str(request.url),
-                error=str(e),
-                duration=duration,
-            )
-            raise
-        finally:
-            structlog.contextvars.unbind_contextvars("request_id")
+            start_time = time.time()
+            try:
+                await self.app(scope, receive, send_wrapper)
+                duration = time.time() - start_time
+                request_span.set("status_code", status_code)
+
+                logger.info(
+                    "request_completed",
+                    method=method,
+                    url=url,
+                    status_code=status_code,
+                    duration=duration,
+                )
+            except Exception as e:
+                duration = time.time() - start_time
+                logger.error(
+                    "request_failed",
+                    method=method,
+                    url=url,
+                    error=str(e),
+                    duration=duration,
+                )
+                raise
+            finally:
+                structlog.contextvars.unbind_contextvars("request_id")
 
 
 def setup_cors_middleware(app) -> None:
@@ -1,12 +1,32 @@
-"""Monitoring and metrics collection using Prometheus."""
-from prometheus_client import Counter, Histogram, Gauge, Info
+"""Monitoring and metrics collection using Prometheus.
+
+When ``PROMETHEUS_MULTIPROC_DIR`` is set in the environment of the server
+process (before it starts, as prometheus_client reads it at import), every
+worker writes its metrics to that directory and ``generate_metrics``
+aggregates all workers into one scrape.
+"""
+from typing import Any, Dict
+import os
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    Gauge,
+    Info,
+    generate_latest,
+    multiprocess,
+)
 import time
-from typing import Callable
-from fastapi import Request, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from src.config import settings
 from src.logger import get_logger
 
 logger = get_logger(__name__)
 
+# Label for requests that matched no route, so probing cannot create new series
+OTHER_ROUTE = "other"
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+
 # Metrics
 http_requests_total = Counter(
     "http_requests_total",
@@ -38,9 +58,76 @@ pokeapi_requests_total = Counter(
     ["endpoint", "status"],
 )
 
+pokeapi_requests_coalesced_total = Counter(
+    "pokeapi_requests_coalesced_total",
+    "PokeAPI requests that joined an identical request already in flight",
+    ["endpoint"],
+)
+
+pokeapi_cache_hits_total = Counter(
+    "pokeapi_cache_hits_total",
+    "PokeAPI responses served from cache",
+    ["endpoint"],
+)
+
+pokeapi_cache_misses_total = Counter(
+    "pokeapi_cache_misses_total",
+    "PokeAPI cache lookups that went upstream",
+    ["endpoint"],
+)
+
+pokeapi_cache_evictions_total = Counter(
+    "pokeapi_cache_evictions_total",
+    "PokeAPI cache entries evicted",
+    ["backend", "reason"],
+)
+
+pokeapi_cache_size_bytes = Gauge(
+    "pokeapi_cache_size_bytes",
+    "Bytes held by the PokeAPI cache",
+    ["backend"],
+    multiprocess_mode="livesum",
+)
+
+pokeapi_cache_entries = Gauge(
+    "pokeapi_cache_entries",
+    "Entries held by the PokeAPI cache",
+    ["backend"],
+    multiprocess_mode="livesum",
+)
+
+# A shared backend (one SQLite file) reports the same footprint from every
+# worker, so workers' values are not summed
+pokeapi_cache_shared_size_bytes = Gauge(
+    "pokeapi_cache_shared_size_bytes",
+    "Bytes held by a PokeAPI cache shared between workers",
+    ["backend"],
+    multiprocess_mode="mostrecent",
+)
+
+pokeapi_cache_shared_entries = Gauge(
+    "pokeapi_cache_shared_entries",
+    "Entries held by a PokeAPI cache shared between workers",
+    ["backend"],
+    multiprocess_mode="mostrecent",
+)
+
+pokeapi_snapshot_lookups_total = Counter(
+    "pokeapi_snapshot_lookups_total",
+    "PokeAPI resources looked up in the offline snapshot",
+    ["endpoint", "result"],
+)
+
+log_events_dropped_total = Counter(
+    "log_events_dropped_total",
+    "Log events dropped before being written",
+    ["reason"],
+)
+
 active_connections = Gauge(
     "active_connections",
     "Number of active connections",
+    multiprocess_mode="livesum",
 )
 
 server_info = Info(
@@ -49,38 +136,71 @@ server_info = Info(
 )
 
 
-async def metrics_middleware(request: Request, call_next: Callable) -> Response:
-    """Middleware to collect HTTP request metrics.
+def route_label(scope: Dict[str, Any]) -> str:
+    """Get the route template a request matched, for use as a metric label.
 
     Args:
-        request: The incoming request.
-        call_next: The next middleware/route handler.
+        scope: ASGI scope after routing.
 
     Returns:
-        The response.
+        The route path template (e.g. ``/items/{item_id}``), or
+        ``OTHER_ROUTE`` if no route matched.
     """
-    start_time = time.time()
-    active_connections.inc()
+    route = scope.get("route")
+    if route is None and "endpoint" in scope:
+        # Plain Starlette routes (e.g. /mcp, added with add_route) only record
+        # the matched endpoint; find the route that serves it
+        routes = getattr(scope.get("router"), "routes", ())
+        route = next((r for r in routes if getattr(r, "endpoint", None) is scope["endpoint"]), None)
+    template = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return template or OTHER_ROUTE
+
+
+class MetricsMiddleware:
+    """ASGI middleware to collect HTTP request metrics."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Record request count, duration and in-flight requests.
+
+        Duration covers the whole response, including a streamed body.
+        """
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = None
 
-    try:
-        response = await call_next(request)
-        duration = time.time() - start_time
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
 
-        # Record metrics
-        http_requests_total.labels(
-            method=request.method,
-            endpoint=request.url.path,
-            status=response.status_code,
-        ).inc()
+        start_time = time.time()
+        active_connections.inc()
 
-        http_request_duration_seconds.labels(
-            method=request.method,
-            endpoint=request.url.path,
-        ).observe(duration)
+        try:
+            await self.app(scope, receive, send_wrapper)
+            duration = time.time() - start_time
 
-        return response
-    finally:
-        active_connections.dec()
+            # Label by route template so label values stay bounded
+            method = scope["method"] if scope["method"] in KNOWN_METHODS else OTHER_ROUTE
+            path = route_label(scope)
+            http_requests_total.labels(
+                method=method,
+                endpoint=path,
+                status=status_code,
+            ).inc()
+
+            http_request_duration_seconds.labels(
+                method=method,
+                endpoint=path,
+            ).observe(duration)
+        finally:
+            active_connections.dec()
 
 
 def record_tool_call(tool_name: str, duration: float, status: str) -> None:
@@ -109,3 +229,117 @@ def record_pokeapi_request(endpoint: str, status: int) -> None:
         status: HTTP status code.
     """
     pokeapi_requests_total.labels(endpoint=endpoint, status=status).inc()
+
+
+def record_pokeapi_coalesced(endpoint: str) -> None:
+    """Record a PokeAPI request served by an identical in-flight request.
+
+    Args:
+        endpoint: The API endpoint called.
+    """
+    pokeapi_requests_coalesced_total.labels(endpoint=endpoint).inc()
+
+
+def record_cache_lookup(endpoint: str, hit: bool) -> None:
+    """Record a PokeAPI cache lookup.
+
+    Args:
+        endpoint: The API endpoint looked up.
+        hit: Whether the response was served from cache.
+    """
+    if hit:
+        pokeapi_cache_hits_total.labels(endpoint=endpoint).inc()
+    else:
+        pokeapi_cache_misses_total.labels(endpoint=endpoint).inc()
+
+
+def record_cache_eviction(backend: str, reason: str) -> None:
+    """Record a PokeAPI cache eviction.
+
+    Args:
+        backend: The cache backend.
+        reason: Why the entry was evicted (lru/expired).
+    """
+    pokeapi_cache_evictions_total.labels(backend=backend, reason=reason).inc()
+
+
+def record_cache_size(
+    backend: str, size_bytes: int, entries: int, shared: bool = False
+) -> None:
+    """Record the current PokeAPI cache footprint.
+
+    Args:
+        backend: The cache backend.
+        size_bytes: Bytes held by the cache.
+        entries: Number of cached entries.
+        shared: Whether every worker sees the same cache (e.g. one SQLite file).
+    """
+    if shared:
+        pokeapi_cache_shared_size_bytes.labels(backend=backend).set(size_bytes)
+        pokeapi_cache_shared_entries.labels(backend=backend).set(entries)
+    else:
+        pokeapi_cache_size_bytes.labels(backend=backend).set(size_bytes)
+        pokeapi_cache_entries.labels(backend=backend).set(entries)
+
+
+def record_snapshot_lookup(endpoint: str, found: bool) -> None:
+    """Record an offline snapshot lookup.
+
+    Args:
+        endpoint: The API endpoint looked up.
+        found: Whether the snapshot held the resource.
+    """
+    pokeapi_snapshot_lookups_total.labels(
+        endpoint=endpoint, result="hit" if found else "miss"
+    ).inc()
+
+
+def record_log_dropped(reason: str) -> None:
+    """Record a log event dropped by sampling or a full log queue.
+
+    Args:
+        reason: Why the event was dropped (sampled, queue_full, ...).
+    """
+    log_events_dropped_total.labels(reason=reason).inc()
+
+
+def multiprocess_enabled() -> bool:
+    """Whether metrics are shared between worker processes."""
+    return bool(os.environ.get("PROMETHEUS_MULTIPROC_DIR"))
+
+
+def check_metrics_config() -> None:
+    """Warn at startup if multiprocess metrics are configured too late.
+
+    ``prometheus_client`` reads ``PROMETHEUS_MULTIPROC_DIR`` from the
+    environment at import, so setting it only in ``.env`` has no effect.
+    """
+    if settings.prometheus_multiproc_dir and not multiprocess_enabled():
+        logger.warning(
+            "prometheus_multiproc_dir_not_in_environment",
+            detail="set PROMETHEUS_MULTIPROC_DIR before the server starts",
+        )
+
+
+def generate_metrics() -> bytes:
+    """Render metrics in the Prometheus text format.
+
+    In multiprocess mode the scrape aggregates every worker's metrics files;
+    ``server_info`` is process-local but identical across workers, so it is
+    taken from the worker serving the scrape.
+
+    Returns:
+        The exposition payload.
+    """
+    if not multiprocess_enabled():
+        return generate_latest()
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(server_info)
+    return generate_latest(registry)
+
+
+def close_metrics() -> None:
+    """Remove this worker's live gauge files in multiprocess mode."""
+    if multiprocess_enabled():
+        multiprocess.mark_process_dead(os.getpid())
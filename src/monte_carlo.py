@@ -0,0 +1,213 @@
+"""Vectorized Monte Carlo battle simulation.
+
+Runs many independent battles for one matchup at once with NumPy, one array
+lane per battle. Each turn follows the same rules as ``simulate_battle``:
+damage comes from ``calculate_damage``, status chances from
+``get_move_status`` and the status constants, and end-of-turn damage from
+``STATUS_DAMAGE_DIVISORS``.
+"""
+from typing import Any, Dict, Optional
+import math
+from src.battle_utils import calculate_damage, get_move_status
+from src.constants import (
+    PARALYSIS_SKIP_CHANCE,
+    STATUS_BURN,
+    STATUS_DAMAGE_DIVISORS,
+    STATUS_EFFECTS,
+    STATUS_INFLICT_CHANCE,
+    STATUS_PARALYSIS,
+    STATUS_POISON,
+)
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+# Integer status codes used in the lane arrays; 0 means no status
+STATUS_CODES = {status: code for code, status in enumerate(STATUS_EFFECTS, start=1)}
+_PARALYSIS = STATUS_CODES[STATUS_PARALYSIS]
+_BURN = STATUS_CODES[STATUS_BURN]
+_POISON = STATUS_CODES[STATUS_POISON]
+
+# z-score for the two-sided 95% confidence interval
+_Z_95 = 1.959963984540054
+
+
+def require_numpy() -> None:
+    """Raise a helpful error if NumPy is not installed."""
+    if np is None:
+        raise RuntimeError(
+            "Monte Carlo simulation requires NumPy; "
+            "install it with: pip install 'poke-mcp-production[analytics]'"
+        )
+
+
+def wilson_interval(successes: int, trials: int, z: float = _Z_95) -> Dict[str, float]:
+    """Wilson score interval for a binomial proportion.
+
+    Args:
+        successes: Number of successes.
+        trials: Number of trials.
+        z: z-score of the confidence level.
+
+    Returns:
+        Dictionary with ``low`` and ``high`` bounds.
+    """
+    if trials == 0:
+        return {"low": 0.0, "high": 1.0}
+    p = successes / trials
+    denominator = 1 + z**2 / trials
+    centre = (p + z**2 / (2 * trials)) / denominator
+    margin = z * math.sqrt(p * (1 - p) / trials + z**2 / (4 * trials**2)) / denominator
+    return {"low": max(0.0, centre - margin), "high": min(1.0, centre + margin)}
+
+
+def _attack(
+    rng: Any,
+    active: Any,
+    attacker_status: Any,
+    defender_hp: Any,
+    defender_status: Any,
+    damage: Any,
+    inflicts: int,
+    inflicted: Any,
+) -> None:
+    """Resolve one attack in every active lane, updating arrays in place."""
+    n = active.shape[0]
+    paralyzed = (attacker_status == _PARALYSIS) & (rng.random(n) < PARALYSIS_SKIP_CHANCE)
+    hits = active & ~paralyzed
+    defender_hp -= np.where(hits, np.where(attacker_status == _BURN, damage[1], damage[0]), 0)
+    if inflicts:
+        newly = hits & (defender_status == 0) & (rng.random(n) < STATUS_INFLICT_CHANCE)
+        defender_status[newly] = inflicts
+        inflicted |= newly
+
+    for code, status in ((_BURN, STATUS_BURN), (_POISON, STATUS_POISON)):
+        affected = active & (defender_status == code)
+        tick = np.maximum(1, defender_hp // STATUS_DAMAGE_DIVISORS[status])
+        defender_hp -= np.where(affected, tick, 0)
+
+
+def run_monte_carlo(
+    poke1: Dict[str, Any],
+    poke2: Dict[str, Any],
+    simulations: int,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Simulate many battles between two Pokémon.
+
+    Args:
+        poke1: First Pokémon, as returned by ``fetch_pokemon_full_data``.
+        poke2: Second Pokémon, as returned by ``fetch_pokemon_full_data``.
+        simulations: Number of battles to run.
+        seed: Seed for the random generator, for reproducible results.
+
+    Returns:
+        Win probabilities with a 95% confidence interval, the turn-count
+        distribution and how often each status was inflicted.
+    """
+    require_numpy()
+    rng = np.random.default_rng(seed)
+    n = simulations
+
+    speed1 = poke1["base_stats"].get("speed", 50)
+    speed2 = poke2["base_stats"].get("speed", 50)
+    poke1_first = speed1 >= speed2
+    first, second = (poke1, poke2) if poke1_first else (poke2, poke1)
+
+    # Damage only depends on whether the attacker is burned, so precompute it
+    first_damage = (
+        calculate_damage(first, second, None),
+        calculate_damage(first, second, STATUS_BURN),
+    )
+    second_damage = (
+        calculate_damage(second, first, None),
+        calculate_damage(second, first, STATUS_BURN),
+    )
+    first_inflicts = STATUS_CODES.get(get_move_status(first["move"]), 0)
+    second_inflicts = STATUS_CODES.get(get_move_status(second["move"]), 0)
+
+    first_hp = np.full(n, first["base_stats"].get("hp", 100), dtype=np.int64)
+    second_hp = np.full(n, second["base_stats"].get("hp", 100), dtype=np.int64)
+    first_status = np.zeros(n, dtype=np.int8)
+    second_status = np.zeros(n, dtype=np.int8)
+    first_inflicted = np.zeros(n, dtype=bool)
+    second_inflicted = np.zeros(n, dtype=bool)
+    first_wins = np.zeros(n, dtype=bool)
+    turns = np.zeros(n, dtype=np.int64)
+    active = np.ones(n, dtype=bool)
+
+    turn = 1
+    while active.any():
+        _attack(
+            rng,
+            active,
+            first_status,
+            second_hp,
+            second_status,
+            first_damage,
+            first_inflicts,
+            second_inflicted,
+        )
+        fainted = active & (second_hp <= 0)
+        first_wins |= fainted
+        turns[fainted] = turn
+        active &= ~fainted
+
+        _attack(
+            rng,
+            active,
+            second_status,
+            first_hp,
+            first_status,
+            second_damage,
+            second_inflicts,
+            first_inflicted,
+        )
+        fainted = active & (first_hp <= 0)
+        turns[fainted] = turn
+        active &= ~fainted
+        turn += 1
+
+    poke1_wins = int(first_wins.sum()) if poke1_first else int(n - first_wins.sum())
+    poke1_inflicted, poke2_inflicted = (
+        (first_inflicted, second_inflicted) if poke1_first else (second_inflicted, first_inflicted)
+    )
+    turn_values, turn_counts = np.unique(turns, return_counts=True)
+
+    return {
+        "simulations": n,
+        "seed": seed,
+        "pokemon1": poke1["name"],
+        "pokemon2": poke2["name"],
+        "win_probability": {
+            "pokemon1": poke1_wins / n,
+            "pokemon2": (n - poke1_wins) / n,
+        },
+        "confidence_interval_95": {
+            "pokemon1": wilson_interval(poke1_wins, n),
+            "pokemon2": wilson_interval(n - poke1_wins, n),
+        },
+        "turns": {
+            "mean": float(turns.mean()),
+            "min": int(turns.min()),
+            "p50": float(np.percentile(turns, 50)),
+            "p90": float(np.percentile(turns, 90)),
+            "max": int(turns.max()),
+            "distribution": {
+                int(value): int(count) for value, count in zip(turn_values, turn_counts)
+            },
+        },
+        # A Pokémon can only be inflicted with the status of its opponent's move
+        "status_inflicted": {
+            "pokemon1": _status_rate(poke2["move"], poke1_inflicted),
+            "pokemon2": _status_rate(poke1["move"], poke2_inflicted),
+        },
+    }
+
+
+def _status_rate(opponent_move: Dict[str, Any], inflicted: Any) -> Dict[str, float]:
+    """Fraction of battles in which the opponent's move status was inflicted."""
+    status = get_move_status(opponent_move)
+    return {status: float(inflicted.mean())} if status else {}
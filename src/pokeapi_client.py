@@ -1,11 +1,351 @@
 """Module for fetching Pokémon data from the PokéAPI."""
-from typing import Any, Dict, Optional
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, TypeVar
+import asyncio
+import hashlib
+import importlib.util
+import json
 import httpx
-from src.constants import POKEAPI_BASE_URL
+from src.cache import get_cache
+from src.config import settings
+from src.entities import (
+    DECODERS,
+    PARSERS,
+    Entity,
+    EvolutionChain,
+    build_evolution_chain,
+    get_entity_store,
+    single_species_chain,
+)
 from src.logger import get_logger
+from src.monitoring import (
+    record_cache_lookup,
+    record_pokeapi_coalesced,
+    record_pokeapi_request,
+    record_snapshot_lookup,
+)
+from src.snapshot import get_snapshot
+from src.tracing import span
 
 logger = get_logger(__name__)
 
+T = TypeVar("T")
+
+
+class _Flight:
+    """An upstream request shared by every caller waiting on the same key."""
+
+    __slots__ = ("task", "waiters")
+
+    def __init__(self, task: "asyncio.Future[Any]"):
+        self.task = task
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Coalesce concurrent calls for the same key into one execution.
+
+    The shared call runs in its own task, so a cancelled caller never cancels
+    the call for the others; it is only cancelled once every waiter is gone.
+    """
+
+    def __init__(self) -> None:
+        self._flights: Dict[str, _Flight] = {}
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def do(self, key: str, endpoint: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` for ``key``, or join the call already in flight.
+
+        Args:
+            key: Deduplication key (the upstream URL).
+            endpoint: Resource type used as the metrics label.
+            fn: Factory for the awaitable performing the call.
+
+        Returns:
+            The shared result of ``fn``.
+        """
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(asyncio.ensure_future(fn()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda task: self._finish(key, flight))
+        else:
+            record_pokeapi_coalesced(endpoint)
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                # Unregister first, so a caller arriving while the task
+                # unwinds starts a fresh call instead of joining a cancelled one
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+                flight.task.cancel()
+
+    def _finish(self, key: str, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
+        # Mark the outcome as retrieved even if every waiter has gone away
+        if not flight.task.cancelled():
+            flight.task.exception()
+
+
+# Process-wide HTTP client shared by every tool call
+_http_client: Optional[httpx.AsyncClient] = None
+
+# Upstream requests currently in flight, keyed by URL
+_inflight = SingleFlight()
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """Create a pooled HTTP client configured from settings.
+
+    Returns:
+        A new keep-alive ``httpx.AsyncClient``.
+    """
+    http2 = settings.pokeapi_http2
+    if http2 and importlib.util.find_spec("h2") is None:
+        logger.warning("http2_unavailable", reason="h2 package not installed")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.pokeapi_max_connections,
+        max_keepalive_connections=settings.pokeapi_max_keepalive_connections,
+        keepalive_expiry=settings.pokeapi_keepalive_expiry,
+    )
+    logger.info(
+        "http_client_created",
+        http2=http2,
+        max_connections=settings.pokeapi_max_connections,
+        max_keepalive_connections=settings.pokeapi_max_keepalive_connections,
+    )
+    return httpx.AsyncClient(timeout=settings.pokeapi_timeout, limits=limits, http2=http2)
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Get the shared HTTP client, creating it on first use.
+
+    Returns:
+        The process-wide ``httpx.AsyncClient``.
+    """
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = create_http_client()
+    return _http_client
+
+
+def set_http_client(client: Optional[httpx.AsyncClient]) -> None:
+    """Inject the shared HTTP client (e.g. one owned by a benchmark harness).
+
+    Args:
+        client: The client to share, or None to reset.
+    """
+    global _http_client
+    _http_client = client
+
+
+async def close_http_client() -> None:
+    """Close the shared HTTP client and release pooled connections."""
+    global _http_client
+    client, _http_client = _http_client, None
+    if client is not None and not client.is_closed:
+        await client.aclose()
+        logger.info("http_client_closed")
+
+
+async def gather_limited(limit: int, *aws: Awaitable[Any]) -> List[Any]:
+    """Run awaitables concurrently with at most ``limit`` in flight.
+
+    Results keep the order of ``aws``. If any awaitable raises, the rest are
+    cancelled and the first exception propagates, as with sequential awaits.
+
+    Args:
+        limit: Maximum number of awaitables running at once.
+        *aws: The awaitables to run.
+
+    Returns:
+        List of results in input order.
+    """
+    semaphore = asyncio.Semaphore(max(1, limit))
+
+    async def run(aw: Awaitable[Any]) -> Any:
+        async with semaphore:
+            return await aw
+
+    tasks = [asyncio.ensure_future(run(aw)) for aw in aws]
+    try:
+        return await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+
+
+async def fetch_json(
+    client: httpx.AsyncClient,
+    url: str,
+    endpoint: str,
+    decode: Callable[[bytes], Any] = json.loads,
+) -> Any:
+    """GET a PokeAPI resource through the response cache and decode its JSON body.
+
+    In ``snapshot`` and ``hybrid`` modes the offline snapshot is consulted
+    first; a snapshot miss is a 404 in ``snapshot`` mode and falls through to
+    PokeAPI in ``hybrid`` mode. Concurrent calls for the same URL share a
+    single upstream request.
+
+    Args:
+        client: The HTTP client to use.
+        url: Absolute resource URL.
+        endpoint: Resource type used as the metrics label.
+        decode: Decoder of the body, e.g. one extracting only some members.
+
+    Returns:
+        The decoded JSON document.
+
+    Raises:
+        httpx.HTTPStatusError: If PokeAPI answers with an error status.
+        httpx.RequestError: If the request fails.
+    """
+    with span("pokeapi.fetch", endpoint=endpoint, url=url) as fetch_span:
+        body = await _lookup_local(url, endpoint)
+        if body is not None:
+            fetch_span.set("source", "local")
+        else:
+            fetch_span.set("source", "upstream")
+            body = await _inflight.do(url, endpoint, lambda: _fetch_body(client, url, endpoint))
+        with span("json.decode", bytes=len(body)):
+            return decode(body)
+
+
+def not_found_error(url: str, message: str) -> httpx.HTTPStatusError:
+    """Build the 404 error PokeAPI would raise for a resource we know is missing."""
+    request = httpx.Request("GET", url)
+    return httpx.HTTPStatusError(
+        message, request=request, response=httpx.Response(404, request=request)
+    )
+
+
+async def _lookup_local(url: str, endpoint: str) -> Optional[bytes]:
+    """Look a resource up in the offline snapshot and the response cache.
+
+    Raises:
+        httpx.HTTPStatusError: On a snapshot miss in ``snapshot`` mode.
+    """
+    if settings.pokeapi_mode != "live":
+        with span("snapshot.lookup") as lookup_span:
+            snapshot = get_snapshot()
+            body = snapshot.get_url(url) if snapshot is not None else None
+            lookup_span.set("hit", body is not None)
+        record_snapshot_lookup(endpoint, body is not None)
+        if body is not None:
+            return body
+        if settings.pokeapi_mode == "snapshot":
+            raise not_found_error(url, f"Resource not found in snapshot: {url}")
+
+    cache = get_cache()
+    if cache is None:
+        return None
+    with span("cache.lookup") as lookup_span:
+        body = await cache.aget(url)
+        lookup_span.set("hit", body is not None)
+    record_cache_lookup(endpoint, body is not None)
+    return body
+
+
+async def _fetch_body(client: httpx.AsyncClient, url: str, endpoint: str) -> bytes:
+    """GET a resource from PokeAPI and store its body in the response cache."""
+    with span("pokeapi.get", endpoint=endpoint, url=url) as get_span:
+        response = await client.get(url)
+        get_span.set("status_code", response.status_code)
+        get_span.set("bytes", len(response.content))
+    record_pokeapi_request(endpoint, response.status_code)
+    response.raise_for_status()
+    cache = get_cache()
+    if cache is not None:
+        with span("cache.store"):
+            cache.set(url, response.content, settings.cache_ttl_for(endpoint))
+    return response.content
+
+
+async def fetch_entity(client: httpx.AsyncClient, url: str, endpoint: str) -> Entity:
+    """Fetch a PokeAPI resource parsed into its entity, parsing each URL once.
+
+    Args:
+        client: The HTTP client to use.
+        url: Absolute resource URL.
+        endpoint: Resource type, one of ``src.entities.PARSERS``.
+
+    Returns:
+        The entity, shared with every other caller while it stays in the store.
+
+    Raises:
+        httpx.HTTPStatusError: If PokeAPI answers with an error status.
+        httpx.RequestError: If the request fails.
+    """
+    store = get_entity_store()
+    if store is not None:
+        with span("entity.lookup", endpoint=endpoint) as lookup_span:
+            entity = store.get(url)
+            lookup_span.set("hit", entity is not None)
+        if entity is not None:
+            return entity
+    data = await fetch_json(client, url, endpoint, DECODERS.get(endpoint, json.loads))
+    with span("entity.parse", endpoint=endpoint):
+        entity = PARSERS[endpoint](data)
+    if store is not None:
+        entity = store.put(url, endpoint, entity)
+    return entity
+
+
+def lookup_evolution_family(species_url: str) -> Optional[EvolutionChain]:
+    """Return the stored evolution chain of a species, without fetching anything.
+
+    Args:
+        species_url: URL of the species.
+
+    Returns:
+        The chain, or None until a chain listing the species has been fetched.
+    """
+    store = get_entity_store()
+    if store is None:
+        return None
+    with span("entity.family") as family_span:
+        chain = store.family(species_url)
+        family_span.set("hit", chain is not None)
+    return chain
+
+
+async def fetch_evolution_family(client: httpx.AsyncClient, species_url: str) -> EvolutionChain:
+    """Fetch the evolution chain of a species.
+
+    Once any member of a family has been fetched, the chain of every other
+    member comes from the entity store with no upstream request; otherwise
+    the species and then its chain are fetched.
+
+    Args:
+        client: The HTTP client to use.
+        species_url: URL of the species.
+
+    Returns:
+        The species' family, or the species alone if it has no chain.
+
+    Raises:
+        httpx.HTTPStatusError: If PokeAPI answers with an error status.
+        httpx.RequestError: If the request fails.
+    """
+    chain = lookup_evolution_family(species_url)
+    if chain is not None:
+        return chain
+    species = await fetch_entity(client, species_url, "species")
+    if species.evolution_chain_url is None:
+        return single_species_chain(species)
+    return await fetch_entity(client, species.evolution_chain_url, "evolution-chain")
+
 
 async def fetch_pokemon_full_data(
     client: httpx.AsyncClient, pokemon_name: str
@@ -20,59 +360,258 @@ async def fetch_pokemon_full_data(
         Dictionary of Pokémon data, or None if not found.
     """
     try:
-        pokemon_url = f"{POKEAPI_BASE_URL}/pokemon/{pokemon_name.lower()}"
+        pokemon_url = f"{settings.pokeapi_base_url}/pokemon/{pokemon_name.lower()}"
         logger.info("fetching_pokemon_data", pokemon=pokemon_name, url=pokemon_url)
         
-        resp = await client.get(pokemon_url)
-        if resp.status_code != 200:
+        try:
+            pokemon = await fetch_entity(client, pokemon_url, "pokemon")
+        except httpx.HTTPStatusError as e:
             logger.warning(
                 "pokemon_not_found",
                 pokemon=pokemon_name,
-                status_code=resp.status_code,
+                status_code=e.response.status_code,
             )
             return None
-            
-        data = resp.json()
-        base_stats = {stat["stat"]["name"]: stat["base_stat"] for stat in data["stats"]}
-        types = [t["type"]["name"] for t in data["types"]]
-        moves = data["moves"]
-        
-        if not moves:
+
+        if not pokemon.moves:
             logger.warning("no_moves_found", pokemon=pokemon_name)
             return None
             
         # Use the first move for simplicity
-        move_url = moves[0]["move"]["url"]
-        move_resp = await client.get(move_url)
-        if move_resp.status_code != 200:
+        try:
+            move = await fetch_entity(client, pokemon.moves[0].url, "move")
+        except httpx.HTTPStatusError:
             logger.warning("move_fetch_failed", pokemon=pokemon_name)
             return None
-            
-        move_data = move_resp.json()
-        move_power = move_data.get("power", 50)
-        move_type = move_data.get("type", {}).get("name", "normal")
-        move_name = move_data.get("name", "tackle")
-        move_effect = next(
-            (
-                e["effect"]
-                for e in move_data.get("effect_entries", [])
-                if e["language"]["name"] == "en"
-            ),
-            None,
-        )
-        
+
         logger.info("pokemon_data_fetched", pokemon=pokemon_name)
         return {
-            "name": data["name"],
-            "base_stats": base_stats,
-            "types": types,
+            "id": pokemon.id,
+            "name": pokemon.name,
+            "base_stats": pokemon.base_stats,
+            "types": list(pokemon.types),
             "move": {
-                "name": move_name,
-                "power": move_power,
-                "type": move_type,
-                "effect": move_effect,
+                "name": move.name,
+                "power": move.power,
+                "type": move.type,
+                "effect": move.effect,
             },
         }
     except Exception as e:
         logger.error("pokemon_fetch_error", pokemon=pokemon_name, error=str(e))
         return None
+
+
+# One query for everything get_pokemon_info returns, against PokeAPI's
+# Hasura-generated GraphQL schema; sections are switched on by variables so the
+# query text, and with it the cache key, only varies with the request. Moves
+# come back whole and are paged locally: REST lists them in the order of their
+# first pokemon_v2_pokemonmoves row, which distinct_on (ordered by move_id)
+# cannot page by, and every page of a Pokémon then shares one cached response
+POKEMON_INFO_QUERY = """
+query PokemonInfo(
+  $names: [String!]!
+  $ids: [Int!]!
+  $withStats: Boolean!
+  $withTypes: Boolean!
+  $withAbilities: Boolean!
+  $withMoves: Boolean!
+  $withEvolution: Boolean!
+) {
+  pokemon: pokemon_v2_pokemon(where: {_or: [{name: {_in: $names}}, {id: {_in: $ids}}]}) {
+    id
+    name
+    stats: pokemon_v2_pokemonstats @include(if: $withStats) {
+      base_stat
+      stat: pokemon_v2_stat { name }
+    }
+    types: pokemon_v2_pokemontypes(order_by: {slot: asc}) @include(if: $withTypes) {
+      type: pokemon_v2_type { name }
+    }
+    abilities: pokemon_v2_pokemonabilities(order_by: {slot: asc}) @include(if: $withAbilities) {
+      ability: pokemon_v2_ability {
+        name
+        effects: pokemon_v2_abilityeffecttexts(
+          where: {pokemon_v2_language: {name: {_eq: "en"}}}
+        ) { effect }
+      }
+    }
+    move_order: pokemon_v2_pokemonmoves(order_by: {id: asc}) @include(if: $withMoves) {
+      move_id
+    }
+    moves: pokemon_v2_pokemonmoves(
+      distinct_on: move_id
+      order_by: {move_id: asc}
+    ) @include(if: $withMoves) {
+      move_id
+      move: pokemon_v2_move {
+        name
+        move_effect: pokemon_v2_moveeffect {
+          effects: pokemon_v2_moveeffecteffecttexts(
+            where: {pokemon_v2_language: {name: {_eq: "en"}}}
+          ) { effect }
+        }
+      }
+    }
+    species: pokemon_v2_pokemonspecy @include(if: $withEvolution) {
+      name
+      chain: pokemon_v2_evolutionchain {
+        species: pokemon_v2_pokemonspecies(order_by: {order: asc}) {
+          id
+          name
+          evolves_from_species_id
+        }
+      }
+    }
+  }
+}
+"""
+
+
+async def post_graphql(
+    client: httpx.AsyncClient, query: str, variables: Dict[str, Any]
+) -> Dict[str, Any]:
+    """POST a query to the PokeAPI GraphQL endpoint through the response cache.
+
+    Responses are cached under the endpoint URL and a hash of the query and
+    variables, and identical concurrent queries share a single request.
+
+    Args:
+        client: The HTTP client to use.
+        query: GraphQL query text.
+        variables: Values of the query's variables.
+
+    Returns:
+        The ``data`` member of the response.
+
+    Raises:
+        httpx.HTTPStatusError: If the endpoint answers with an error status.
+        httpx.RequestError: If the request fails.
+        ValueError: If the response reports GraphQL errors.
+    """
+    url = settings.pokeapi_graphql_url
+    payload = json.dumps({"query": query, "variables": variables}, sort_keys=True).encode()
+    key = f"{url}#{hashlib.sha256(payload).hexdigest()}"
+    with span("pokeapi.graphql", url=url) as graphql_span:
+        cache = get_cache()
+        body = None
+        if cache is not None:
+            with span("cache.lookup") as lookup_span:
+                body = await cache.aget(key)
+                lookup_span.set("hit", body is not None)
+            record_cache_lookup("graphql", body is not None)
+        graphql_span.set("source", "upstream" if body is None else "local")
+        cached = body is not None
+        if body is None:
+            body = await _inflight.do(key, "graphql", lambda: _post_body(client, url, payload))
+        with span("json.decode", bytes=len(body)):
+            document = json.loads(body)
+
+    errors = document.get("errors")
+    if errors:
+        raise ValueError(f"GraphQL error: {errors[0].get('message', errors[0])}")
+    if cache is not None and not cached:
+        with span("cache.store"):
+            cache.set(key, body, settings.cache_ttl_for("graphql"))
+    return document["data"]
+
+
+async def _post_body(client: httpx.AsyncClient, url: str, payload: bytes) -> bytes:
+    """POST a GraphQL request and return the response body."""
+    with span("pokeapi.post", endpoint="graphql", url=url) as post_span:
+        response = await client.post(
+            url, content=payload, headers={"Content-Type": "application/json"}
+        )
+        post_span.set("status_code", response.status_code)
+        post_span.set("bytes", len(response.content))
+    record_pokeapi_request("graphql", response.status_code)
+    response.raise_for_status()
+    return response.content
+
+
+def _english_effect(texts: List[Dict[str, Any]]) -> Optional[str]:
+    return texts[0]["effect"] if texts else None
+
+
+def _graphql_pokemon_info(
+    row: Dict[str, Any], fields: Set[str], moves_offset: int, moves_limit: int
+) -> Dict[str, Any]:
+    """Map one Pokémon of a ``PokemonInfo`` response onto the REST result shape."""
+    info: Dict[str, Any] = {"name": row["name"], "id": row["id"]}
+    if "stats" in fields:
+        info["base_stats"] = {stat["stat"]["name"]: stat["base_stat"] for stat in row["stats"]}
+    if "types" in fields:
+        info["types"] = [t["type"]["name"] for t in row["types"]]
+    if "abilities" in fields:
+        info["abilities"] = [
+            {"name": a["ability"]["name"], "effect": _english_effect(a["ability"]["effects"])}
+            for a in row["abilities"]
+        ]
+    if "moves" in fields:
+        # First appearance of each move, as in the REST document
+        order = list(dict.fromkeys(m["move_id"] for m in row["move_order"]))
+        moves = {m["move_id"]: m["move"] for m in row["moves"]}
+        info["moves"] = [
+            {
+                "name": moves[move_id]["name"],
+                "effect": _english_effect(
+                    (moves[move_id]["move_effect"] or {}).get("effects", [])
+                ),
+            }
+            for move_id in order[moves_offset : moves_offset + moves_limit]
+        ]
+        info["moves_total"] = len(order)
+    if "evolution" in fields:
+        species = row["species"]
+        chain = species["chain"]
+        members = (
+            [(m["id"], m["name"], m["evolves_from_species_id"]) for m in chain["species"]]
+            if chain
+            else [(0, species["name"], None)]
+        )
+        family = build_evolution_chain(0, members)
+        info["evolution_chain"] = list(family.names)
+        info["evolution_tree"] = family.tree
+    return info
+
+
+async def fetch_pokemon_info_graphql(
+    client: httpx.AsyncClient,
+    names: List[str],
+    fields: Set[str],
+    moves_limit: int,
+    moves_offset: int,
+) -> Dict[str, Dict[str, Any]]:
+    """Fetch ``get_pokemon_info`` results for several Pokémon in one GraphQL query.
+
+    Args:
+        client: The HTTP client to use.
+        names: Lower-case Pokémon names or ids.
+        fields: Sections to include, from ``POKEMON_INFO_FIELDS`` in server.py.
+        moves_limit: Number of moves to return per Pokémon.
+        moves_offset: Position of the first move returned.
+
+    Returns:
+        Results shaped as in REST mode, by name and by id; unknown names and
+        ids are absent.
+
+    Raises:
+        httpx.HTTPStatusError: If the endpoint answers with an error status.
+        httpx.RequestError: If the request fails.
+        ValueError: If the response reports GraphQL errors.
+    """
+    variables = {
+        "names": [name for name in names if not name.isdigit()],
+        "ids": [int(name) for name in names if name.isdigit()],
+        "withStats": "stats" in fields,
+        "withTypes": "types" in fields,
+        "withAbilities": "abilities" in fields,
+        "withMoves": "moves" in fields,
+        "withEvolution": "evolution" in fields,
+    }
+    data = await post_graphql(client, POKEMON_INFO_QUERY, variables)
+    found = {}
+    for row in data["pokemon"]:
+        info = _graphql_pokemon_info(row, fields, moves_offset, moves_limit)
+        found[row["name"]] = found[str(row["id"])] = info
+    return found
@@ -0,0 +1,302 @@
+"""Constant-time rate limiting.
+
+``SlidingWindowLimiter`` implements the sliding-window counter algorithm: each
+client keeps the request count of the current fixed window and of the
+previous one, and the rate is estimated by weighting the previous count by
+how much of it still overlaps the sliding window. Every check is O(1) no
+matter how many clients or requests are tracked.
+
+Client state lives in an ``OrderedDict`` kept in least-recently-seen order.
+Each check expires a bounded number of idle clients from the front, so
+expiry is amortized across requests instead of scanning the whole table, and
+the table never grows past ``max_clients``.
+
+Limits can be enforced per process (``MemoryRateLimitBackend``) or shared by
+all replicas through a Redis-protocol store (``RedisRateLimitBackend``).
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import List, Optional
+import math
+import time
+from src.config import settings
+from src.logger import get_logger
+from src.resp import RespClient
+
+logger = get_logger(__name__)
+
+# Idle clients expired per check; bounds the work any single request does
+EXPIRE_BATCH = 8
+
+
+class SlidingWindowLimiter:
+    """Per-client sliding-window counter rate limiter."""
+
+    def __init__(self, requests: int, window: float, max_clients: int = 100_000) -> None:
+        """Initialize the limiter.
+
+        Args:
+            requests: Maximum requests per client per window.
+            window: Window length in seconds.
+            max_clients: Maximum clients tracked; the least recently seen
+                client is forgotten when the table is full.
+        """
+        self.requests = requests
+        self.window = window
+        self.max_clients = max_clients
+        # client -> [window index, count in that window, count in the previous window]
+        self._clients: "OrderedDict[str, List[int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def hit(self, client: str, now: Optional[float] = None) -> bool:
+        """Record a request from a client if it is within the limit.
+
+        Args:
+            client: Client identifier, e.g. its IP address.
+            now: Current time in seconds; defaults to ``time.time()``.
+
+        Returns:
+            True if the request is allowed, False if it exceeds the limit.
+        """
+        now = time.time() if now is None else now
+        index = int(now // self.window)
+        clients = self._clients
+
+        state = clients.get(client)
+        if state is None:
+            if len(clients) >= self.max_clients:
+                clients.popitem(last=False)
+            state = clients[client] = [index, 0, 0]
+        else:
+            clients.move_to_end(client)
+            if state[0] != index:
+                # Roll the window; anything older than the previous window counts as zero
+                state[2] = state[1] if state[0] == index - 1 else 0
+                state[1] = 0
+                state[0] = index
+
+        elapsed = now / self.window - index
+        allowed = state[2] * (1.0 - elapsed) + state[1] < self.requests
+        if allowed:
+            state[1] += 1
+
+        self._expire(index)
+        return allowed
+
+    def _expire(self, index: int) -> None:
+        """Drop up to ``EXPIRE_BATCH`` least recently seen idle clients.
+
+        A client whose last window is older than the previous window has no
+        effect on limiting, so forgetting it is lossless.
+        """
+        clients = self._clients
+        for _ in range(EXPIRE_BATCH):
+            if not clients:
+                return
+            client, state = next(iter(clients.items()))
+            if state[0] >= index - 1:
+                return
+            del clients[client]
+
+
+class RateLimitBackend(ABC):
+    """Where rate-limit state lives."""
+
+    @abstractmethod
+    async def hit(self, client: str) -> bool:
+        """Record a request from a client if it is within the limit.
+
+        Args:
+            client: Client identifier, e.g. its IP address.
+
+        Returns:
+            True if the request is allowed.
+        """
+
+    async def close(self) -> None:
+        """Release backend resources."""
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    """Per-process limits; each replica enforces the limit on its own."""
+
+    def __init__(self, limiter: SlidingWindowLimiter) -> None:
+        self.limiter = limiter
+
+    async def hit(self, client: str) -> bool:
+        return self.limiter.hit(client)
+
+
+class RedisRateLimitBackend(RateLimitBackend):
+    """Limits shared across replicas through a Redis-protocol store.
+
+    Uses the same sliding-window counter as ``SlidingWindowLimiter`` with
+    per-window keys updated atomically on the server (``INCRBY`` plus
+    ``EXPIRE``, pipelined with a ``GET`` of the previous window). Instead of
+    one round trip per request, each replica leases a chunk of requests and
+    serves them from a local fast path:
+
+    - A lease takes at most ``lease_size`` requests and at most half of what
+      is left of the window's budget, so leases shrink as the budget runs
+      out and the last requests are spread over the replicas that ask.
+    - Requests a replica leased but did not serve are returned (``DECRBY``,
+      pipelined with its next lease) when the window ends, so they do not
+      count against the client in the next window's estimate.
+    - Denials are cached locally for the time one request's worth of quota
+      takes to free up.
+
+    Worst-case error per client and window, with ``R`` replicas and lease
+    size ``L``, on top of the sliding-window estimate itself:
+
+    - Over the limit: one request, from rounding a fractional remaining
+      budget up. Leases are carved out of the shared counter atomically, so
+      replicas never grant the same request twice.
+    - Under the limit: the unused leases other replicas hold, at most
+      ``(R - 1) * (L - 1)`` requests. They are returned when the window ends
+      if the holding replica sees the client again; otherwise they also count
+      in the next window's estimate, with the previous window's weight.
+
+    If the store is unreachable or fails, requests fall back to ``fallback`` (a
+    per-process limiter, so up to ``R`` times the limit across replicas) and
+    the store is retried after ``retry_interval``.
+    """
+
+    def __init__(
+        self,
+        client: RespClient,
+        requests: int,
+        window: float,
+        fallback: SlidingWindowLimiter,
+        lease_size: int = 10,
+        retry_interval: float = 5.0,
+        key_prefix: str = "ratelimit",
+    ) -> None:
+        self.client = client
+        self.requests = requests
+        self.window = window
+        self.fallback = fallback
+        self.lease_size = max(1, min(lease_size, requests))
+        self.retry_interval = retry_interval
+        self.key_prefix = key_prefix
+        # client -> [window index, leased requests left, deny-until timestamp]
+        self._leases: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._down_until = 0.0
+
+    async def hit(self, client: str) -> bool:
+        now = time.time()
+        index = int(now // self.window)
+        lease = self._leases.get(client)
+        if lease is not None and lease[0] == index:
+            if lease[1] > 0:
+                lease[1] -= 1
+                return True
+            if now < lease[2]:
+                return False
+        if now < self._down_until:
+            return self.fallback.hit(client, now)
+
+        # Unused requests of the previous window's lease go back with this lease
+        # (at most once: a failed round trip may still have applied it)
+        refund = 0
+        if lease is not None and lease[0] == index - 1:
+            refund, lease[1] = int(lease[1]), 0
+        try:
+            granted = await self._acquire(client, index, now, refund)
+        except Exception as e:
+            # Any client failure (unreachable, malformed reply, error reply) falls
+            # back to per-replica limiting rather than failing the request
+            logger.warning(
+                "rate_limit_backend_unavailable",
+                error=str(e) or type(e).__name__,
+                retry_in=self.retry_interval,
+            )
+            self._down_until = now + self.retry_interval
+            return self.fallback.hit(client, now)
+
+        lease = self._leases.get(client)
+        if lease is None or lease[0] != index:
+            if lease is None and len(self._leases) >= self.fallback.max_clients:
+                self._leases.popitem(last=False)
+            lease = self._leases[client] = [index, 0, 0.0]
+        self._leases.move_to_end(client)
+        self._expire(index)
+        if granted == 0:
+            lease[2] = now + self.window / self.requests
+            return False
+        lease[1] += granted - 1
+        return True
+
+    async def _acquire(self, client: str, index: int, now: float, refund: int = 0) -> int:
+        """Lease requests for the current window.
+
+        Args:
+            client: Client identifier.
+            index: Current window index.
+            now: Current time in seconds.
+            refund: Unused requests leased in the previous window, to return.
+
+        Returns:
+            Number of requests granted, possibly zero.
+        """
+        key = f"{self.key_prefix}:{client}:{index}"
+        previous_key = f"{self.key_prefix}:{client}:{index - 1}"
+        size = self.lease_size
+        commands = [("DECRBY", previous_key, refund)] if refund > 0 else []
+        commands += [
+            ("INCRBY", key, size),
+            ("EXPIRE", key, math.ceil(self.window * 2)),
+            ("GET", previous_key),
+        ]
+        total, _, previous = (await self.client.pipeline(*commands))[-3:]
+        weight = 1.0 - (now / self.window - index)
+        available = self.requests - int(previous or 0) * weight - (total - size)
+        granted = max(0, min(size, math.ceil(available / 2)))
+        if granted < size:
+            await self.client.execute("DECRBY", key, size - granted)
+        return granted
+
+    def _expire(self, index: int) -> None:
+        """Drop up to ``EXPIRE_BATCH`` leases from past windows.
+
+        Leases of the previous window with unused requests are kept, so the
+        client's next request can still return them.
+        """
+        leases = self._leases
+        for _ in range(EXPIRE_BATCH):
+            if not leases:
+                return
+            client, lease = next(iter(leases.items()))
+            if lease[0] >= index or (lease[0] == index - 1 and lease[1] > 0):
+                return
+            del leases[client]
+
+    async def close(self) -> None:
+        await self.client.close()
+
+
+def create_rate_limit_backend(
+    requests: int, window: float, max_clients: int = 100_000
+) -> RateLimitBackend:
+    """Create the backend selected by ``RATE_LIMIT_BACKEND``.
+
+    Args:
+        requests: Maximum requests per client per window.
+        window: Window length in seconds.
+        max_clients: Maximum clients tracked locally.
+
+    Returns:
+        The configured rate-limit backend.
+    """
+    limiter = SlidingWindowLimiter(requests, window, max_clients)
+    if settings.rate_limit_backend == "redis":
+        logger.info("rate_limit_backend", backend="redis", url=settings.rate_limit_redis_url)
+        return RedisRateLimitBackend(
+            RespClient(settings.rate_limit_redis_url, settings.rate_limit_redis_timeout),
+            requests,
+            window,
+            fallback=limiter,
+            lease_size=settings.rate_limit_lease_size,
+        )
+    return MemoryRateLimitBackend(limiter)
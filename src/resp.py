@@ -0,0 +1,150 @@
+"""Minimal asyncio client for the Redis serialization protocol (RESP2).
+
+Only what the rate limiter needs: one connection, pipelined commands and
+integer/bulk/simple/error replies. Works with Redis, Valkey, KeyDB or any
+RESP-compatible store, including ``scripts/redis_standin.py``.
+"""
+from typing import Any, List, Optional, Sequence, Union
+from urllib.parse import urlparse
+import asyncio
+
+Command = Sequence[Union[str, bytes, int]]
+
+
+class RespError(Exception):
+    """Error reply returned by the server."""
+
+
+def encode_command(command: Command) -> bytes:
+    """Encode a command as a RESP array of bulk strings."""
+    parts = [b"*%d\r\n" % len(command)]
+    for arg in command:
+        if isinstance(arg, str):
+            arg = arg.encode()
+        elif isinstance(arg, int):
+            arg = str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    """Read one RESP reply.
+
+    Returns:
+        ``int`` for integers, ``bytes`` (or None) for bulk strings, ``str``
+        for simple strings, a list for arrays, or a ``RespError`` instance
+        for error replies.
+    """
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        data = await reader.readexactly(length + 2)
+        return data[:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        return RespError(payload.decode())
+    if kind == b"*":
+        count = int(payload)
+        if count < 0:
+            return None
+        return [await read_reply(reader) for _ in range(count)]
+    raise ConnectionError(f"Malformed RESP reply: {line!r}")
+
+
+class RespClient:
+    """Single-connection RESP client with pipelining."""
+
+    def __init__(self, url: str, timeout: float = 0.1) -> None:
+        """Initialize the client; the connection opens lazily.
+
+        Args:
+            url: ``redis://[:password@]host[:port][/db]`` URL.
+            timeout: Seconds allowed for connecting and for each round trip.
+        """
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = parsed.password
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        """Open the connection and run its setup, all within ``timeout``.
+
+        A connection that fails any step is dropped, never left half set up.
+        """
+        try:
+            await asyncio.wait_for(self._open(), self.timeout)
+        except BaseException:
+            self._drop()
+            raise
+
+    async def _open(self) -> None:
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+        setup: List[Command] = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        if setup:
+            await self._roundtrip(setup)
+
+    async def _roundtrip(self, commands: Sequence[Command]) -> List[Any]:
+        assert self._reader is not None and self._writer is not None
+        self._writer.write(b"".join(encode_command(c) for c in commands))
+        await self._writer.drain()
+        replies = [await read_reply(self._reader) for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RespError):
+                raise reply
+        return replies
+
+    async def pipeline(self, *commands: Command) -> List[Any]:
+        """Send commands in one write and return their replies in order.
+
+        Raises:
+            RespError: If any command returned an error reply.
+            OSError, asyncio.TimeoutError: If the server is unreachable.
+
+        Any failure other than an error reply, including cancellation, drops the
+        connection (it may hold unread replies); the next call reopens it.
+        """
+        async with self._lock:
+            try:
+                if self._writer is None:
+                    await self._connect()
+                return await asyncio.wait_for(self._roundtrip(commands), self.timeout)
+            except RespError:
+                # Every reply was read, so the connection is still in sync
+                raise
+            except BaseException:
+                self._drop()
+                raise
+
+    async def execute(self, *command: Union[str, bytes, int]) -> Any:
+        """Send one command and return its reply."""
+        return (await self.pipeline(command))[0]
+
+    def _drop(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._reader = self._writer = None
+
+    async def close(self) -> None:
+        """Close the connection."""
+        writer = self._writer
+        self._drop()
+        if writer is not None:
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
@@ -0,0 +1,203 @@
+"""Offline PokeAPI snapshot format and memory-mapped reader.
+
+A snapshot is a single binary file::
+
+    header  magic (8s) | format version (u32) | key count (u32)
+            | index offset (u64) | index length (u64)
+    data    concatenated compact JSON documents
+    index   per key, sorted by utf-8 bytes:
+            key length (u16) | key (utf-8) | offset (u64) | length (u32)
+    slots   per key, in the same order: position of its index entry,
+            relative to the index offset (u32)
+
+Keys are ``<resource>/<id>`` and ``<resource>/<name>``; both point at the
+same document. The reader maps the file read-only and binary-searches the
+index through the fixed-width slot table in place, so worker processes
+serving from the same snapshot share all of it, index included, through the
+OS page cache, and opening a snapshot costs no per-process memory.
+"""
+from typing import Any, Dict, Iterable, Optional, Tuple
+import json
+import mmap
+import os
+import re
+import struct
+from src.config import settings
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+MAGIC = b"PKMNSNAP"
+FORMAT_VERSION = 2
+HEADER = struct.Struct("<8sIIQQ")
+INDEX_ENTRY = struct.Struct("<QI")
+KEY_LENGTH = struct.Struct("<H")
+SLOT = struct.Struct("<I")
+META_KEY = "__meta__"
+
+_URL_KEY = re.compile(r"/api/v2/([a-z-]+)/([^/?#]+)/?$")
+
+
+def url_to_key(url: str) -> Optional[str]:
+    """Map a PokeAPI resource URL to its snapshot key.
+
+    Args:
+        url: Absolute or relative ``.../api/v2/<resource>/<id>/`` URL.
+
+    Returns:
+        The ``<resource>/<id>`` key, or None if the URL is not a resource URL.
+    """
+    match = _URL_KEY.search(url)
+    if match is None:
+        return None
+    return f"{match.group(1)}/{match.group(2).lower()}"
+
+
+def write_snapshot(
+    path: str, documents: Iterable[Tuple[Iterable[str], bytes]], meta: Dict[str, Any]
+) -> int:
+    """Write a snapshot file.
+
+    The file is written to a temporary path and renamed into place, so
+    readers never observe a partially written snapshot.
+
+    Args:
+        path: Destination file.
+        documents: ``(keys, body)`` pairs; every key maps to ``body``.
+        meta: Dataset metadata stored under the ``__meta__`` key.
+
+    Returns:
+        Number of keys written.
+    """
+    tmp_path = f"{path}.tmp"
+    index: Dict[str, Tuple[int, int]] = {}
+    with open(tmp_path, "wb") as f:
+        f.write(b"\0" * HEADER.size)
+        offset = HEADER.size
+        for keys, body in [((META_KEY,), json.dumps(meta).encode()), *documents]:
+            f.write(body)
+            for key in keys:
+                index[key] = (offset, len(body))
+            offset += len(body)
+
+        index_offset = offset
+        slots = []
+        for encoded in sorted(key.encode() for key in index):
+            slots.append(f.tell() - index_offset)
+            f.write(KEY_LENGTH.pack(len(encoded)))
+            f.write(encoded)
+            f.write(INDEX_ENTRY.pack(*index[encoded.decode()]))
+        f.write(b"".join(SLOT.pack(slot) for slot in slots))
+        index_length = f.tell() - index_offset
+
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(index), index_offset, index_length))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(index)
+
+
+class Snapshot:
+    """Read-only, memory-mapped view of a snapshot file."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, index_offset, index_length = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a PokeAPI snapshot")
+        if version != FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported snapshot format version {version}; "
+                "rebuild it with scripts/build_snapshot.py"
+            )
+        if index_offset + index_length > len(self._mm) or count * SLOT.size > index_length:
+            raise ValueError("Snapshot index is truncated")
+
+        self._count = count
+        self._index_offset = index_offset
+        self._slots_offset = index_offset + index_length - count * SLOT.size
+        body = self.get(META_KEY)
+        self.meta: Dict[str, Any] = json.loads(body) if body else {}
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, key: str) -> bool:
+        return self._find(key) is not None
+
+    def _find(self, key: str) -> Optional[Tuple[int, int]]:
+        """Binary-search the index for ``key``'s document offset and length."""
+        mm = self._mm
+        target = key.encode()
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            (slot,) = SLOT.unpack_from(mm, self._slots_offset + middle * SLOT.size)
+            pos = self._index_offset + slot
+            (key_length,) = KEY_LENGTH.unpack_from(mm, pos)
+            pos += KEY_LENGTH.size
+            probe = mm[pos : pos + key_length]
+            if probe < target:
+                low = middle + 1
+            elif probe > target:
+                high = middle
+            else:
+                return INDEX_ENTRY.unpack_from(mm, pos + key_length)
+        return None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the JSON body stored under ``key``, or None."""
+        entry = self._find(key)
+        if entry is None:
+            return None
+        offset, length = entry
+        return self._mm[offset : offset + length]
+
+    def get_url(self, url: str) -> Optional[bytes]:
+        """Return the JSON body for a PokeAPI resource URL, or None."""
+        key = url_to_key(url)
+        return self.get(key) if key else None
+
+    def close(self) -> None:
+        """Unmap the snapshot file."""
+        self._mm.close()
+
+
+# Process-wide snapshot, opened on first use
+_snapshot: Optional[Snapshot] = None
+_snapshot_failed = False
+
+
+def get_snapshot() -> Optional[Snapshot]:
+    """Get the configured snapshot, opening it on first use.
+
+    Returns:
+        The snapshot, or None if it is missing or invalid.
+    """
+    global _snapshot, _snapshot_failed
+    if _snapshot is None and not _snapshot_failed:
+        try:
+            _snapshot = Snapshot(settings.pokeapi_snapshot_path)
+            logger.info(
+                "snapshot_opened",
+                path=settings.pokeapi_snapshot_path,
+                keys=len(_snapshot),
+                dataset_version=_snapshot.meta.get("dataset_version"),
+            )
+        except (OSError, ValueError) as e:
+            _snapshot_failed = True
+            logger.error(
+                "snapshot_unavailable", path=settings.pokeapi_snapshot_path, error=str(e)
+            )
+    return _snapshot
+
+
+def close_snapshot() -> None:
+    """Unmap the process-wide snapshot."""
+    global _snapshot, _snapshot_failed
+    snapshot, _snapshot, _snapshot_failed = _snapshot, None, False
+    if snapshot is not None:
+        snapshot.close()
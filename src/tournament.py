@@ -0,0 +1,208 @@
+"""Round-robin tournaments sharded across a process pool.
+
+Every pair of roster members fights ``battles`` Monte Carlo battles. Pairs
+are split into shards that run in worker processes, so throughput scales
+with cores instead of being capped by the GIL. Roster members travel to the
+workers as compact tuples rather than full PokeAPI documents.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import multiprocessing
+import os
+from src.config import settings
+from src.logger import get_logger
+from src.monte_carlo import require_numpy, run_monte_carlo
+
+logger = get_logger(__name__)
+
+# (name, hp, attack, defense, speed, types, move name, move power, move type, move effect)
+CompactPokemon = Tuple[str, int, int, int, int, Tuple[str, ...], str, Any, str, Optional[str]]
+# (index of first member, index of second member, wins of the first member)
+MatchupResult = Tuple[int, int, int]
+
+# Shards per worker; more shards give finer-grained partial standings
+SHARDS_PER_WORKER = 4
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_workers = 0
+
+
+def compact_pokemon(poke: Dict[str, Any]) -> CompactPokemon:
+    """Pack the battle-relevant fields of a Pokémon into a tuple.
+
+    Args:
+        poke: Pokémon data as returned by ``fetch_pokemon_full_data``.
+
+    Returns:
+        The compact tuple sent to worker processes.
+    """
+    stats = poke["base_stats"]
+    move = poke["move"]
+    return (
+        poke["name"],
+        stats.get("hp", 100),
+        stats.get("attack", 50),
+        stats.get("defense", 50),
+        stats.get("speed", 50),
+        tuple(poke["types"]),
+        move["name"],
+        move["power"],
+        move["type"],
+        move["effect"],
+    )
+
+
+def expand_pokemon(compact: CompactPokemon) -> Dict[str, Any]:
+    """Rebuild the dict shape the battle engine expects from a compact tuple."""
+    name, hp, attack, defense, speed, types, move_name, power, move_type, effect = compact
+    return {
+        "name": name,
+        "base_stats": {"hp": hp, "attack": attack, "defense": defense, "speed": speed},
+        "types": list(types),
+        "move": {"name": move_name, "power": power, "type": move_type, "effect": effect},
+    }
+
+
+def run_shard(
+    roster: Sequence[CompactPokemon],
+    pairs: Sequence[Tuple[int, int]],
+    battles: int,
+    seed: Optional[int],
+) -> List[MatchupResult]:
+    """Run every matchup in a shard. Executed in a worker process.
+
+    Args:
+        roster: Compact roster shared by all shards.
+        pairs: Index pairs into ``roster`` to fight.
+        battles: Battles per matchup.
+        seed: Tournament seed; each pair derives its own stream from it.
+
+    Returns:
+        ``(i, j, wins of i)`` per pair.
+    """
+    import numpy as np
+
+    expanded = {i: expand_pokemon(roster[i]) for pair in pairs for i in pair}
+    results = []
+    for i, j in pairs:
+        pair_seed = None
+        if seed is not None:
+            pair_seed = int(np.random.SeedSequence([seed, i, j]).generate_state(1)[0])
+        outcome = run_monte_carlo(expanded[i], expanded[j], battles, pair_seed)
+        results.append((i, j, round(outcome["win_probability"]["pokemon1"] * battles)))
+    return results
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """Get the shared worker pool, creating it on first use.
+
+    Workers are spawned rather than forked so they never inherit the event
+    loop or background threads of the server process.
+    """
+    global _pool, _pool_workers
+    if _pool is None:
+        _pool_workers = settings.tournament_workers or os.cpu_count() or 1
+        _pool = ProcessPoolExecutor(
+            max_workers=_pool_workers, mp_context=multiprocessing.get_context("spawn")
+        )
+        logger.info("process_pool_created", workers=_pool_workers)
+    return _pool
+
+
+def close_process_pool() -> None:
+    """Shut down the shared worker pool."""
+    global _pool
+    pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+        logger.info("process_pool_closed")
+
+
+def standings(
+    names: Sequence[str], results: Sequence[MatchupResult], battles: int
+) -> List[Dict[str, Any]]:
+    """Build a leaderboard ranked by win rate.
+
+    Args:
+        names: Roster names, indexed like the results.
+        results: Matchup results collected so far.
+        battles: Battles per matchup.
+
+    Returns:
+        Leaderboard rows, best first.
+    """
+    wins = [0] * len(names)
+    played = [0] * len(names)
+    for i, j, i_wins in results:
+        wins[i] += i_wins
+        wins[j] += battles - i_wins
+        played[i] += battles
+        played[j] += battles
+    rows = [
+        {
+            "name": name,
+            "wins": wins[k],
+            "losses": played[k] - wins[k],
+            "battles": played[k],
+            "win_rate": wins[k] / played[k] if played[k] else 0.0,
+        }
+        for k, name in enumerate(names)
+    ]
+    rows.sort(key=lambda row: (-row["win_rate"], row["name"]))
+    for rank, row in enumerate(rows, start=1):
+        row["rank"] = rank
+    return rows
+
+
+async def run_tournament(
+    roster: Sequence[Dict[str, Any]],
+    battles: int,
+    seed: Optional[int] = None,
+    on_progress: Optional[Callable[[int, int, List[Dict[str, Any]]], Awaitable[None]]] = None,
+) -> Dict[str, Any]:
+    """Run a round-robin tournament over a roster.
+
+    Args:
+        roster: Pokémon data as returned by ``fetch_pokemon_full_data``.
+        battles: Battles per matchup.
+        seed: Seed for reproducible results.
+        on_progress: Awaited with ``(matchups done, total, standings)`` as
+            each shard finishes.
+
+    Returns:
+        The final leaderboard and tournament statistics.
+    """
+    require_numpy()
+    compact = [compact_pokemon(poke) for poke in roster]
+    names = [poke[0] for poke in compact]
+    pairs = [(i, j) for i in range(len(compact)) for j in range(i + 1, len(compact))]
+
+    pool = get_process_pool()
+    shard_count = max(1, min(len(pairs), _pool_workers * SHARDS_PER_WORKER))
+    shards = [pairs[k::shard_count] for k in range(shard_count)]
+    loop = asyncio.get_running_loop()
+    futures = [
+        loop.run_in_executor(pool, run_shard, compact, shard, battles, seed)
+        for shard in shards
+        if shard
+    ]
+
+    results: List[MatchupResult] = []
+    try:
+        for future in asyncio.as_completed(futures):
+            results.extend(await future)
+            if on_progress is not None:
+                await on_progress(len(results), len(pairs), standings(names, results, battles))
+    except BaseException:
+        for future in futures:
+            future.cancel()
+        raise
+
+    return {
+        "roster": names,
+        "matchups": len(pairs),
+        "battles_per_matchup": battles,
+        "shards": len(futures),
+        "leaderboard": standings(names, results, battles),
+    }
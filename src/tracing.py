@@ -0,0 +1,365 @@
+"""Lightweight span tracing for tool calls and upstream fetches.
+
+A trace starts at an HTTP request (``RequestLoggingMiddleware``) or, on the
+stdio transport, at a tool call, and is sampled with probability
+``TRACE_SAMPLE_RATE``. Inside a sampled trace, ``span()`` records nested
+timed phases (PokeAPI fetches, cache lookups, battle simulation, ...); the
+current span is held in a context variable, so spans opened in concurrent
+tasks nest under the span that created them. Outside a sampled trace,
+``span()`` returns a shared no-op context manager and records nothing.
+
+Finished traces are handed to a background exporter thread that appends
+them to a JSON-lines file (``TRACE_EXPORTER=file``) or posts them to an
+OpenTelemetry collector as OTLP/HTTP JSON (``TRACE_EXPORTER=collector``).
+``scripts/trace_waterfall.py`` renders the file as a latency waterfall.
+"""
+from abc import ABC, abstractmethod
+import contextvars
+import functools
+import json
+import os
+import queue
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+import httpx
+import structlog
+from src.config import settings
+from src.logger import get_logger
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+_EXPORT_BATCH = 64
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "trace", "span_id", "parent_id", "name", "attributes", "start", "end", "status", "_token"
+    )
+
+    def __init__(
+        self, trace: "Trace", name: str, parent_id: Optional[str], attributes: Dict[str, Any]
+    ) -> None:
+        self.trace = trace
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.name = name
+        self.attributes = attributes
+        self.start = 0
+        self.end = 0
+        self.status = "ok"
+        self._token: Optional[contextvars.Token] = None
+
+    def set(self, key: str, value: Any) -> None:
+        """Set an attribute on the span."""
+        self.attributes[key] = value
+
+    def __enter__(self) -> "Span":
+        self.start = time.time_ns()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.end = time.time_ns()
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.status = "error"
+            self.attributes["error"] = f"{exc_type.__name__}: {exc}"
+        self.trace.spans.append(self)
+        if self.parent_id is None:
+            self.trace.finish()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serialize the span for the file exporter."""
+        return {
+            "trace_id": self.trace.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_ns": self.start,
+            "duration_ms": (self.end - self.start) / 1e6,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Trace:
+    """The spans recorded for one sampled request or tool call."""
+
+    __slots__ = ("trace_id", "spans", "_log_context")
+
+    def __init__(self) -> None:
+        self.trace_id = os.urandom(16).hex()
+        self.spans: List[Span] = []
+        # Link log lines emitted during the trace to it
+        self._log_context = structlog.contextvars.bind_contextvars(trace_id=self.trace_id)
+
+    def finish(self) -> None:
+        structlog.contextvars.reset_contextvars(**self._log_context)
+        exporter = get_span_exporter()
+        if exporter is not None:
+            exporter.export(self.spans)
+
+
+class _NoopSpan:
+    """Stand-in returned when the current request is not traced."""
+
+    __slots__ = ()
+
+    def set(self, key: str, value: Any) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+_current_span: contextvars.ContextVar[Optional[Span]] = contextvars.ContextVar(
+    "current_span", default=None
+)
+
+
+def current_span() -> Optional[Span]:
+    """Get the innermost active span, or None outside a sampled trace."""
+    return _current_span.get()
+
+
+def span(name: str, **attributes: Any) -> Any:
+    """Open a child span of the current span.
+
+    Args:
+        name: Operation name, e.g. ``pokeapi.get``.
+        **attributes: Initial span attributes.
+
+    Returns:
+        A context manager yielding the span, or a no-op stand-in when the
+        current request is not traced.
+    """
+    parent = _current_span.get()
+    if parent is None:
+        return NOOP_SPAN
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def start_trace(name: str, **attributes: Any) -> Any:
+    """Open a root span, sampled at ``TRACE_SAMPLE_RATE``.
+
+    Inside an active trace this opens a child span instead, so a tool call
+    made over HTTP nests under the request's span.
+
+    Args:
+        name: Operation name, e.g. ``tool.get_pokemon_info``.
+        **attributes: Initial span attributes.
+
+    Returns:
+        A context manager yielding the span, or a no-op stand-in when the
+        trace is not sampled.
+    """
+    parent = _current_span.get()
+    if parent is not None:
+        return Span(parent.trace, name, parent.span_id, attributes)
+    rate = settings.trace_sample_rate
+    if rate <= 0 or (rate < 1 and random.random() >= rate):
+        return NOOP_SPAN
+    request_id = structlog.contextvars.get_contextvars().get("request_id")
+    if request_id is not None:
+        attributes["request_id"] = request_id
+    return Span(Trace(), name, None, attributes)
+
+
+def traced(name: str) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """Decorate a coroutine function to run inside ``start_trace(name)``."""
+
+    def decorator(fn: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(fn)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            with start_trace(name):
+                return await fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+class SpanExporter(ABC):
+    """Background thread exporting finished traces in batches."""
+
+    def __init__(self, maxsize: int = 1000) -> None:
+        self.queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize)
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: List[Span]) -> None:
+        """Queue a finished trace; drop it if the exporter is backed up."""
+        try:
+            self.queue.put_nowait(spans)
+        except queue.Full:
+            logger.warning("trace_dropped", reason="queue_full")
+
+    def _run(self) -> None:
+        while True:
+            batch = [self.queue.get()]
+            while len(batch) < _EXPORT_BATCH:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            traces = [spans for spans in batch if spans is not None]
+            if traces:
+                try:
+                    self.write(traces)
+                except Exception as e:
+                    logger.warning("trace_export_failed", error=str(e))
+            if len(traces) < len(batch):
+                return
+
+    @abstractmethod
+    def write(self, traces: List[List[Span]]) -> None:
+        """Write a batch of traces; runs on the exporter thread."""
+
+    def close(self, timeout: float = 5.0) -> None:
+        """Flush queued traces and stop the thread."""
+        if self._thread.is_alive():
+            try:
+                self.queue.put(None, timeout=timeout)
+            except queue.Full:
+                return
+            self._thread.join(timeout)
+
+
+class FileSpanExporter(SpanExporter):
+    """Append spans as JSON lines, one span per line."""
+
+    def __init__(self, path: str) -> None:
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        super().__init__()
+
+    def write(self, traces: List[List[Span]]) -> None:
+        lines = [json.dumps(s.to_dict(), default=str) for spans in traces for s in spans]
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class CollectorSpanExporter(SpanExporter):
+    """Post spans to an OpenTelemetry collector as OTLP/HTTP JSON."""
+
+    def __init__(self, url: str, timeout: float = 5.0) -> None:
+        self.url = url
+        self.client = httpx.Client(timeout=timeout)
+        super().__init__()
+
+    def write(self, traces: List[List[Span]]) -> None:
+        spans = [
+            {
+                "traceId": s.trace.trace_id,
+                "spanId": s.span_id,
+                "parentSpanId": s.parent_id or "",
+                "name": s.name,
+                "kind": 1,
+                "startTimeUnixNano": str(s.start),
+                "endTimeUnixNano": str(s.end),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in s.attributes.items()
+                ],
+                "status": {"code": 2 if s.status == "error" else 1},
+            }
+            for trace in traces
+            for s in trace
+        ]
+        payload = {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {"key": "service.name", "value": _otlp_value(settings.server_name)},
+                            {
+                                "key": "service.version",
+                                "value": _otlp_value(settings.server_version),
+                            },
+                        ]
+                    },
+                    "scopeSpans": [{"scope": {"name": "poke-mcp"}, "spans": spans}],
+                }
+            ]
+        }
+        self.client.post(self.url, json=payload).raise_for_status()
+
+    def close(self, timeout: float = 5.0) -> None:
+        super().close(timeout)
+        self.client.close()
+
+
+# Process-wide exporter, created when the first sampled trace finishes
+_exporter: Optional[SpanExporter] = None
+_exporter_failed = False
+_exporter_lock = threading.Lock()
+
+
+def create_span_exporter() -> Optional[SpanExporter]:
+    """Create the span exporter configured in settings.
+
+    Returns:
+        The exporter, or None for an unknown ``TRACE_EXPORTER``.
+    """
+    if settings.trace_exporter == "file":
+        logger.info("span_exporter_created", exporter="file", path=settings.trace_file)
+        return FileSpanExporter(settings.trace_file)
+    if settings.trace_exporter == "collector":
+        logger.info(
+            "span_exporter_created", exporter="collector", url=settings.trace_collector_url
+        )
+        return CollectorSpanExporter(settings.trace_collector_url)
+    logger.warning("unknown_trace_exporter", exporter=settings.trace_exporter)
+    return None
+
+
+def get_span_exporter() -> Optional[SpanExporter]:
+    """Get the shared span exporter, creating it on first use."""
+    global _exporter, _exporter_failed
+    if _exporter is None and not _exporter_failed:
+        with _exporter_lock:
+            if _exporter is None and not _exporter_failed:
+                _exporter = create_span_exporter()
+                _exporter_failed = _exporter is None
+    return _exporter
+
+
+def set_span_exporter(exporter: Optional[SpanExporter]) -> None:
+    """Inject the shared span exporter.
+
+    Args:
+        exporter: The exporter to share, or None to reset.
+    """
+    global _exporter
+    _exporter = exporter
+
+
+def close_tracing() -> None:
+    """Flush and stop the shared span exporter."""
+    global _exporter, _exporter_failed
+    exporter, _exporter = _exporter, None
+    _exporter_failed = False
+    if exporter is not None:
+        exporter.close()
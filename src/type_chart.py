@@ -0,0 +1,146 @@
+"""Precompiled type-effectiveness tables.
+
+``TYPE_EFFECTIVENESS`` in ``src.constants`` is compiled at import time into
+integer-indexed tables so batch workloads avoid nested dict lookups:
+
+- ``TYPE_MATRIX[attack * TYPE_SLOTS + defender]``: single-type multiplier.
+- ``DUAL_TYPE_TABLE[(attack * TYPE_SLOTS + type1) * TYPE_SLOTS + type2]``:
+  multiplier against a dual-typed (or, with ``NO_TYPE``, single-typed)
+  defender.
+
+Ids follow PokeAPI's type ids minus one. ``NO_TYPE`` stands for an absent
+second type and for any unknown type name, which are neutral (1.0) exactly
+as in the dict lookup.
+"""
+from typing import Any, Iterable, List, Sequence, Tuple
+import sys
+from src.constants import TYPE_EFFECTIVENESS
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+TYPE_NAMES: Tuple[str, ...] = tuple(
+    sys.intern(name)
+    for name in (
+        "normal", "fighting", "flying", "poison", "ground", "rock", "bug", "ghost", "steel",
+        "fire", "water", "grass", "electric", "psychic", "ice", "dragon", "dark", "fairy",
+    )
+)
+TYPE_IDS = {name: type_id for type_id, name in enumerate(TYPE_NAMES)}
+NO_TYPE = len(TYPE_NAMES)
+TYPE_SLOTS = NO_TYPE + 1
+
+
+def _compile_matrix() -> Tuple[float, ...]:
+    matrix = [1.0] * (TYPE_SLOTS * TYPE_SLOTS)
+    for attack, row in TYPE_EFFECTIVENESS.items():
+        for defender, multiplier in row.items():
+            matrix[TYPE_IDS[attack] * TYPE_SLOTS + TYPE_IDS[defender]] = multiplier
+    return tuple(matrix)
+
+
+def _compile_dual_table(matrix: Sequence[float]) -> Tuple[float, ...]:
+    table = []
+    for attack in range(TYPE_SLOTS):
+        row = matrix[attack * TYPE_SLOTS : (attack + 1) * TYPE_SLOTS]
+        for type1 in range(TYPE_SLOTS):
+            for type2 in range(TYPE_SLOTS):
+                # Same multiplication order as the dict lookup, so results match exactly
+                table.append(1.0 * row[type1] * row[type2])
+    return tuple(table)
+
+
+TYPE_MATRIX = _compile_matrix()
+DUAL_TYPE_TABLE = _compile_dual_table(TYPE_MATRIX)
+
+if np is not None:
+    TYPE_MATRIX_ARRAY = np.array(TYPE_MATRIX).reshape(TYPE_SLOTS, TYPE_SLOTS)
+    DUAL_TYPE_ARRAY = np.array(DUAL_TYPE_TABLE).reshape(TYPE_SLOTS, TYPE_SLOTS, TYPE_SLOTS)
+    TYPE_MATRIX_ARRAY.flags.writeable = False
+    DUAL_TYPE_ARRAY.flags.writeable = False
+
+
+def type_id(name: str) -> int:
+    """Get the integer id of a type name.
+
+    Args:
+        name: The type name.
+
+    Returns:
+        The type id, or ``NO_TYPE`` for unknown names.
+    """
+    return TYPE_IDS.get(name, NO_TYPE)
+
+
+def defender_type_ids(defender_types: Sequence[str]) -> Tuple[int, int]:
+    """Intern up to two defender types into a ``(type1, type2)`` id pair.
+
+    Args:
+        defender_types: The defender's type names.
+
+    Returns:
+        Pair of type ids, padded with ``NO_TYPE``.
+    """
+    ids = [TYPE_IDS.get(name, NO_TYPE) for name in defender_types[:2]]
+    ids.extend([NO_TYPE] * (2 - len(ids)))
+    return ids[0], ids[1]
+
+
+def lookup_multiplier(attack: int, type1: int, type2: int = NO_TYPE) -> float:
+    """Look up the multiplier for interned type ids.
+
+    Args:
+        attack: Attack type id.
+        type1: First defender type id.
+        type2: Second defender type id, or ``NO_TYPE``.
+
+    Returns:
+        The type multiplier.
+    """
+    return DUAL_TYPE_TABLE[(attack * TYPE_SLOTS + type1) * TYPE_SLOTS + type2]
+
+
+def type_multipliers(
+    attack_ids: Iterable[int], type1_ids: Iterable[int], type2_ids: Iterable[int]
+) -> Any:
+    """Score many attack/defender pairs at once.
+
+    Args:
+        attack_ids: Attack type ids.
+        type1_ids: First defender type ids.
+        type2_ids: Second defender type ids (``NO_TYPE`` for single-typed).
+
+    Returns:
+        A NumPy float array when NumPy is installed, otherwise a list.
+    """
+    if np is not None:
+        return DUAL_TYPE_ARRAY[
+            np.asarray(attack_ids, dtype=np.intp),
+            np.asarray(type1_ids, dtype=np.intp),
+            np.asarray(type2_ids, dtype=np.intp),
+        ]
+    table = DUAL_TYPE_TABLE
+    return [
+        table[(a * TYPE_SLOTS + t1) * TYPE_SLOTS + t2]
+        for a, t1, t2 in zip(attack_ids, type1_ids, type2_ids)
+    ]
+
+
+def score_matchups(pairs: Iterable[Tuple[str, Sequence[str]]]) -> List[float]:
+    """Score ``(attack_type, defender_types)`` pairs given by name.
+
+    Args:
+        pairs: Attack type name with the defender's type names.
+
+    Returns:
+        List of type multipliers, one per pair.
+    """
+    attack_ids, type1_ids, type2_ids = [], [], []
+    for attack, defender_types in pairs:
+        type1, type2 = defender_type_ids(defender_types)
+        attack_ids.append(TYPE_IDS.get(attack, NO_TYPE))
+        type1_ids.append(type1)
+        type2_ids.append(type2)
+    return [float(m) for m in type_multipliers(attack_ids, type1_ids, type2_ids)]
@@ -0,0 +1,53 @@
+"""Shared test configuration."""
+import os
+
+# Keep the suite quiet and off the background log writer; set before any
+# src module reads settings
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+os.environ.setdefault("LOG_ASYNC", "false")
+os.environ.setdefault("ENABLE_METRICS", "false")
+os.environ.setdefault("TRACE_SAMPLE_RATE", "0")
+
+# Imported after the defaults above so settings pick them up
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from pokeapi_stub import create_app  # noqa: E402
+from src.cache import close_cache  # noqa: E402
+from src.config import settings  # noqa: E402
+from src.entities import set_entity_store  # noqa: E402
+from src.pokeapi_client import set_http_client  # noqa: E402
+
+
+class _StubTransport(httpx.ASGITransport):
+    """Stub transport recording request paths and answering 404 for missing names."""
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        state = self.app.state
+        state.paths.append(request.url.path)
+        if request.url.path.rstrip("/").rsplit("/", 1)[-1] in state.missing:
+            return httpx.Response(404, json={"detail": "Not found"}, request=request)
+        return await super().handle_async_request(request)
+
+
+@pytest.fixture
+def stub(monkeypatch):
+    """Serve PokeAPI from the local stub, with fresh caches.
+
+    The stub app is returned; ``app.state.paths`` lists the paths requested,
+    and resources named in ``app.state.missing`` are answered with a 404.
+    """
+    app = create_app()
+    app.state.paths = []
+    app.state.missing = set()
+
+    monkeypatch.setattr(settings, "pokeapi_base_url", "http://stub/api/v2")
+    monkeypatch.setattr(settings, "pokeapi_graphql_url", "http://stub/graphql")
+    monkeypatch.setattr(settings, "cache_backend", "memory")
+    close_cache()
+    set_entity_store(None)
+    set_http_client(httpx.AsyncClient(transport=_StubTransport(app=app)))
+    yield app
+    set_http_client(None)
+    close_cache()
+    set_entity_store(None)
@@ -0,0 +1,74 @@
+"""Tests for the event-based battle engine."""
+import random
+
+from src.battle_engine import (
+    EVENT_ATTACK,
+    EVENT_FAINT,
+    BattleEvent,
+    render_events,
+    run_battle,
+)
+
+
+def _poke(name, hp=100, attack=60, defense=50, speed=50, move_type="normal", effect=""):
+    return {
+        "name": name,
+        "base_stats": {"hp": hp, "attack": attack, "defense": defense, "speed": speed},
+        "types": ["normal"],
+        "move": {"name": f"{name}-move", "power": 60, "type": move_type, "effect": effect},
+    }
+
+
+BURNER = _poke("burner", speed=80, effect="Has a 10% chance to burn the target.")
+STUNNER = _poke("stunner", hp=120, effect="Has a 30% chance to paralyze the target.")
+
+
+def test_event_recording_does_not_change_the_outcome():
+    for seed in range(20):
+        recorded = run_battle(BURNER, STUNNER, rng=random.Random(seed))
+        silent = run_battle(BURNER, STUNNER, record_events=False, rng=random.Random(seed))
+        assert silent["events"] is None
+        assert {**recorded, "events": None} == silent
+
+
+def test_events_account_for_the_battle_totals():
+    battle = run_battle(BURNER, STUNNER, rng=random.Random(4))
+    events = battle["events"]
+    dealt = {"burner": 0, "stunner": 0}
+    for event in events:
+        if event.kind == EVENT_ATTACK:
+            dealt[event.actor] += event.damage
+    assert battle["damage_dealt"] == {"pokemon1": dealt["burner"], "pokemon2": dealt["stunner"]}
+    assert events[-1].kind == EVENT_FAINT
+    assert events[-1].turn == battle["turns"]
+    loser = "pokemon2" if battle["winner_position"] == "pokemon1" else "pokemon1"
+    assert battle["final_hp"][loser] == 0
+
+
+def test_self_battle_reports_the_winning_position():
+    plain = _poke("plain")
+    battle = run_battle(plain, plain, record_events=False)
+    # Equal speed: the first Pokémon moves first and both hit equally hard
+    assert battle["winner_position"] == "pokemon1"
+    assert battle["initial_hp"] == {"pokemon1": 100, "pokemon2": 100}
+    assert battle["final_hp"]["pokemon2"] == 0 < battle["final_hp"]["pokemon1"]
+
+
+def test_render_events_formats_the_battle_log():
+    events = [
+        BattleEvent(1, EVENT_ATTACK, "a", "b", "tackle", 30, 70),
+        BattleEvent(1, "status", "b", status="burn"),
+        BattleEvent(1, "status_damage", "b", damage=8, hp=62, status="burn"),
+        BattleEvent(2, "paralyzed", "a"),
+        BattleEvent(2, EVENT_FAINT, "b"),
+    ]
+    assert render_events(events, "a") == [
+        "Turn 1:",
+        "a uses tackle and deals 30 damage! (b HP: 70)",
+        "b is now burn!",
+        "b: Burn deals 8 damage.  (HP: 62)",
+        "Turn 2:",
+        "a is paralyzed and can't move!",
+        "b fainted!",
+        "Winner: a!",
+    ]
@@ -0,0 +1,176 @@
+"""Tests for the response cache backends."""
+import asyncio
+import sqlite3
+import sys
+import time
+
+import pytest
+
+from src.cache import MemoryCache, SQLiteCache, TieredCache
+
+
+def test_memory_cache_expires_entries():
+    cache = MemoryCache(max_bytes=1000)
+    cache.set("a", b"body", ttl=0.01)
+    cache.set("never", b"body", ttl=0)
+    assert cache.get("a") == b"body"
+    assert cache.get("never") is None
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0 and cache.size_bytes == 0
+
+
+def test_memory_cache_evicts_least_recently_used_over_budget():
+    entry = sys.getsizeof("a") + sys.getsizeof(b"x" * 100)
+    cache = MemoryCache(max_bytes=3 * entry)
+    for key in "abc":
+        cache.set(key, b"x" * 100, ttl=60)
+    cache.get("a")
+    cache.set("d", b"x" * 100, ttl=60)
+    assert cache.get("b") is None
+    assert all(cache.get(key) for key in "acd")
+    assert cache.size_bytes == 3 * entry
+
+    cache.set("huge", b"x" * 3 * entry, ttl=60)
+    assert cache.get("huge") is None
+    assert cache.size_bytes == 3 * entry
+
+
+@pytest.fixture
+def sqlite_cache(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "cache.sqlite3"), max_bytes=10_000)
+    yield cache
+    cache.close()
+
+
+def _stored_bytes(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT COALESCE(SUM(length(value)), 0) FROM responses").fetchone()[0]
+
+
+def _tracked_bytes(path):
+    with sqlite3.connect(path) as conn:
+        return conn.execute("SELECT bytes FROM responses_size").fetchone()[0]
+
+
+def test_sqlite_round_trip_and_expiry(sqlite_cache):
+    sqlite_cache.set("a", b"body", ttl=60)
+    sqlite_cache.set("gone", b"body", ttl=-1)
+    assert sqlite_cache.get("a") == b"body"
+    assert sqlite_cache.get("gone") is None
+    assert sqlite_cache.get("missing") is None
+
+    sqlite_cache.set("short", b"body", ttl=0.01)
+    time.sleep(0.02)
+    assert sqlite_cache.get("short") is None
+
+
+def test_sqlite_size_total_follows_every_write(sqlite_cache, tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    sqlite_cache.set("a", b"x" * 100, ttl=60)
+    sqlite_cache.set("b", b"x" * 200, ttl=60)
+    sqlite_cache.set("a", b"x" * 50, ttl=60)
+    sqlite_cache.set("c", b"x" * 10, ttl=0.01)
+    time.sleep(0.02)
+    assert sqlite_cache.get("c") is None
+    assert _tracked_bytes(path) == _stored_bytes(path) == 250
+
+    # A second process sharing the database sees and updates the same total
+    other = SQLiteCache(path, max_bytes=10_000)
+    try:
+        other.set("d", b"x" * 25, ttl=60)
+        assert _tracked_bytes(path) == _stored_bytes(path) == 275
+    finally:
+        other.close()
+    sqlite_cache.clear()
+    assert _tracked_bytes(path) == 0
+
+
+def test_sqlite_total_is_seeded_from_an_existing_database(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    with sqlite3.connect(path) as conn:
+        conn.execute(
+            "CREATE TABLE responses (key TEXT PRIMARY KEY, value BLOB NOT NULL,"
+            " expires_at REAL NOT NULL, stored_at REAL NOT NULL)"
+        )
+        conn.execute("INSERT INTO responses VALUES ('a', ?, ?, 0)", (b"x" * 40, time.time() + 60))
+    cache = SQLiteCache(path, max_bytes=10_000)
+    try:
+        assert _tracked_bytes(path) == 40
+        assert cache.get("a") == b"x" * 40
+    finally:
+        cache.close()
+
+
+def test_sqlite_prune_evicts_oldest_entries_over_budget(sqlite_cache, tmp_path):
+    for i in range(15):
+        sqlite_cache.set(f"key-{i}", b"x" * 1000, ttl=60)
+    sqlite_cache.prune()
+    assert _tracked_bytes(str(tmp_path / "cache.sqlite3")) <= 10_000
+    assert sqlite_cache.get("key-0") is None
+    assert sqlite_cache.get("key-14") == b"x" * 1000
+
+
+@pytest.mark.asyncio
+async def test_sqlite_reads_do_not_block_the_event_loop(sqlite_cache, monkeypatch):
+    sqlite_cache.set("a", b"body", ttl=60)
+    slow_get = sqlite_cache._get_with_expiry
+
+    def stalled(key):
+        time.sleep(0.2)
+        return slow_get(key)
+
+    monkeypatch.setattr(sqlite_cache, "_get_with_expiry", stalled)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    assert await sqlite_cache.aget("a") == b"body"
+    task.cancel()
+    assert ticks >= 5
+
+
+def test_tiered_writes_do_not_wait_for_a_locked_database(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = TieredCache(MemoryCache(10_000), SQLiteCache(path, max_bytes=10_000))
+    locker = sqlite3.connect(path, isolation_level=None)
+    locker.execute("BEGIN IMMEDIATE")
+    try:
+        start = time.monotonic()
+        cache.set("a", b"body", ttl=60)
+        assert time.monotonic() - start < 0.1
+        assert cache.get("a") == b"body"
+    finally:
+        locker.execute("COMMIT")
+        locker.close()
+    # The queued write lands once the lock is released
+    cache.close()
+    reopened = SQLiteCache(path, max_bytes=10_000)
+    try:
+        assert reopened.get("a") == b"body"
+    finally:
+        reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_tiered_promotes_persistent_hits_and_warms(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    persistent = SQLiteCache(path, max_bytes=10_000)
+    persistent.set("old", b"1", ttl=60)
+    persistent.set("new", b"2", ttl=60)
+    cache = TieredCache(MemoryCache(10_000), persistent)
+    try:
+        assert await cache.aget("old") == b"1"
+        assert cache.memory.get("old") == b"1"
+        assert await cache.aget("missing") is None
+
+        cache.memory.clear()
+        assert cache.warm() == 2
+        assert cache.memory.get("new") == b"2"
+    finally:
+        cache.close()
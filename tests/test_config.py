@@ -0,0 +1,33 @@
+"""Tests for settings validation."""
+import pytest
+from pydantic import ValidationError
+
+from src.config import Settings
+
+
+@pytest.mark.parametrize(
+    "variable",
+    ["POKEAPI_MODE", "POKEAPI_UPSTREAM", "CACHE_BACKEND", "RATE_LIMIT_BACKEND", "TRACE_EXPORTER"],
+)
+def test_unknown_mode_is_rejected(monkeypatch, variable):
+    monkeypatch.setenv(variable, "snapshop")
+    with pytest.raises(ValidationError):
+        Settings()
+
+
+def test_modes_accept_their_values(monkeypatch):
+    monkeypatch.setenv("POKEAPI_MODE", "hybrid")
+    monkeypatch.setenv("CACHE_BACKEND", "sqlite")
+    settings = Settings()
+    assert settings.pokeapi_mode == "hybrid"
+    assert settings.cache_backend == "sqlite"
+
+
+def test_cache_ttls_are_parsed_once(monkeypatch):
+    monkeypatch.setenv("CACHE_TTLS", "pokemon=60, move=120,bogus")
+    monkeypatch.setenv("CACHE_DEFAULT_TTL", "30")
+    settings = Settings()
+    assert settings.cache_ttl_for("pokemon") == 60
+    assert settings.cache_ttl_for("move") == 120
+    assert settings.cache_ttl_for("species") == 30
+    assert settings.cache_ttls_map is settings.cache_ttls_map
@@ -0,0 +1,130 @@
+"""Tests for parsed PokeAPI entities and the entity store."""
+import time
+
+from pokeapi_stub import ability_doc, pokemon_doc
+from src import entities
+from src.config import settings
+from src.entities import (
+    EntityStore,
+    build_evolution_chain,
+    parse_ability,
+    parse_evolution_chain_entity,
+    parse_pokemon,
+)
+
+BASE = "https://pokeapi.co/api/v2/pokemon-species"
+
+
+def _link(name, ident, *children):
+    url = f"{BASE}/{ident}/" if ident else f"{BASE}/{name}/"
+    return {"species": {"name": name, "url": url}, "evolves_to": list(children)}
+
+
+EEVEE_CHAIN = {
+    "id": 67,
+    "chain": _link(
+        "eevee", 133, _link("vaporeon", 134), _link("jolteon", 135), _link("espeon", 196)
+    ),
+}
+
+
+def test_evolution_chain_keeps_every_branch_in_stage_order():
+    chain = parse_evolution_chain_entity(
+        {"id": 1, "chain": _link("a", 1, _link("b", 2, _link("d", 4)), _link("c", 3))}
+    )
+    assert chain.names == ("a", "b", "c", "d")
+    assert chain.species_ids == (1, 2, 3, 4)
+    assert chain.tree == {
+        "name": "a",
+        "evolves_to": [
+            {"name": "b", "evolves_to": [{"name": "d", "evolves_to": []}]},
+            {"name": "c", "evolves_to": []},
+        ],
+    }
+
+
+def test_evolution_chain_without_species_ids_keeps_its_tree():
+    chain = parse_evolution_chain_entity(
+        {"id": 2, "chain": _link("a", None, _link("b", None), _link("c", None))}
+    )
+    assert chain.names == ("a", "b", "c")
+    assert all(ident < 0 for ident in chain.species_ids)
+    assert [node["name"] for node in chain.tree["evolves_to"]] == ["b", "c"]
+
+
+def test_store_indexes_families_by_member_species():
+    store = EntityStore(max_entries=10)
+    chain_url = "https://pokeapi.co/api/v2/evolution-chain/67/"
+    chain = store.put(chain_url, "evolution-chain", parse_evolution_chain_entity(EEVEE_CHAIN))
+
+    assert store.family(f"{BASE}/196/") is chain
+    assert store.family(f"{BASE}/133/") is chain
+    assert store.family(f"{BASE}/25/") is None
+    assert store.family(f"{BASE}/eevee/") is None
+
+    store.clear()
+    assert store.family(f"{BASE}/196/") is None
+
+
+def test_store_forgets_families_of_evicted_chains():
+    store = EntityStore(max_entries=1)
+    store.put("chain/67", "evolution-chain", parse_evolution_chain_entity(EEVEE_CHAIN))
+    single = parse_evolution_chain_entity({"id": 1, "chain": _link("a", 1)})
+    store.put("chain/1", "evolution-chain", single)
+    assert store.family(f"{BASE}/133/") is None
+    assert store.family(f"{BASE}/1/").names == ("a",)
+
+
+def test_parsed_pokemon_share_names_and_references():
+    first = parse_pokemon(pokemon_doc("http://stub/api/v2", "pikachu"))
+    second = parse_pokemon(pokemon_doc("http://stub/api/v2", "raichu"))
+
+    assert first.stat_names is second.stat_names
+    assert first.base_stats["hp"] == first.stat_values[first.stat_names.index("hp")]
+    shared = {ref.url for ref in first.moves} & {ref.url for ref in second.moves}
+    assert shared
+    by_url = {ref.url: ref for ref in second.moves}
+    assert all(ref is by_url[ref.url] for ref in first.moves if ref.url in shared)
+
+
+def test_name_tuple_table_is_bounded(monkeypatch):
+    monkeypatch.setattr(entities, "NAME_TUPLES_MAX", 3)
+    monkeypatch.setattr(entities, "_tuples", entities.OrderedDict())
+    kept = entities._names(["kept"])
+    for i in range(10):
+        entities._names([f"name-{i}"])
+        # Recently used tuples stay shared
+        assert entities._names(["kept"]) is kept
+    assert len(entities._tuples) == 3
+
+
+def test_build_evolution_chain_keeps_only_the_first_base_form():
+    chain = build_evolution_chain(1, [(1, "a", None), (2, "b", 1), (9, "z", None), (10, "y", 9)])
+    assert chain.names == ("a", "b")
+
+
+def test_store_returns_the_first_live_instance(monkeypatch):
+    monkeypatch.setattr(settings, "cache_ttls_map", {"ability": 60}, raising=False)
+    store = EntityStore(max_entries=10)
+    first = store.put("ability/1", "ability", parse_ability(ability_doc(1)))
+    assert store.put("ability/1", "ability", parse_ability(ability_doc(1))) is first
+    assert store.get("ability/1") is first
+
+
+def test_store_expires_entries_with_the_cache_ttl(monkeypatch):
+    monkeypatch.setattr(settings, "cache_ttls_map", {"ability": 0.01}, raising=False)
+    store = EntityStore(max_entries=10)
+    store.put("ability/1", "ability", parse_ability(ability_doc(1)))
+    time.sleep(0.02)
+    assert store.get("ability/1") is None
+    assert len(store) == 0
+
+
+def test_store_evicts_least_recently_used_entries():
+    store = EntityStore(max_entries=2)
+    for ident in (1, 2):
+        store.put(f"ability/{ident}", "ability", parse_ability(ability_doc(ident)))
+    store.get("ability/1")
+    store.put("ability/3", "ability", parse_ability(ability_doc(3)))
+    assert store.get("ability/2") is None
+    assert store.get("ability/1") is not None and store.get("ability/3") is not None
@@ -0,0 +1,37 @@
+"""Tests for selective JSON decoding."""
+import json
+
+import pytest
+
+from pokeapi_stub import pokemon_doc
+from src.json_extract import POKEMON_FIELDS, POKEMON_ITEM_FIELDS, extract_fields
+
+
+def test_extract_matches_full_decode_of_kept_members():
+    document = pokemon_doc("http://stub/api/v2", "pikachu")
+    body = json.dumps(document, indent=2, ensure_ascii=False).encode()
+
+    extracted = extract_fields(body, POKEMON_FIELDS, POKEMON_ITEM_FIELDS)
+
+    assert set(extracted) == set(POKEMON_FIELDS) | {"moves"}
+    for field in POKEMON_FIELDS:
+        assert extracted[field] == document[field]
+    assert extracted["moves"] == [{"move": move["move"]} for move in document["moves"]]
+
+
+def test_extract_keeps_non_object_items_and_non_ascii_text():
+    body = '{"a": [1, {"k": 2, "x": 3}, "é"], "b": {"c": [null]}, "z": true}'.encode()
+    assert extract_fields(body, ("b",), {"a": ("k",)}) == {
+        "a": [1, {"k": 2}, "é"],
+        "b": {"c": [None]},
+    }
+    assert extract_fields(" { } ", ("a",)) == {}
+
+
+@pytest.mark.parametrize(
+    "body",
+    ['[1, 2]', '{"a": 1,}', '{"a": [1,]}', '{"a" 1}', '{"a": 1 "b": 2}', '{"a": [1, 2', '{"a": 1'],
+)
+def test_extract_rejects_invalid_json(body):
+    with pytest.raises(ValueError):
+        extract_fields(body, ("a", "b"), {"a": ()})
@@ -0,0 +1,83 @@
+"""Tests for structured logging."""
+import io
+import json
+import threading
+
+import pytest
+import structlog
+
+from src import logger as logger_module
+from src.logger import EventSampler, FieldTruncator, close_logging, configure_logging, get_logger
+
+
+@pytest.fixture
+def log_stream():
+    stream = io.StringIO()
+    yield stream
+    close_logging()
+    configure_logging(log_level="WARNING")
+
+
+def test_truncation_counts_encoded_bytes():
+    truncate = FieldTruncator(8)
+    event = truncate(
+        None,
+        "info",
+        {"ascii": "abcdefghij", "wide": "ééééé", "short": "é", "nested": {"k": "v" * 10}},
+    )
+    assert event["ascii"] == "abcdefgh...[truncated 2 bytes]"
+    # Five two-byte characters are ten bytes; a split character is dropped
+    assert event["wide"] == "éééé...[truncated 2 bytes]"
+    assert event["short"] == "é"
+    assert event["nested"].startswith('{"k":')
+    assert event["nested"].endswith("bytes]")
+
+
+def test_truncation_leaves_tracebacks_whole():
+    event = FieldTruncator(8)(None, "error", {"exception": "x" * 100, "count": 10**20})
+    assert event == {"exception": "x" * 100, "count": 10**20}
+
+
+def test_async_writer_truncates_on_its_own_thread(log_stream, monkeypatch):
+    threads = []
+    dumps = logger_module.json_dumps
+
+    def recording_dumps(obj, **kwargs):
+        threads.append(threading.current_thread().name)
+        return dumps(obj, **kwargs)
+
+    monkeypatch.setattr(logger_module, "json_dumps", recording_dumps)
+    configure_logging(async_writer=True, max_field_bytes=16, stream=log_stream)
+    get_logger("test").info("big_event", payload={"values": list(range(100))})
+    close_logging()
+
+    line = json.loads(log_stream.getvalue())
+    assert line["event"] == "big_event"
+    assert line["payload"].endswith("bytes]")
+    assert threads and set(threads) == {"log-writer"}
+
+
+def test_sampler_drops_hot_events_but_never_warnings(monkeypatch):
+    dropped = []
+    monkeypatch.setattr(logger_module, "_record_dropped", dropped.append)
+    sample = EventSampler({"hot": 0.0, "warm": 1.0})
+
+    with pytest.raises(structlog.DropEvent):
+        sample(None, "info", {"event": "hot"})
+    assert sample(None, "warning", {"event": "hot"}) == {"event": "hot"}
+    assert sample(None, "info", {"event": "warm"}) == {"event": "warm"}
+    assert sample(None, "info", {"event": "other"}) == {"event": "other"}
+    assert dropped == ["sampled"]
+
+
+@pytest.mark.parametrize("async_writer", [False, True])
+def test_stdlib_json_fallback_writes_lines(log_stream, monkeypatch, async_writer):
+    monkeypatch.setattr(logger_module, "orjson", None)
+    configure_logging(async_writer=async_writer, stream=log_stream)
+    get_logger("test").info("plain_event", value=object(), count=3)
+    close_logging()
+
+    line = json.loads(log_stream.getvalue())
+    assert line["event"] == "plain_event"
+    assert line["count"] == 3
+    assert line["value"].startswith("<object object")
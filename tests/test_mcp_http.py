@@ -0,0 +1,193 @@
+"""Tests for the /mcp endpoint's authentication and batch dispatch."""
+from contextlib import asynccontextmanager
+import asyncio
+import json
+import types
+
+import httpx
+import pytest
+
+from src.config import settings
+from src.mcp_http import McpHttpEndpoint
+
+KEY = "test-key"
+
+
+class FakeTransport:
+    """Answers each JSON-RPC request with its params after ``params.delay`` seconds."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def __call__(self, scope, receive, send):
+        message = await receive()
+        request = json.loads(message["body"])
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(request.get("params", {}).get("delay", 0))
+        finally:
+            self.in_flight -= 1
+        if "id" not in request:
+            await send({"type": "http.response.start", "status": 202, "headers": []})
+            await send({"type": "http.response.body", "body": b""})
+            return
+        body = json.dumps({"jsonrpc": "2.0", "id": request["id"], "result": request["params"]})
+        await send(
+            {
+                "type": "http.response.start",
+                "status": 200,
+                "headers": [(b"content-type", b"application/json")],
+            }
+        )
+        await send({"type": "http.response.body", "body": body.encode()})
+
+
+@pytest.fixture
+def transport(monkeypatch):
+    monkeypatch.setattr(settings, "api_key", KEY)
+    return FakeTransport()
+
+
+def _client(endpoint):
+    return httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=endpoint),
+        base_url="http://test",
+        headers={"Authorization": f"Bearer {KEY}"},
+    )
+
+
+def _request(ident, delay=0.0):
+    return {"jsonrpc": "2.0", "id": ident, "method": "echo", "params": {"delay": delay}}
+
+
+@pytest.mark.asyncio
+async def test_batch_replies_keep_request_order_and_skip_notifications(transport):
+    batch = [
+        _request(1, delay=0.05),
+        {"jsonrpc": "2.0", "method": "notifications/initialized", "params": {}},
+        _request("two", delay=0.0),
+        "not a message",
+        _request(3, delay=0.02),
+    ]
+    async with _client(McpHttpEndpoint(transport, max_concurrency=8)) as client:
+        response = await client.post("/", json=batch)
+
+    assert response.status_code == 200
+    replies = response.json()
+    assert [reply["id"] for reply in replies] == [1, "two", None, 3]
+    assert replies[2]["error"]["code"] == -32600
+    assert transport.calls == 4
+
+
+@pytest.mark.asyncio
+async def test_batch_dispatch_is_concurrent_and_bounded(transport):
+    batch = [_request(i, delay=0.05) for i in range(12)]
+    async with _client(McpHttpEndpoint(transport, max_concurrency=4)) as client:
+        response = await client.post("/", json=batch)
+
+    assert [reply["id"] for reply in response.json()] == list(range(12))
+    assert transport.peak == 4
+
+
+@pytest.mark.asyncio
+async def test_notification_only_batch_is_accepted_without_body(transport):
+    batch = [{"jsonrpc": "2.0", "method": "notifications/initialized"}]
+    async with _client(McpHttpEndpoint(transport)) as client:
+        response = await client.post("/", json=batch)
+    assert response.status_code == 202
+    assert response.content == b""
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [b"[]", json.dumps([_request(i) for i in range(3)]).encode()])
+async def test_empty_and_oversized_batches_are_rejected(transport, body):
+    async with _client(McpHttpEndpoint(transport, max_batch=2)) as client:
+        response = await client.post("/", content=body)
+    assert response.status_code == 400
+    assert response.json()["error"]["code"] == -32600
+    assert transport.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_single_message_and_bad_json(transport):
+    async with _client(McpHttpEndpoint(transport)) as client:
+        single = await client.post("/", json=_request(7))
+        broken = await client.post("/", content=b"[{")
+    assert single.json() == {"jsonrpc": "2.0", "id": 7, "result": {"delay": 0.0}}
+    assert broken.status_code == 400
+    assert broken.json()["error"]["code"] == -32700
+
+
+@pytest.mark.asyncio
+async def test_requests_need_the_api_key(transport):
+    endpoint = McpHttpEndpoint(transport)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=endpoint), base_url="http://test"
+    ) as client:
+        missing = await client.post("/", json=[_request(1)])
+        wrong = await client.post(
+            "/", json=[_request(1)], headers={"Authorization": "Bearer nope"}
+        )
+    assert missing.status_code in (401, 403)
+    assert wrong.status_code == 401
+    assert transport.calls == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_runs_real_tools_through_the_app(stub, transport):
+    from api.index import app
+    from server import mcp
+
+    batch = [
+        {"jsonrpc": "2.0", "id": 1, "method": "tools/list"},
+        {
+            "jsonrpc": "2.0",
+            "id": 2,
+            "method": "tools/call",
+            "params": {
+                "name": "get_pokemon_info",
+                "arguments": {"pokemon_name": "pikachu", "fields": ["types"]},
+            },
+        },
+    ]
+    headers = {"Accept": "application/json, text/event-stream"}
+    async with mcp.session_manager.run(), _client(app) as client:
+        response = await client.post("/mcp", json=batch, headers=headers)
+
+    assert response.status_code == 200
+    listed, called = response.json()
+    assert "get_pokemon_info_batch" in {tool["name"] for tool in listed["result"]["tools"]}
+    assert called["id"] == 2 and not called["result"].get("isError")
+    info = json.loads(called["result"]["content"][0]["text"])
+    assert info["name"] == "pikachu" and info["types"]
+
+
+@pytest.mark.asyncio
+async def test_lifespan_releases_resources_when_the_session_manager_fails(monkeypatch):
+    from api import index
+
+    @asynccontextmanager
+    async def failing_run():
+        yield
+        raise RuntimeError("session manager failed")
+
+    closed = []
+
+    async def close_http_client():
+        closed.append("http")
+
+    monkeypatch.setattr(
+        index, "mcp", types.SimpleNamespace(session_manager=types.SimpleNamespace(run=failing_run))
+    )
+    monkeypatch.setattr(index, "close_http_client", close_http_client)
+    for name in ("close_cache", "close_metrics", "close_logging"):
+        monkeypatch.setattr(index, name, lambda name=name: closed.append(name))
+
+    with pytest.raises(RuntimeError):
+        async with index.lifespan(index.app):
+            pass
+    assert closed == ["http", "close_cache", "close_metrics", "close_logging"]
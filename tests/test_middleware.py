@@ -0,0 +1,67 @@
+"""Tests for the ASGI middleware."""
+import httpx
+import pytest
+import structlog
+from starlette.responses import PlainTextResponse, StreamingResponse
+
+from src.config import settings
+from src.middleware import RateLimitMiddleware, RequestLoggingMiddleware
+
+
+async def _ok(scope, receive, send):
+    await PlainTextResponse("ok")(scope, receive, send)
+
+
+def _client(app):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_answers_429_over_the_limit(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    async with _client(RateLimitMiddleware(_ok, requests=2, window=60)) as client:
+        statuses = [(await client.get("/")).status_code for _ in range(3)]
+        denied = await client.get("/")
+    assert statuses == [200, 200, 429]
+    assert denied.json()["detail"] == "Maximum 2 requests per 60 seconds"
+
+
+@pytest.mark.asyncio
+async def test_rate_limit_can_be_disabled_and_ignores_other_scopes(monkeypatch):
+    monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    async with _client(RateLimitMiddleware(_ok, requests=1, window=60)) as client:
+        assert [(await client.get("/")).status_code for _ in range(3)] == [200] * 3
+
+    seen = []
+
+    async def app(scope, receive, send):
+        seen.append(scope["type"])
+
+    monkeypatch.setattr(settings, "rate_limit_enabled", True)
+    await RateLimitMiddleware(app, requests=1)({"type": "lifespan"}, None, None)
+    assert seen == ["lifespan"]
+
+
+@pytest.mark.asyncio
+async def test_request_logging_passes_streamed_bodies_through():
+    async def app(scope, receive, send):
+        chunks = (f"chunk-{i};" for i in range(3))
+        await StreamingResponse(chunks, status_code=201)(scope, receive, send)
+
+    async with _client(RequestLoggingMiddleware(app)) as client:
+        response = await client.get("/stream")
+    assert response.status_code == 201
+    assert response.text == "chunk-0;chunk-1;chunk-2;"
+    assert "request_id" not in structlog.contextvars.get_contextvars()
+
+
+@pytest.mark.asyncio
+async def test_request_logging_reraises_and_unbinds_the_request_id():
+    async def broken(scope, receive, send):
+        raise RuntimeError("boom")
+
+    transport = httpx.ASGITransport(app=RequestLoggingMiddleware(broken))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        with pytest.raises(RuntimeError):
+            await client.get("/")
+    assert "request_id" not in structlog.contextvars.get_contextvars()
@@ -0,0 +1,104 @@
+"""Tests for metrics."""
+from typing import Any, Dict
+import os
+import subprocess
+import sys
+
+import httpx
+import pytest
+from fastapi import FastAPI
+from starlette.responses import PlainTextResponse
+
+from src import monitoring
+from src.config import settings
+from src.monitoring import OTHER_ROUTE, route_label
+
+
+class _Endpoint:
+    async def __call__(self, scope, receive, send):
+        await PlainTextResponse("ok")(scope, receive, send)
+
+
+def _labelled_app():
+    """A FastAPI app routed like api/index.py, recording each request's label."""
+    app = FastAPI()
+    labels = []
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: int) -> Dict[str, Any]:
+        return {"id": item_id}
+
+    app.add_route("/mcp", _Endpoint(), methods=["POST"])
+
+    async def recording(scope, receive, send):
+        await app(scope, receive, send)
+        labels.append(route_label(scope))
+
+    return recording, labels
+
+
+@pytest.mark.asyncio
+async def test_route_label_uses_route_templates():
+    app, labels = _labelled_app()
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/7")
+        await client.post("/mcp")
+        await client.get("/no/such/path")
+    assert labels == ["/items/{item_id}", "/mcp", OTHER_ROUTE]
+
+
+@pytest.mark.asyncio
+async def test_mcp_route_of_the_app_is_labelled():
+    from api.index import app
+
+    seen = []
+
+    async def recording(scope, receive, send):
+        try:
+            await app(scope, receive, send)
+        finally:
+            seen.append(route_label(scope))
+
+    # No lifespan runs here, so the MCP transport itself fails; the label only
+    # depends on routing
+    transport = httpx.ASGITransport(app=recording, raise_app_exceptions=False)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.post("/mcp", json={})
+    assert seen == ["/mcp"]
+
+
+def test_shared_cache_size_is_not_summed_across_workers(tmp_path):
+    from prometheus_client import CollectorRegistry, multiprocess
+
+    record = (
+        "from src.monitoring import record_cache_size\n"
+        "record_cache_size('memory', 100, 1)\n"
+        "record_cache_size('sqlite', 1000, 10, shared=True)\n"
+    )
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", record], env=env, check=True)
+
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry, path=str(tmp_path))
+    # Each worker's memory tier is its own; the SQLite file is the same one
+    assert registry.get_sample_value("pokeapi_cache_size_bytes", {"backend": "memory"}) == 200
+    assert registry.get_sample_value(
+        "pokeapi_cache_shared_size_bytes", {"backend": "sqlite"}
+    ) == 1000
+    assert registry.get_sample_value("pokeapi_cache_shared_entries", {"backend": "sqlite"}) == 10
+
+
+def test_misplaced_multiproc_dir_warns_at_startup_not_per_scrape(monkeypatch, tmp_path):
+    warnings = []
+    monkeypatch.setattr(
+        monitoring.logger, "warning", lambda event, **kw: warnings.append(event)
+    )
+    monkeypatch.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+    monkeypatch.setattr(settings, "prometheus_multiproc_dir", str(tmp_path))
+
+    monitoring.check_metrics_config()
+    monitoring.generate_metrics()
+    monitoring.generate_metrics()
+    assert warnings == ["prometheus_multiproc_dir_not_in_environment"]
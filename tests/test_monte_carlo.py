@@ -0,0 +1,57 @@
+"""Tests for vectorized Monte Carlo battles."""
+import random
+
+import pytest
+
+from src.battle_engine import run_battle
+from src.monte_carlo import run_monte_carlo, wilson_interval
+
+pytest.importorskip("numpy")
+
+
+def _poke(name, hp=100, speed=50, effect=""):
+    return {
+        "name": name,
+        "base_stats": {"hp": hp, "attack": 60, "defense": 50, "speed": speed},
+        "types": ["normal"],
+        "move": {"name": f"{name}-move", "power": 60, "type": "normal", "effect": effect},
+    }
+
+
+BURNER = _poke("burner", speed=80, effect="Has a 10% chance to burn the target.")
+STUNNER = _poke("stunner", hp=120, effect="Has a 30% chance to paralyze the target.")
+
+
+def test_seeded_runs_are_reproducible():
+    first = run_monte_carlo(BURNER, STUNNER, 500, seed=11)
+    assert run_monte_carlo(BURNER, STUNNER, 500, seed=11) == first
+    probabilities = first["win_probability"]
+    assert probabilities["pokemon1"] + probabilities["pokemon2"] == pytest.approx(1.0)
+    assert sum(first["turns"]["distribution"].values()) == 500
+
+
+def test_deterministic_matchup_has_a_certain_winner():
+    plain = _poke("plain")
+    result = run_monte_carlo(plain, _poke("slow", speed=10), 200, seed=1)
+    assert result["win_probability"]["pokemon1"] == 1.0
+    assert result["turns"]["min"] == result["turns"]["max"]
+    interval = result["confidence_interval_95"]["pokemon1"]
+    assert interval["low"] > 0.98 and interval["high"] == pytest.approx(1.0)
+
+
+def test_lanes_agree_with_the_battle_engine():
+    rng = random.Random(5)
+    battles = 4000
+    engine_wins = sum(
+        run_battle(BURNER, STUNNER, record_events=False, rng=rng)["winner_position"] == "pokemon1"
+        for _ in range(battles)
+    )
+    result = run_monte_carlo(BURNER, STUNNER, battles, seed=5)
+    assert result["win_probability"]["pokemon1"] == pytest.approx(engine_wins / battles, abs=0.04)
+
+
+def test_wilson_interval_bounds():
+    assert wilson_interval(0, 0) == {"low": 0.0, "high": 1.0}
+    interval = wilson_interval(50, 100)
+    assert interval["low"] == pytest.approx(0.4038, abs=1e-4)
+    assert interval["high"] == pytest.approx(0.5962, abs=1e-4)
@@ -0,0 +1,66 @@
+"""Tests for the shared PokeAPI client helpers."""
+import asyncio
+
+import pytest
+
+from src.pokeapi_client import (
+    close_http_client,
+    gather_limited,
+    get_http_client,
+    set_http_client,
+)
+
+
+@pytest.mark.asyncio
+async def test_http_client_is_shared_until_closed():
+    set_http_client(None)
+    try:
+        client = get_http_client()
+        assert get_http_client() is client
+
+        await close_http_client()
+        assert client.is_closed
+        replacement = get_http_client()
+        assert replacement is not client
+
+        # A client closed behind our back is replaced too
+        await replacement.aclose()
+        assert get_http_client() is not replacement
+    finally:
+        await close_http_client()
+
+
+@pytest.mark.asyncio
+async def test_gather_limited_bounds_concurrency_and_keeps_order():
+    running = peak = 0
+
+    async def work(value, delay):
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(delay)
+        running -= 1
+        return value
+
+    delays = [0.03, 0.0, 0.02, 0.01, 0.0, 0.03, 0.01]
+    results = await gather_limited(3, *(work(i, d) for i, d in enumerate(delays)))
+    assert results == list(range(len(delays)))
+    assert peak == 3
+
+
+@pytest.mark.asyncio
+async def test_gather_limited_cancels_the_rest_on_error():
+    finished = []
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def slow(value):
+        await asyncio.sleep(1)
+        finished.append(value)
+
+    with pytest.raises(ValueError):
+        await gather_limited(2, slow(1), fail(), slow(2))
+    await asyncio.sleep(0)
+    assert finished == []
@@ -0,0 +1,160 @@
+"""Tests for the rate limiter and its backends."""
+import types
+
+import pytest
+
+from src import rate_limit
+from src.rate_limit import RedisRateLimitBackend, SlidingWindowLimiter
+
+
+def test_limiter_allows_up_to_the_limit_per_window():
+    limiter = SlidingWindowLimiter(requests=3, window=10)
+    assert [limiter.hit("a", now=100.0) for _ in range(4)] == [True, True, True, False]
+    assert limiter.hit("b", now=100.0)
+
+
+def test_limiter_weights_the_previous_window_by_its_overlap():
+    limiter = SlidingWindowLimiter(requests=4, window=10)
+    assert all(limiter.hit("a", now=105.0) for _ in range(4))
+    # 30% into the next window, 70% of the previous four (2.8) still count
+    assert [limiter.hit("a", now=113.0) for _ in range(3)] == [True, True, False]
+    # Two windows on, the old requests no longer count
+    assert all(limiter.hit("a", now=130.0) for _ in range(4))
+
+
+def test_limiter_expires_idle_clients_and_caps_the_table():
+    limiter = SlidingWindowLimiter(requests=1, window=10, max_clients=3)
+    for client in "abc":
+        limiter.hit(client, now=100.0)
+    limiter.hit("d", now=100.0)
+    assert len(limiter) == 3
+    # "a" was least recently seen, so it was forgotten and may hit again
+    assert limiter.hit("a", now=100.0)
+
+    limiter.hit("e", now=200.0)
+    assert len(limiter) == 1
+
+
+class FakeStore:
+    """In-memory stand-in for the commands ``RedisRateLimitBackend`` sends."""
+
+    def __init__(self):
+        self.values = {}
+        self.round_trips = 0
+
+    async def pipeline(self, *commands):
+        self.round_trips += 1
+        return [self._run(*command) for command in commands]
+
+    async def execute(self, *command):
+        return (await self.pipeline(command))[0]
+
+    def _run(self, name, key, *args):
+        if name == "INCRBY":
+            self.values[key] = self.values.get(key, 0) + args[0]
+            return self.values[key]
+        if name == "DECRBY":
+            self.values[key] = self.values.get(key, 0) - args[0]
+            return self.values[key]
+        if name == "GET":
+            value = self.values.get(key)
+            return None if value is None else str(value).encode()
+        if name == "EXPIRE":
+            return 1
+        raise AssertionError(f"unexpected command {name}")
+
+    async def close(self):
+        pass
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Controllable time for the rate-limit module."""
+    now = [1000.0]
+    monkeypatch.setattr(rate_limit, "time", types.SimpleNamespace(time=lambda: now[0]))
+    return now
+
+
+def _replicas(store, count, requests, lease_size, window=60.0):
+    return [
+        RedisRateLimitBackend(
+            store,
+            requests,
+            window,
+            fallback=SlidingWindowLimiter(requests, window),
+            lease_size=lease_size,
+        )
+        for _ in range(count)
+    ]
+
+
+async def _allowed(backend, client, attempts):
+    return sum([await backend.hit(client) for _ in range(attempts)])
+
+
+@pytest.mark.asyncio
+async def test_leases_never_exceed_the_shared_limit(clock):
+    store = FakeStore()
+    replicas = _replicas(store, 4, requests=50, lease_size=10)
+    allowed = 0
+    for _ in range(40):
+        for replica in replicas:
+            allowed += await replica.hit("client")
+    assert allowed <= 50 + 1
+    assert store.round_trips < allowed
+
+
+@pytest.mark.asyncio
+async def test_unused_leases_bound_the_shortfall(clock):
+    store = FakeStore()
+    lease_size = 10
+    idle, busy = _replicas(store, 2, requests=20, lease_size=lease_size)
+    # The idle replica leases a chunk and serves a single request
+    assert await idle.hit("client")
+    allowed = 1 + await _allowed(busy, "client", 40)
+    assert 20 - (lease_size - 1) <= allowed <= 20 + 1
+
+
+@pytest.mark.asyncio
+async def test_leases_shrink_as_the_budget_runs_out(clock):
+    store = FakeStore()
+    replicas = _replicas(store, 3, requests=20, lease_size=10)
+    for replica in replicas:
+        assert await replica.hit("client")
+    # Each lease takes at most half of what is left: 10, then 5, then 3
+    assert store.values["ratelimit:client:16"] == 18
+
+
+@pytest.mark.asyncio
+async def test_unused_lease_is_returned_when_the_window_ends(clock):
+    store = FakeStore()
+    idle, busy = _replicas(store, 2, requests=20, lease_size=10)
+    assert await idle.hit("client")
+    assert store.values["ratelimit:client:16"] == 10
+
+    clock[0] += 60
+    assert await idle.hit("client")
+    # Only the request actually served remains counted in the previous window
+    assert store.values["ratelimit:client:16"] == 1
+    # So the next window is not charged for requests that never happened
+    assert await _allowed(busy, "client", 40) >= 20 - 1 - 9
+
+
+@pytest.mark.asyncio
+async def test_unreachable_store_falls_back_to_local_limits(clock):
+    class DownStore(FakeStore):
+        async def pipeline(self, *commands):
+            raise OSError("connection refused")
+
+    (replica,) = _replicas(DownStore(), 1, requests=5, lease_size=2)
+    assert await _allowed(replica, "client", 10) == 5
+
+
+@pytest.mark.asyncio
+async def test_malformed_reply_falls_back_to_local_limits(clock):
+    class GarbledStore(FakeStore):
+        async def pipeline(self, *commands):
+            raise ValueError("unexpected reply type b'?'")
+
+    (replica,) = _replicas(GarbledStore(), 1, requests=5, lease_size=2)
+    assert await _allowed(replica, "client", 10) == 5
@@ -0,0 +1,86 @@
+"""Tests for the RESP client."""
+import asyncio
+import time
+
+import pytest
+
+from src.resp import RespClient, RespError, encode_command
+
+
+def test_encode_command():
+    assert encode_command(("INCRBY", "key", 5)) == b"*3\r\n$6\r\nINCRBY\r\n$3\r\nkey\r\n$1\r\n5\r\n"
+
+
+async def _serve(handler):
+    server = await asyncio.start_server(handler, "127.0.0.1", 0)
+    return server, server.sockets[0].getsockname()[1]
+
+
+@pytest.mark.asyncio
+async def test_stalled_setup_times_out_and_drops_the_connection():
+    async def stall(reader, writer):
+        await asyncio.sleep(10)
+
+    server, port = await _serve(stall)
+    async with server:
+        client = RespClient(f"redis://:secret@127.0.0.1:{port}/2", timeout=0.1)
+        start = time.monotonic()
+        with pytest.raises(asyncio.TimeoutError):
+            await client.execute("GET", "key")
+        assert time.monotonic() - start < 1.0
+        assert client._writer is None
+        await client.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_rejected_auth_drops_the_connection():
+    attempts = 0
+
+    async def reject_then_accept(reader, writer):
+        nonlocal attempts
+        attempts += 1
+        ok = attempts > 1
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            if line.upper().startswith(b"AUTH"):
+                writer.write(b"+OK\r\n" if ok else b"-WRONGPASS invalid password\r\n")
+            elif line.upper().startswith(b"GET"):
+                writer.write(b"$2\r\n42\r\n")
+            await writer.drain()
+
+    server, port = await _serve(reject_then_accept)
+    async with server:
+        client = RespClient(f"redis://:secret@127.0.0.1:{port}", timeout=1.0)
+        with pytest.raises(RespError):
+            await client.execute("GET", "key")
+        assert client._writer is None
+        # The next call reconnects and authenticates from scratch
+        assert await client.execute("GET", "key") == b"42"
+        assert attempts == 2
+        await client.close()
+        server.close()
+
+
+@pytest.mark.asyncio
+async def test_cancelled_call_drops_the_connection():
+    async def slow_get(reader, writer):
+        await reader.readline()
+        await asyncio.sleep(0.2)
+        writer.write(b"$2\r\n42\r\n")
+        await writer.drain()
+
+    server, port = await _serve(slow_get)
+    async with server:
+        client = RespClient(f"redis://127.0.0.1:{port}", timeout=1.0)
+        task = asyncio.ensure_future(client.execute("GET", "key"))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        # The late reply must not be read as the answer to the next call
+        assert client._writer is None
+        await client.close()
+        server.close()
@@ -0,0 +1,257 @@
+"""Tests for the MCP tools against the PokeAPI stub."""
+import asyncio
+import re
+import time
+
+import pytest
+
+import server
+from pokeapi_stub import pokemon_doc
+from src.cache import get_cache
+from src.config import settings
+from src.entities import get_entity_store
+from src.snapshot import close_snapshot
+
+
+@pytest.mark.asyncio
+async def test_generation_tournament_fetches_default_varieties_by_id(stub, monkeypatch):
+    entered = []
+
+    async def fake_tournament(entrants, battles, seed, on_progress=None):
+        entered.extend(entrants)
+        return {"matchups": 0, "leaderboard": []}
+
+    monkeypatch.setattr(server, "run_tournament", fake_tournament)
+    monkeypatch.setattr(settings, "tournament_max_roster", 100)
+    result = await server.simulate_tournament(generation=1, battles_per_matchup=1)
+
+    assert "error" not in result
+    assert len(entered) == 24
+    fetched = [path for path in stub.state.paths if path.startswith("/api/v2/pokemon/")]
+    assert len(fetched) == 24
+    assert all(re.fullmatch(r"/api/v2/pokemon/\d+", path) for path in fetched)
+
+
+@pytest.mark.asyncio
+async def test_tournament_enters_each_pokemon_once(stub, monkeypatch):
+    entered = []
+
+    async def fake_tournament(entrants, battles, seed, on_progress=None):
+        entered.extend(entrants)
+        return {"matchups": 0, "leaderboard": []}
+
+    monkeypatch.setattr(server, "run_tournament", fake_tournament)
+    pikachu_id = str(pokemon_doc("http://stub/api/v2", "pikachu")["id"])
+
+    result = await server.simulate_tournament(["pikachu", pikachu_id, "eevee"], battles_per_matchup=1)
+    assert "error" not in result
+    assert sorted(poke["name"] for poke in entered) == ["eevee", "pikachu"]
+
+    result = await server.simulate_tournament(["Pikachu", pikachu_id], battles_per_matchup=1)
+    assert result == {"error": "A tournament needs at least two Pokémon."}
+
+
+@pytest.mark.asyncio
+async def test_monte_carlo_battle_runs_off_the_event_loop(stub, monkeypatch):
+    def slow_monte_carlo(poke1, poke2, simulations, seed):
+        time.sleep(0.2)
+        return {"simulations": simulations}
+
+    monkeypatch.setattr(server, "run_monte_carlo", slow_monte_carlo)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    task = asyncio.create_task(ticker())
+    result = await server.simulate_battle("pikachu", "eevee", mode="monte_carlo", simulations=10)
+    task.cancel()
+    assert result == {"simulations": 10}
+    assert ticks >= 5
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("detail", ["summary", "full"])
+async def test_battle_detail_keys_fighters_by_position(stub, detail):
+    result = await server.simulate_battle("mew", "mew", seed=7, detail=detail)
+
+    for key in ("initial_hp", "final_hp", "damage_dealt", "status"):
+        assert set(result[key]) == {"pokemon1", "pokemon2"}
+    assert result["initial_hp"]["pokemon1"] == result["initial_hp"]["pokemon2"]
+    assert ("battle_log" in result) == (detail == "full")
+
+
+@pytest.mark.asyncio
+async def test_battle_details_agree_across_levels(stub):
+    runs = {
+        detail: await server.simulate_battle("pikachu", "eevee", seed=3, detail=detail)
+        for detail in ("none", "summary", "full")
+    }
+    assert runs["none"] == {key: runs["summary"][key] for key in runs["none"]}
+    assert runs["summary"] == {key: runs["full"][key] for key in runs["summary"]}
+    assert runs["full"]["battle_log"][-1] == f"Winner: {runs['full']['winner']}!"
+
+
+@pytest.mark.asyncio
+async def test_batch_fetches_shared_resources_once(stub):
+    result = await server.get_pokemon_info_batch(["pikachu", "Pikachu", "eevee", "mew"])
+
+    assert [entry["name"] for entry in result["pokemon"]] == ["pikachu", "eevee", "mew"]
+    assert (result["succeeded"], result["failed"]) == (3, 0)
+    assert len(stub.state.paths) == len(set(stub.state.paths))
+
+    # Same answers as the single-Pokémon tool
+    single = await server.get_pokemon_info("eevee")
+    assert single == result["pokemon"][1]
+
+
+@pytest.mark.asyncio
+async def test_batch_reports_failures_per_pokemon(stub):
+    stub.state.missing.add("missingno")
+    result = await server.get_pokemon_info_batch(["pikachu", "missingno"])
+
+    assert (result["succeeded"], result["failed"]) == (1, 1)
+    ok, failed = result["pokemon"]
+    assert ok["name"] == "pikachu" and "error" not in ok
+    assert failed["name"] == "missingno" and failed["error"]
+
+
+@pytest.mark.asyncio
+async def test_batch_rejects_empty_and_oversized_batches(stub, monkeypatch):
+    monkeypatch.setattr(settings, "pokemon_info_batch_max", 2)
+    assert "error" in await server.get_pokemon_info_batch([])
+    assert "error" in await server.get_pokemon_info_batch(["a", "b", "c"])
+    assert stub.state.paths == []
+
+
+@pytest.mark.asyncio
+async def test_projection_fetches_only_requested_sections(stub):
+    info = await server.get_pokemon_info("mew", fields=["Stats", "types"])
+
+    assert set(info) == {"name", "id", "base_stats", "types"}
+    assert stub.state.paths == ["/api/v2/pokemon/mew"]
+
+    unknown = await server.get_pokemon_info("mew", fields=["stats", "sprites"])
+    assert "sprites" in unknown["error"]
+
+
+@pytest.mark.asyncio
+async def test_moves_are_paged_through_the_full_list(stub, monkeypatch):
+    monkeypatch.setattr(settings, "pokemon_info_max_moves", 15)
+    everything = await server.get_pokemon_info("mew", fields=["moves"], moves_limit=1000)
+    total = everything["moves_total"]
+    assert len(everything["moves"]) == 15 < total
+
+    pages = []
+    for offset in range(0, total, 15):
+        page = await server.get_pokemon_info(
+            "mew", fields=["moves"], moves_limit=15, moves_offset=offset
+        )
+        assert page["moves_total"] == total
+        pages.extend(page["moves"])
+    assert len(pages) == total
+    assert pages[:15] == everything["moves"]
+    assert len({move["name"] for move in pages}) == total
+
+    beyond = await server.get_pokemon_info("mew", fields=["moves"], moves_offset=total)
+    assert beyond["moves"] == []
+
+
+async def _both_upstreams(stub, monkeypatch, call):
+    """Run ``call`` over REST, then over GraphQL with fresh caches."""
+    rest = await call()
+    rest_paths = len(stub.state.paths)
+    monkeypatch.setattr(settings, "pokeapi_upstream", "graphql")
+    get_cache().clear()
+    get_entity_store().clear()
+    graphql = await call()
+    monkeypatch.setattr(settings, "pokeapi_upstream", "rest")
+    return rest, graphql, stub.state.paths[rest_paths:]
+
+
+@pytest.mark.asyncio
+async def test_graphql_upstream_matches_rest_in_one_request(stub, monkeypatch):
+    async def call():
+        return (
+            await server.get_pokemon_info("pikachu", moves_limit=100),
+            await server.get_pokemon_info_batch(["eevee", "mew"], moves_limit=100),
+        )
+
+    rest, graphql, graphql_paths = await _both_upstreams(stub, monkeypatch, call)
+    assert graphql_paths == ["/graphql", "/graphql"]
+    assert graphql == rest
+
+    # Another page of the same Pokémon is answered from the cached query
+    monkeypatch.setattr(settings, "pokeapi_upstream", "graphql")
+    seen = len(stub.state.paths)
+    await server.get_pokemon_info("pikachu", moves_limit=5, moves_offset=5)
+    assert len(stub.state.paths) == seen
+
+
+@pytest.mark.asyncio
+async def test_graphql_move_pages_match_rest(stub, monkeypatch):
+    async def call():
+        return [
+            await server.get_pokemon_info("mew", fields=["moves"], moves_limit=4, moves_offset=offset)
+            for offset in (0, 7, 38)
+        ]
+
+    rest, graphql, _ = await _both_upstreams(stub, monkeypatch, call)
+    assert graphql == rest
+    assert [len(page["moves"]) for page in rest] == [4, 4, 2]
+
+
+@pytest.mark.asyncio
+async def test_graphql_upstream_accepts_ids(stub, monkeypatch):
+    async def call():
+        return (
+            await server.get_pokemon_info("25", fields=["types", "stats"]),
+            await server.get_pokemon_info_batch(["25", "mew"], fields=["types"]),
+        )
+
+    rest, graphql, _ = await _both_upstreams(stub, monkeypatch, call)
+    assert graphql == rest
+    assert graphql[0]["id"] == 25
+    assert graphql[1]["succeeded"] == 2
+
+
+@pytest.mark.asyncio
+async def test_graphql_upstream_is_not_used_offline(stub, monkeypatch):
+    monkeypatch.setattr(settings, "pokeapi_upstream", "graphql")
+    monkeypatch.setattr(settings, "pokeapi_mode", "hybrid")
+    monkeypatch.setattr(settings, "pokeapi_snapshot_path", "/nonexistent.snapshot")
+    try:
+        info = await server.get_pokemon_info("mew", fields=["types"])
+    finally:
+        close_snapshot()
+    assert info["types"]
+    assert stub.state.paths == ["/api/v2/pokemon/mew"]
+
+
+def _same_family_names():
+    """Two stub Pokémon whose species share an evolution chain."""
+    families = {}
+    for i in range(1000):
+        name = f"poke-{i}"
+        chain = (pokemon_doc("http://stub", name)["id"] - 1) // 3
+        if chain in families:
+            return families[chain], name
+        families[chain] = name
+    raise AssertionError("no two stub Pokémon share a family")
+
+
+@pytest.mark.asyncio
+async def test_family_members_resolve_without_species_requests(stub):
+    first, second = _same_family_names()
+    info = await server.get_pokemon_info(first, fields=["evolution"])
+    assert len(info["evolution_chain"]) == 3
+    assert any(path.startswith("/api/v2/evolution-chain/") for path in stub.state.paths)
+
+    del stub.state.paths[:]
+    other = await server.get_pokemon_info(second, fields=["evolution"])
+    assert other["evolution_chain"] == info["evolution_chain"]
+    assert other["evolution_tree"] == info["evolution_tree"]
+    assert stub.state.paths == [f"/api/v2/pokemon/{second}"]
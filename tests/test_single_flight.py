@@ -0,0 +1,89 @@
+"""Tests for coalescing of in-flight upstream requests."""
+import asyncio
+
+import pytest
+
+from src.pokeapi_client import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("k", "pokemon", fetch) for _ in range(5)))
+    assert results == [1] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_error_reaches_every_waiter():
+    flight = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    results = await asyncio.gather(
+        *(flight.do("k", "pokemon", fail) for _ in range(3)), return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+    assert len(flight) == 0
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_does_not_cancel_the_others():
+    flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fetch():
+        await release.wait()
+        return "body"
+
+    first = asyncio.create_task(flight.do("k", "pokemon", fetch))
+    second = asyncio.create_task(flight.do("k", "pokemon", fetch))
+    await asyncio.sleep(0)
+    first.cancel()
+    await asyncio.sleep(0)
+    release.set()
+    assert await second == "body"
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+
+@pytest.mark.asyncio
+async def test_caller_after_last_waiter_cancels_starts_a_fresh_call():
+    flight = SingleFlight()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        try:
+            await asyncio.sleep(10)
+        finally:
+            # Keep the cancelled task unwinding across a loop iteration, so
+            # the next caller arrives while it is still running
+            await asyncio.shield(asyncio.sleep(0.01))
+        return "stale"
+
+    async def fresh():
+        return "fresh"
+
+    abandoned = asyncio.create_task(flight.do("k", "pokemon", fetch))
+    await asyncio.sleep(0)
+    abandoned.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await abandoned
+
+    assert await flight.do("k", "pokemon", fresh) == "fresh"
+    assert calls == 1
+    await asyncio.sleep(0.02)
+    assert len(flight) == 0
@@ -0,0 +1,87 @@
+"""Tests for the offline snapshot format and reader."""
+import json
+import struct
+import tracemalloc
+
+import pytest
+
+from src.snapshot import HEADER, MAGIC, META_KEY, Snapshot, url_to_key, write_snapshot
+
+
+def _documents(count):
+    for ident in range(1, count + 1):
+        body = json.dumps({"id": ident, "name": f"mon-{ident}"}).encode()
+        yield (f"pokemon/{ident}", f"pokemon/mon-{ident}"), body
+
+
+def test_url_to_key():
+    assert url_to_key("https://pokeapi.co/api/v2/pokemon-species/25/") == "pokemon-species/25"
+    assert url_to_key("/api/v2/pokemon/Pikachu") == "pokemon/pikachu"
+    assert url_to_key("https://pokeapi.co/") is None
+
+
+def test_every_key_is_found(tmp_path):
+    path = str(tmp_path / "test.snapshot")
+    documents = list(_documents(500))
+    documents.append((("ability/flabébé", "ability/z"), '{"name": "flabébé"}'.encode()))
+    assert write_snapshot(path, documents, {"dataset_version": "test"}) == 1003
+
+    snapshot = Snapshot(path)
+    try:
+        assert len(snapshot) == 1003
+        assert snapshot.meta == {"dataset_version": "test"}
+        for keys, body in documents:
+            for key in keys:
+                assert key in snapshot
+                assert snapshot.get(key) == body
+        assert snapshot.get_url("https://pokeapi.co/api/v2/pokemon/MON-7/") == (
+            b'{"id": 7, "name": "mon-7"}'
+        )
+        for missing in ("pokemon/0", "pokemon/mon-5000", "", "zzz", "ability/flabebe"):
+            assert snapshot.get(missing) is None
+            assert missing not in snapshot
+    finally:
+        snapshot.close()
+
+
+def test_opening_keeps_the_index_in_the_mapping(tmp_path):
+    path = str(tmp_path / "test.snapshot")
+    write_snapshot(path, _documents(20_000), {})
+    tracemalloc.start()
+    snapshot = Snapshot(path)
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    try:
+        assert snapshot.get("pokemon/mon-12345") is not None
+        # 40k keys: a dict index would take megabytes
+        assert allocated < 64 * 1024
+    finally:
+        snapshot.close()
+
+
+def test_rejects_other_format_versions(tmp_path):
+    path = tmp_path / "old.snapshot"
+    path.write_bytes(HEADER.pack(MAGIC, 1, 0, HEADER.size, 0))
+    with pytest.raises(ValueError, match="format version 1"):
+        Snapshot(str(path))
+
+
+def test_rejects_truncated_index(tmp_path):
+    path = str(tmp_path / "test.snapshot")
+    write_snapshot(path, _documents(10), {})
+    with open(path, "rb") as f:
+        data = f.read()
+    with open(path, "wb") as f:
+        f.write(data[:-struct.calcsize("<I")])
+    with pytest.raises(ValueError, match="truncated"):
+        Snapshot(path)
+
+
+def test_meta_key_is_reserved(tmp_path):
+    path = str(tmp_path / "test.snapshot")
+    write_snapshot(path, [], {"a": 1})
+    snapshot = Snapshot(path)
+    try:
+        assert json.loads(snapshot.get(META_KEY)) == {"a": 1}
+    finally:
+        snapshot.close()
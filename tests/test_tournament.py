@@ -0,0 +1,66 @@
+"""Tests for sharded round-robin tournaments."""
+import pytest
+
+from src.config import settings
+from src.tournament import (
+    close_process_pool,
+    compact_pokemon,
+    expand_pokemon,
+    run_shard,
+    run_tournament,
+    standings,
+)
+
+pytest.importorskip("numpy")
+
+
+def _poke(name, hp, speed):
+    return {
+        "name": name,
+        "base_stats": {"hp": hp, "attack": 60, "defense": 50, "speed": speed},
+        "types": ["normal"],
+        "move": {"name": "tackle", "power": 40, "type": "normal", "effect": None},
+    }
+
+
+ROSTER = [_poke("tank", 200, 20), _poke("fast", 90, 90), _poke("frail", 40, 10)]
+
+
+def test_compact_round_trip_keeps_battle_fields():
+    for poke in ROSTER:
+        assert expand_pokemon(compact_pokemon(poke)) == poke
+
+
+def test_standings_rank_by_win_rate_then_name():
+    rows = standings(["a", "b", "c"], [(0, 1, 3), (0, 2, 10), (1, 2, 10)], battles=10)
+    assert [(row["rank"], row["name"], row["wins"]) for row in rows] == [
+        (1, "b", 17),
+        (2, "a", 13),
+        (3, "c", 0),
+    ]
+    assert all(row["battles"] == 20 for row in rows)
+
+
+@pytest.mark.asyncio
+async def test_tournament_matches_in_process_shards(monkeypatch):
+    monkeypatch.setattr(settings, "tournament_workers", 2)
+    progress = []
+
+    async def report(done, total, rows):
+        progress.append((done, total))
+
+    close_process_pool()
+    try:
+        result = await run_tournament(ROSTER, battles=50, seed=3, on_progress=report)
+    finally:
+        close_process_pool()
+
+    assert result["matchups"] == 3
+    assert progress[-1] == (3, 3)
+    # Each pair draws its own seed, so sharding does not change the results
+    compact = [compact_pokemon(poke) for poke in ROSTER]
+    expected = standings(
+        [poke["name"] for poke in ROSTER], run_shard(compact, [(0, 1), (0, 2), (1, 2)], 50, 3), 50
+    )
+    assert result["leaderboard"] == expected
+    assert result["leaderboard"][-1]["name"] == "frail"
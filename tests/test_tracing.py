@@ -0,0 +1,50 @@
+"""Tests for span tracing and exporters."""
+import asyncio
+import json
+
+import pytest
+
+from src import tracing
+from src.config import settings
+from src.tracing import FileSpanExporter, SpanExporter, span, start_trace
+
+
+def test_span_exporter_is_abstract():
+    with pytest.raises(TypeError):
+        SpanExporter()
+
+
+def test_unsampled_requests_record_nothing(monkeypatch):
+    monkeypatch.setattr(settings, "trace_sample_rate", 0.0)
+    with start_trace("tool.test") as root:
+        with span("child") as child:
+            child.set("key", "value")
+    assert root is tracing.NOOP_SPAN
+    assert child is tracing.NOOP_SPAN
+
+
+def test_sampled_trace_is_exported_with_nested_spans(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "trace_sample_rate", 1.0)
+    exporter = FileSpanExporter(str(tmp_path / "traces.jsonl"))
+    tracing.set_span_exporter(exporter)
+
+    async def fetch(name):
+        with span("pokeapi.get", url=name):
+            await asyncio.sleep(0)
+
+    async def tool():
+        with start_trace("tool.test"):
+            await asyncio.gather(fetch("a"), fetch("b"))
+
+    try:
+        asyncio.run(tool())
+    finally:
+        tracing.set_span_exporter(None)
+        exporter.close()
+
+    spans = [json.loads(line) for line in (tmp_path / "traces.jsonl").read_text().splitlines()]
+    root = next(s for s in spans if s["parent_id"] is None)
+    children = [s for s in spans if s["parent_id"] == root["span_id"]]
+    assert root["name"] == "tool.test"
+    assert sorted(s["attributes"]["url"] for s in children) == ["a", "b"]
+    assert {s["trace_id"] for s in spans} == {root["trace_id"]}
@@ -0,0 +1,44 @@
+"""Tests for the compiled type-effectiveness tables."""
+import itertools
+
+from src.battle_utils import get_type_multiplier
+from src.constants import TYPE_EFFECTIVENESS
+from src.type_chart import (
+    NO_TYPE,
+    TYPE_NAMES,
+    defender_type_ids,
+    lookup_multiplier,
+    score_matchups,
+    type_id,
+)
+
+NAMES = [*TYPE_NAMES, "unknown"]
+
+
+def _reference(attack, defender_types):
+    multiplier = 1.0
+    for defender in defender_types:
+        multiplier *= TYPE_EFFECTIVENESS.get(attack, {}).get(defender, 1.0)
+    return multiplier
+
+
+def test_tables_match_the_effectiveness_chart_for_every_pairing():
+    defenders = [()] + [(t,) for t in NAMES] + list(itertools.permutations(NAMES, 2))
+    for attack in NAMES:
+        for defender_types in defenders:
+            expected = _reference(attack, defender_types)
+            assert get_type_multiplier(attack, list(defender_types)) == expected
+            ids = defender_type_ids(defender_types)
+            assert lookup_multiplier(type_id(attack), *ids) == expected
+
+
+def test_score_matchups_batches_lookups():
+    pairs = [("fire", ["grass", "steel"]), ("electric", ["ground"]), ("normal", [])]
+    assert score_matchups(pairs) == [4.0, 0.0, 1.0]
+    assert score_matchups([]) == []
+
+
+def test_unknown_types_are_neutral():
+    assert type_id("shadow") == NO_TYPE
+    assert defender_type_ids(["water", "shadow", "fire"]) == (type_id("water"), NO_TYPE)
+    assert get_type_multiplier("water", ["fire", "rock", "ground"]) == 8.0